@@ -0,0 +1,208 @@
+"""
+Benchmark suite for LCA tool.
+Times the analysis steps on synthetic inventories and flags regressions against baselines.
+
+Run from labs/final_project with `python -m benchmarks.run_benchmarks`.
+"""
+
+import argparse
+import json
+import platform
+import sys
+import tempfile
+import time
+from pathlib import Path
+from typing import Callable, Dict, List, Tuple
+
+import matplotlib
+
+matplotlib.use("Agg")
+import matplotlib.pyplot as plt
+import pandas as pd
+
+from src.calculations import LCACalculator
+from src.data_input import DataInput
+from src.kernels import AVAILABLE_BACKENDS, FusedImpactKernel
+from src.synthetic import write_inventory_csv
+from src.visualization import LCAVisualizer
+
+DEFAULT_SIZES = [1_000, 10_000, 100_000]
+BASELINE_PATH = Path(__file__).with_name("baselines.json")
+FACTORS_PATH = (
+    Path(__file__).resolve().parents[1] / "data" / "raw" / "impact_factors.json"
+)
+
+
+def time_call(func: Callable, repeat: int) -> Tuple[float, object]:
+    """Returns the best wall-clock time of repeat calls and the last result."""
+    best = float("inf")
+    result = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = func()
+        best = min(best, time.perf_counter() - start)
+        if isinstance(result, plt.Figure):
+            plt.close(result)
+    return best, result
+
+
+def run_size(
+    n_rows: int, repeat: int, figures: bool, workdir: Path
+) -> Dict[str, float]:
+    """
+    Times every analysis step on a synthetic inventory of n_rows rows.
+
+    Returns:
+        Dictionary mapping step names to seconds
+    """
+    data_input = DataInput()
+    csv_path = write_inventory_csv(workdir / f"inventory_{n_rows}.csv", n_rows)
+    calculator = LCACalculator(
+        impact_factors=data_input.read_impact_factors(FACTORS_PATH)
+    )
+    visualizer = LCAVisualizer()
+
+    timings = {}
+    timings["read_data"], data = time_call(
+        lambda: data_input.read_data(csv_path), repeat
+    )
+    timings["validate_data"], _ = time_call(
+        lambda: data_input.validate_data(data), repeat
+    )
+    timings["calculate_impacts"], impacts = time_call(
+        lambda: calculator.calculate_impacts(data), repeat
+    )
+    timings["calculate_total_impacts"], _ = time_call(
+        lambda: calculator.calculate_total_impacts(impacts), repeat
+    )
+    for backend in AVAILABLE_BACKENDS:
+        kernel = FusedImpactKernel(calculator, backend)
+        kernel.run(data)  # compiles the numba kernel outside the timing
+        timings[f"fused_impacts_{backend}"], _ = time_call(
+            lambda: kernel.run(data), repeat
+        )
+    product_ids = list(impacts["product_id"].unique()[:3])
+    timings["compare_alternatives"], _ = time_call(
+        lambda: calculator.compare_alternatives(impacts, product_ids), repeat
+    )
+
+    if figures:
+        figure_calls = {
+            "plot_impact_breakdown": lambda: visualizer.plot_impact_breakdown(
+                impacts, "carbon_impact", "material_type"
+            ),
+            "plot_life_cycle_impacts": lambda: visualizer.plot_life_cycle_impacts(
+                impacts, product_ids[0]
+            ),
+            "plot_product_comparison": lambda: visualizer.plot_product_comparison(
+                impacts, product_ids
+            ),
+            "plot_end_of_life_breakdown": lambda: visualizer.plot_end_of_life_breakdown(
+                impacts, product_ids[0]
+            ),
+            "plot_impact_correlation": lambda: visualizer.plot_impact_correlation(
+                impacts
+            ),
+        }
+        for name, func in figure_calls.items():
+            timings[name], _ = time_call(func, repeat)
+
+    csv_path.unlink()
+    return timings
+
+
+def find_regressions(
+    results: Dict[str, float],
+    baselines: Dict[str, float],
+    tolerance: float,
+    min_delta: float = 0.005,
+) -> List[Tuple[str, float, float]]:
+    """
+    Compares results with baselines.
+
+    A step regresses when it is more than tolerance (relative) and min_delta
+    seconds (absolute) slower than its baseline; the absolute floor keeps
+    millisecond-scale timer noise from being reported.
+
+    Returns:
+        List of (key, baseline seconds, current seconds)
+    """
+    regressions = []
+    for key, seconds in results.items():
+        baseline = baselines.get(key)
+        if baseline is None:
+            continue
+        if seconds > baseline * (1 + tolerance) and seconds - baseline > min_delta:
+            regressions.append((key, baseline, seconds))
+    return regressions
+
+
+def parse_args(argv=None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Benchmark the LCA analysis steps.")
+    parser.add_argument(
+        "--sizes",
+        type=int,
+        nargs="+",
+        default=DEFAULT_SIZES,
+        help="Inventory sizes in rows (1k to 10M).",
+    )
+    parser.add_argument(
+        "--repeat", type=int, default=3, help="Runs per step (best is kept)."
+    )
+    parser.add_argument(
+        "--no-figures", action="store_true", help="Skip the figure functions."
+    )
+    parser.add_argument("--baseline", type=Path, default=BASELINE_PATH)
+    parser.add_argument(
+        "--update-baseline",
+        action="store_true",
+        help="Store the current timings as the new baselines.",
+    )
+    parser.add_argument(
+        "--tolerance",
+        type=float,
+        default=0.25,
+        help="Relative slowdown that counts as a regression (default 25%%).",
+    )
+    return parser.parse_args(argv)
+
+
+def main(argv=None) -> int:
+    args = parse_args(argv)
+
+    results = {}
+    with tempfile.TemporaryDirectory() as workdir:
+        for n_rows in args.sizes:
+            timings = run_size(n_rows, args.repeat, not args.no_figures, Path(workdir))
+            for name, seconds in timings.items():
+                results[f"{n_rows}/{name}"] = seconds
+                print(f"{n_rows:>10,} rows  {name:<28} {seconds * 1000:10.1f} ms")
+
+    stored = {}
+    if args.baseline.exists():
+        stored = json.loads(args.baseline.read_text())
+    regressions = find_regressions(results, stored.get("timings", {}), args.tolerance)
+    for key, baseline, seconds in regressions:
+        print(
+            f"REGRESSION {key}: {baseline * 1000:.1f} ms -> {seconds * 1000:.1f} ms "
+            f"({seconds / baseline - 1:+.0%})"
+        )
+
+    if args.update_baseline or not stored:
+        # Baselines are machine specific, so the environment is stored with them.
+        stored = {
+            "environment": {
+                "python": platform.python_version(),
+                "pandas": pd.__version__,
+                "machine": platform.machine(),
+            },
+            "timings": {**stored.get("timings", {}), **results},
+        }
+        args.baseline.write_text(json.dumps(stored, indent=2, sort_keys=True) + "\n")
+        print(f"Baselines written to {args.baseline}")
+
+    return 1 if regressions else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -8,13 +8,21 @@ This script performs a full, end-to-end analysis by:
 4. Saving the calculated dataframes as CSV files for further use.
 
 To run, execute `python run_analysis.py` from the project's root directory.
+Pass `--watch` to keep running and rebuild the affected outputs whenever the input
+data or impact factors files change, and `--trace trace.json` (or set LCA_TRACE) to
+record the duration, row counts and peak memory of every step. Pass
+`--batch projects.json` to run many projects from a manifest on a process pool, and
+`--report report.html` to also write a self-contained HTML report.
 """
 
+import argparse
 import os
-import matplotlib.pyplot as plt
-from src.data_input import DataInput
-from src.calculations import LCACalculator
-from src.visualization import LCAVisualizer
+from pathlib import Path
+from src.batch import run_batch
+from src.instrumentation import Tracer, tracer_from_env
+from src.pipeline import LCAPipeline
+from src.report import ReportBuilder
+from src.watch import FileWatcher
 
 # --- CONFIGURATION ---
 # Centralized configuration for file paths and analysis parameters.
@@ -34,94 +42,157 @@ CONFIG = {
 }
 
 
+def parse_args() -> argparse.Namespace:
+    """
+    Parses the command-line options.
+    """
+    parser = argparse.ArgumentParser(description="Run the LCA analysis.")
+    parser.add_argument(
+        "--watch",
+        action="store_true",
+        help="Watch the input files and incrementally rebuild the outputs on change.",
+    )
+    parser.add_argument(
+        "--debounce",
+        type=float,
+        default=1.0,
+        help="Seconds to wait for a burst of changes to settle (default: 1.0).",
+    )
+    parser.add_argument(
+        "--trace",
+        metavar="PATH",
+        help="Write a Chrome trace (.json) or JSON-lines log of every step to PATH.",
+    )
+    parser.add_argument(
+        "--batch",
+        metavar="MANIFEST",
+        help="Run every project of a JSON manifest; resumes unfinished jobs.",
+    )
+    parser.add_argument(
+        "--jobs",
+        type=int,
+        default=None,
+        help="Worker processes for --batch (default: number of CPUs).",
+    )
+    parser.add_argument(
+        "--retry-failed",
+        action="store_true",
+        help="With --batch, also re-run projects that failed before.",
+    )
+    parser.add_argument(
+        "--report",
+        metavar="PATH",
+        help="Write an HTML report with tables, statistics and figures to PATH.",
+    )
+    return parser.parse_args()
+
+
 def main():
     """
     Main function to orchestrate the LCA workflow.
     """
+    args = parse_args()
+
+    if args.batch:
+        report = run_batch(
+            args.batch, max_workers=args.jobs, retry_failed=args.retry_failed
+        )
+        print("\n--- Batch Report ---")
+        print(report[["name", "status", "attempts", "duration", "error"]])
+        return
+
+    # Tracing wraps the library methods only when requested, so it is free otherwise.
+    tracer = Tracer(args.trace) if args.trace else tracer_from_env()
+    if tracer is None:
+        run(args)
+        return
+    tracer.install()
+    try:
+        run(args)
+    finally:
+        tracer.close()
+        if args.trace:
+            print(f"Trace written to {args.trace}")
+
+
+def run(args: argparse.Namespace):
+    """
+    Runs the analysis (and, with --watch, keeps rebuilding it).
+    """
     # --- 1. SETUP ---
     # Create output directories if they don't already exist.
     print("Setting up output directories...")
     os.makedirs(CONFIG["paths"]["output_data_dir"], exist_ok=True)
     os.makedirs(CONFIG["paths"]["output_figures_dir"], exist_ok=True)
 
+    # The pipeline caches every stage, so watch mode can re-run only what changed.
+    pipeline = LCAPipeline(CONFIG)
+
     # --- 2. DATA LOADING ---
     print("Loading input data and impact factors...")
-    data_input = DataInput()
-    product_data = data_input.read_data(CONFIG["paths"]["input_data"])
-    impact_factors = data_input.read_impact_factors(CONFIG["paths"]["impact_factors"])
+    pipeline.load_factors()
+    pipeline.load_data()
     print("Data loading complete.")
-    print(f"Loaded {len(product_data)} data rows.")
+    print(f"Loaded {len(pipeline.product_data)} data rows.")
 
     # --- 3. CALCULATIONS ---
     # The LCACalculator now uses a high-performance vectorized method.
     print("\nPerforming LCA calculations...")
-    calculator = LCACalculator(impact_factors=impact_factors)
-
-    impacts_df = calculator.calculate_impacts(product_data)
-    total_impacts_df = calculator.calculate_total_impacts(impacts_df)
+    pipeline.calculate()
 
     # Save the calculated dataframes for reporting or further analysis.
-    impacts_df.to_csv(
-        f"{CONFIG['paths']['output_data_dir']}/detailed_impacts.csv", index=False
-    )
-    total_impacts_df.to_csv(
-        f"{CONFIG['paths']['output_data_dir']}/total_impacts_summary.csv", index=False
-    )
+    pipeline.aggregate()
     print("Calculations complete. Results saved to 'outputs/data/'.")
     print("\n--- Total Impacts Summary (Top 5) ---")
-    print(total_impacts_df.head())
+    print(pipeline.total_impacts_df.head())
     print("-" * 40)
 
     # --- 4. VISUALIZATION & SAVING PLOTS ---
     # Generate all required visuals for the analysis report.
     print("\nGenerating and saving visualizations to 'outputs/figures/'...")
-    visualizer = LCAVisualizer()
-
-    # Plot 1: Overall Carbon Impact Breakdown by Material
-    fig1 = visualizer.plot_impact_breakdown(
-        impacts_df, "carbon_impact", "material_type"
-    )
-    fig1.suptitle("Carbon Impact Breakdown by Material Type", fontsize=16)
-    fig1.savefig(
-        f"{CONFIG['paths']['output_figures_dir']}/carbon_breakdown_by_material.png"
-    )
-    plt.close(fig1)
-
-    # Plot 2: Detailed Lifecycle Impacts for a specific product
-    p_id_lifecycle = CONFIG["analysis_products"]["lifecycle_id"]
-    fig2 = visualizer.plot_life_cycle_impacts(impacts_df, p_id_lifecycle)
-    fig2.suptitle(
-        f"Lifecycle Impact Breakdown for Product {p_id_lifecycle}", fontsize=16
-    )
-    fig2.savefig(
-        f"{CONFIG['paths']['output_figures_dir']}/lifecycle_impacts_{p_id_lifecycle}.png"
-    )
-    plt.close(fig2)
-
-    # Plot 3: Head-to-head Product Comparison
-    p_ids_compare = CONFIG["analysis_products"]["comparison_ids"]
-    fig3 = visualizer.plot_product_comparison(impacts_df, p_ids_compare)
-    fig3.suptitle(f"Product Comparison: {' vs '.join(p_ids_compare)}", fontsize=16)
-    fig3.savefig(f"{CONFIG['paths']['output_figures_dir']}/product_comparison.png")
-    plt.close(fig3)
-
-    # Plot 4: End-of-Life Management Breakdown
-    p_id_eole = CONFIG["analysis_products"]["eole_id"]
-    fig4 = visualizer.plot_end_of_life_breakdown(impacts_df, p_id_eole)
-    fig4.suptitle(f"End-of-Life Management for Product {p_id_eole}", fontsize=16)
-    fig4.savefig(f"{CONFIG['paths']['output_figures_dir']}/end_of_life_{p_id_eole}.png")
-    plt.close(fig4)
-
-    # Plot 5: Correlation Matrix of Impact Categories
-    fig5 = visualizer.plot_impact_correlation(impacts_df)
-    fig5.suptitle("Correlation Matrix of Environmental Impacts", fontsize=16)
-    fig5.savefig(
-        f"{CONFIG['paths']['output_figures_dir']}/impact_correlation_matrix.png"
-    )
-    plt.close(fig5)
-
+    pipeline.render_figures(force=True)
     print("All visualizations have been saved successfully.")
-    print("\nAnalysis finished. 🚀")
 
+    # Report figures are cached by the hash of their data, so rebuilds are cheap;
+    # figures the pipeline just saved are reused rather than rendered again.
+    report = None
+    if args.report:
+        report = ReportBuilder(
+            pipeline.figures,
+            Path(CONFIG["paths"]["output_figures_dir"]) / ".report_cache",
+        )
+        report.build(
+            pipeline.impacts_df,
+            pipeline.total_impacts_df,
+            args.report,
+            saved=pipeline.saved_figures(),
+        )
+        print(f"Report written to {args.report}")
+    print("\nAnalysis finished. 🚀")
 
-main()
+    # --- 5. WATCH MODE ---
+    # Re-run only the stages whose inputs changed until interrupted (Ctrl+C).
+    if args.watch:
+        watcher = FileWatcher(pipeline.input_paths.values(), debounce=args.debounce)
+        print(f"\nWatching {', '.join(str(p) for p in watcher.paths)} for changes...")
+
+        def rebuild(changed_paths):
+            try:
+                stages = pipeline.run(changed_paths)
+            except Exception as error:  # keep watching after a bad edit
+                print(f"Rebuild failed: {error}")
+                return
+            print(f"Rebuilt stages: {', '.join(stages) or 'none'}")
+            if report is not None and stages:
+                report.build(
+                    pipeline.impacts_df,
+                    pipeline.total_impacts_df,
+                    args.report,
+                    saved=pipeline.saved_figures(),
+                )
+
+        watcher.watch(rebuild)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,237 @@
+"""
+Allocation module for LCA tool.
+Splits the impacts of multi-output processes across their co-products.
+"""
+
+import numpy as np
+import pandas as pd
+from scipy import sparse
+from typing import List, Optional, Tuple
+
+from .utils import IMPACT_COLUMNS
+
+# Column of the co-products table holding the allocation basis of each method.
+ALLOCATION_BASES = {
+    "mass": "mass_kg",
+    "economic": "economic_value",
+    "energy": "energy_content_mj",
+}
+
+
+class CoProductAllocator:
+    """
+    Allocates process impacts to co-products by mass, economic value or energy.
+
+    Inventory rows keep describing processes through 'product_id' (e.g. a steel
+    mill); a co-products table lists what each process yields. The share of a
+    co-product is its basis divided by the basis of all outputs of its process,
+    and the shares form a sparse (process x product) allocation matrix A. Product
+    totals are then A.T @ process totals, one sparse product for any number of
+    rows. Processes missing from the co-products table are single-output and keep
+    their impacts under their own product_id.
+    """
+
+    def __init__(
+        self,
+        coproducts: pd.DataFrame,
+        method: str = "mass",
+        basis_column: Optional[str] = None,
+        columns: Optional[List[str]] = None,
+    ):
+        """
+        Args:
+            coproducts: Table with 'process_id', 'coproduct_id', an optional
+                'coproduct_name' and the basis column of the method
+            method: 'mass', 'economic' or 'energy' (see ALLOCATION_BASES)
+            basis_column: Overrides the basis column of the method
+            columns: Impact columns to allocate. Defaults to carbon, energy, water
+                and waste.
+
+        Raises:
+            ValueError: If the method is unknown, columns are missing, a basis is
+                negative or a process has no positive basis in total
+        """
+        if method not in ALLOCATION_BASES:
+            raise ValueError(
+                f"Unknown allocation method '{method}'. "
+                f"Use one of {sorted(ALLOCATION_BASES)}"
+            )
+        self.method = method
+        self.basis_column = basis_column or ALLOCATION_BASES[method]
+        self.columns = list(columns or IMPACT_COLUMNS)
+        missing = {"process_id", "coproduct_id", self.basis_column} - set(
+            coproducts.columns
+        )
+        if missing:
+            raise ValueError(f"Co-products table is missing columns: {sorted(missing)}")
+        if coproducts.duplicated(["process_id", "coproduct_id"]).any():
+            raise ValueError("Co-products must be listed once per process")
+
+        basis = coproducts[self.basis_column].fillna(0).to_numpy(dtype=float)
+        if (basis < 0).any():
+            raise ValueError(f"'{self.basis_column}' must not be negative")
+        process_codes, processes = pd.factorize(coproducts["process_id"])
+        process_basis = np.bincount(process_codes, weights=basis)
+        if (process_basis <= 0).any():
+            empty = processes[process_basis <= 0]
+            raise ValueError(
+                f"Processes without a positive '{self.basis_column}': "
+                f"{list(empty[:5])}"
+            )
+
+        self.coproducts = coproducts
+        self.processes = pd.Index(processes)
+        self._process_codes = process_codes
+        self.share = basis / process_basis[process_codes]
+
+    def shares(self) -> pd.DataFrame:
+        """Returns the allocation share of every co-product of every process."""
+        return pd.DataFrame(
+            {
+                "process_id": self.coproducts["process_id"].to_numpy(),
+                "coproduct_id": self.coproducts["coproduct_id"].to_numpy(),
+                "share": self.share,
+            }
+        )
+
+    def matrix(
+        self, processes: pd.Index, names: Optional[np.ndarray] = None
+    ) -> Tuple[pd.Index, pd.Series, sparse.csr_matrix]:
+        """
+        Builds the allocation matrix of the given processes.
+
+        Args:
+            processes: Process IDs, one per matrix row
+            names: Optional product names of the processes, aligned with them
+
+        Returns:
+            (product IDs, product names, sparse (process x product) matrix)
+        """
+        rows = self.processes.get_indexer(processes)
+        single = np.flatnonzero(rows < 0)
+        listed = np.flatnonzero(rows >= 0)
+
+        # Co-product entries of the listed processes, in matrix row order
+        position = np.full(len(self.processes), -1)
+        position[rows[listed]] = listed
+        entries = np.flatnonzero(position[self._process_codes] >= 0)
+
+        product_ids = np.concatenate(
+            [
+                np.asarray(processes, dtype=object)[single],
+                self.coproducts["coproduct_id"].to_numpy(dtype=object)[entries],
+            ]
+        )
+        if "coproduct_name" in self.coproducts.columns:
+            coproduct_names = self.coproducts["coproduct_name"].to_numpy(dtype=object)
+        else:
+            coproduct_names = self.coproducts["coproduct_id"].to_numpy(dtype=object)
+        if names is None:
+            single_names = np.asarray(processes, dtype=object)[single]
+        else:
+            single_names = np.asarray(names, dtype=object)[single]
+        product_names = np.concatenate([single_names, coproduct_names[entries]])
+
+        product_codes, products = pd.factorize(product_ids)
+        matrix = sparse.csr_matrix(
+            (
+                np.concatenate([np.ones(len(single)), self.share[entries]]),
+                (
+                    np.concatenate([single, position[self._process_codes[entries]]]),
+                    product_codes,
+                ),
+            ),
+            shape=(len(processes), len(products)),
+        )
+        matrix.sum_duplicates()
+        first = np.unique(product_codes, return_index=True)[1]
+        return (
+            pd.Index(products),
+            pd.Series(product_names[first], index=pd.Index(products)),
+            matrix,
+        )
+
+    def allocate_totals(self, impacts: pd.DataFrame) -> pd.DataFrame:
+        """
+        Returns the total impacts of every product after allocation.
+
+        Args:
+            impacts: Output of calculate_impacts, with process IDs in 'product_id'
+
+        Returns:
+            DataFrame with product_id, product_name and the impact columns, like
+            calculate_total_impacts
+        """
+        codes, processes = pd.factorize(impacts["product_id"])
+        valid = codes >= 0
+        values = impacts[self.columns].fillna(0).to_numpy(dtype=float)[valid]
+        totals = np.column_stack(
+            [
+                np.bincount(codes[valid], weights=column, minlength=len(processes))
+                for column in values.T
+            ]
+        ).reshape(len(processes), len(self.columns))
+        names = None
+        if "product_name" in impacts.columns:
+            # Codes appear in increasing order, so first occurrences align with them
+            first = np.flatnonzero(valid & ~pd.Series(codes).duplicated().to_numpy())
+            names = impacts["product_name"].iloc[first].to_numpy(dtype=object)
+
+        products, product_names, matrix = self.matrix(pd.Index(processes), names)
+        result = pd.DataFrame(matrix.T @ totals, columns=self.columns)
+        result.insert(0, "product_id", products)
+        result.insert(1, "product_name", product_names.to_numpy())
+        return result.sort_values("product_id", ignore_index=True)
+
+    def allocate_rows(self, impacts: pd.DataFrame) -> pd.DataFrame:
+        """
+        Splits every inventory row across the co-products of its process.
+
+        Keeps stage and material breakdowns per co-product; rows of single-output
+        processes are returned unchanged.
+
+        Args:
+            impacts: Output of calculate_impacts
+
+        Returns:
+            DataFrame with one row per input row and co-product, the allocated
+            impact columns, the original process in 'process_id' and the
+            co-product in 'product_id' / 'product_name'
+        """
+        codes, processes = pd.factorize(impacts["product_id"])
+        process_rows = np.append(self.processes.get_indexer(processes), -1)[codes]
+        order = np.argsort(self._process_codes, kind="stable")
+        starts = np.searchsorted(
+            self._process_codes[order], np.arange(len(self.processes))
+        )
+        counts = np.bincount(self._process_codes, minlength=len(self.processes))
+
+        repeats = np.where(process_rows >= 0, counts[process_rows], 1)
+        source = np.repeat(np.arange(len(impacts)), repeats)
+        # Offset of each output row within the co-products of its input row
+        offset = np.arange(len(source)) - np.repeat(
+            np.cumsum(repeats) - repeats, repeats
+        )
+        listed = process_rows[source] >= 0
+        entry = order[starts[process_rows[source][listed]] + offset[listed]]
+
+        result = impacts.iloc[source].reset_index(drop=True)
+        result.insert(0, "process_id", result["product_id"])
+        share = np.ones(len(source))
+        share[listed] = self.share[entry]
+        for column in self.columns:
+            result[column] = result[column].to_numpy(dtype=float) * share
+
+        # Co-product labels of every output row (unused where not listed)
+        entries = np.zeros(len(source), dtype=int)
+        entries[listed] = entry
+        labels = {"product_id": self.coproducts["coproduct_id"]}
+        if "product_name" in result.columns:
+            labels["product_name"] = self.coproducts.get(
+                "coproduct_name", self.coproducts["coproduct_id"]
+            )
+        for column, values in labels.items():
+            replacement = pd.Series(values.array.take(entries), index=result.index)
+            result[column] = result[column].mask(listed, replacement)
+        result["allocation_share"] = share
+        return result
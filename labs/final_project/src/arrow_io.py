@@ -0,0 +1,206 @@
+"""
+Arrow interchange module for LCA tool.
+Shares calculation results through memory-mapped Arrow IPC files or shared memory.
+
+Requires the optional pyarrow package.
+"""
+
+import json
+import os
+import sys
+import pandas as pd
+from multiprocessing import resource_tracker, shared_memory
+from pathlib import Path
+from typing import Dict, Optional, Set, Union
+
+try:
+    import pyarrow as pa
+except ImportError:  # Arrow interchange is optional
+    pa = None
+
+IMPACT_UNITS = {
+    "quantity_kg": "kg",
+    "energy_consumption_kwh": "kWh",
+    "transport_distance_km": "km",
+    "waste_generated_kg": "kg",
+    "carbon_footprint_kg_co2e": "kg CO2e",
+    "water_usage_liters": "L",
+    "carbon_impact": "kg CO2e",
+    "energy_impact": "kWh",
+    "water_impact": "L",
+}
+UNITS_KEY = b"lca.units"
+# Names of the shared-memory blocks published by this process.
+_published_blocks: Set[str] = set()
+VERSION_KEY = b"lca.factor_version"
+
+
+def _require_pyarrow():
+    if pa is None:
+        raise ImportError("Arrow interchange requires pyarrow (pip install pyarrow)")
+
+
+def to_arrow(
+    data: pd.DataFrame,
+    factor_version: Optional[str] = None,
+    units: Optional[Dict[str, str]] = None,
+) -> "pa.Table":
+    """
+    Converts calculator output to an Arrow table with LCA schema metadata.
+
+    Every column with a known unit carries it as field metadata ('unit'); the
+    schema metadata holds all units and the impact factor version.
+
+    Args:
+        data: Output of calculate_impacts or calculate_total_impacts
+        factor_version: Version of the impact factors the results were computed with
+        units: Extra or overriding {column: unit} entries
+
+    Returns:
+        Arrow table
+    """
+    _require_pyarrow()
+    units = {**IMPACT_UNITS, **(units or {})}
+    units = {col: unit for col, unit in units.items() if col in data.columns}
+    table = pa.Table.from_pandas(data, preserve_index=False)
+    fields = [
+        (
+            field.with_metadata({"unit": units[field.name]})
+            if field.name in units
+            else field
+        )
+        for field in table.schema
+    ]
+    metadata = {**(table.schema.metadata or {}), UNITS_KEY: json.dumps(units)}
+    if factor_version is not None:
+        metadata[VERSION_KEY] = factor_version
+    return table.cast(pa.schema(fields, metadata=metadata))
+
+
+def read_metadata(table: "pa.Table") -> Dict:
+    """
+    Returns the LCA metadata of a table.
+
+    Returns:
+        Dictionary with 'units' ({column: unit}) and 'factor_version' (or None)
+    """
+    metadata = table.schema.metadata or {}
+    version = metadata.get(VERSION_KEY)
+    return {
+        "units": json.loads(metadata.get(UNITS_KEY, b"{}")),
+        "factor_version": version.decode() if version is not None else None,
+    }
+
+
+def write_ipc(
+    data: pd.DataFrame,
+    file_path: Union[str, Path],
+    factor_version: Optional[str] = None,
+    units: Optional[Dict[str, str]] = None,
+) -> Path:
+    """
+    Writes results to an uncompressed Arrow IPC file, the layout that readers can
+    memory-map without copying.
+
+    Returns:
+        The path of the written file
+    """
+    table = to_arrow(data, factor_version, units)
+    file_path = Path(file_path)
+    with pa.OSFile(str(file_path), "wb") as sink:
+        with pa.ipc.new_file(sink, table.schema) as writer:
+            writer.write_table(table)
+    return file_path
+
+
+def read_ipc(file_path: Union[str, Path]) -> "pa.Table":
+    """
+    Attaches to an Arrow IPC file through a memory map.
+
+    The columns of the returned table point into the mapped file, so nothing is
+    parsed or copied until values are accessed (or converted with to_pandas).
+    """
+    _require_pyarrow()
+    return pa.ipc.open_file(pa.memory_map(str(file_path), "r")).read_all()
+
+
+class SharedResults:
+    """
+    Publishes results in a named shared-memory block as an Arrow IPC stream.
+
+    The producer creates the block with publish(); consumer processes call
+    attach() with its name and get a table whose buffers live in the shared block.
+    The instance must stay open while its tables are in use; the producer calls
+    unlink() once every consumer is done.
+    """
+
+    def __init__(self, block: shared_memory.SharedMemory, owner: bool):
+        self.block = block
+        self.owner = owner
+        self.name = block.name
+
+    @classmethod
+    def publish(
+        cls,
+        data: pd.DataFrame,
+        factor_version: Optional[str] = None,
+        units: Optional[Dict[str, str]] = None,
+        name: Optional[str] = None,
+    ) -> "SharedResults":
+        """Writes results into a new shared-memory block."""
+        table = to_arrow(data, factor_version, units)
+        # Measure the IPC size first, then write straight into the block. The stream
+        # format ends with its own end-of-stream marker, so the page padding of the
+        # block does not matter to readers.
+        counter = pa.MockOutputStream()
+        with pa.ipc.new_stream(counter, table.schema) as writer:
+            writer.write_table(table)
+        block = shared_memory.SharedMemory(
+            name=name, create=True, size=max(counter.size(), 1)
+        )
+        _published_blocks.add(block.name)
+        sink = pa.FixedSizeBufferWriter(pa.py_buffer(block.buf))
+        with pa.ipc.new_stream(sink, table.schema) as writer:
+            writer.write_table(table)
+        return cls(block, owner=True)
+
+    @classmethod
+    def attach(cls, name: str) -> "SharedResults":
+        """
+        Opens a block published by another process.
+
+        The block is not tracked by this process: otherwise the resource tracker
+        of a consumer started on its own would unlink it when the consumer exits,
+        while the producer still owns it.
+        """
+        _require_pyarrow()
+        if sys.version_info >= (3, 13):
+            return cls(shared_memory.SharedMemory(name=name, track=False), False)
+        block = shared_memory.SharedMemory(name=name)
+        if os.name == "posix" and block.name not in _published_blocks:
+            resource_tracker.unregister(block._name, "shared_memory")
+        return cls(block, owner=False)
+
+    def table(self) -> "pa.Table":
+        """Returns the published table without copying it out of shared memory."""
+        return pa.ipc.open_stream(pa.py_buffer(self.block.buf)).read_all()
+
+    def close(self) -> None:
+        """Detaches this process; release the tables from table() first."""
+        self.block.close()
+
+    def unlink(self) -> None:
+        """Frees the block (producer only)."""
+        self.close()
+        if self.owner:
+            self.block.unlink()
+            _published_blocks.discard(self.name)
+
+    def __enter__(self) -> "SharedResults":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        if self.owner:
+            self.unlink()
+        else:
+            self.close()
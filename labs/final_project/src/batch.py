@@ -0,0 +1,310 @@
+"""
+Batch processing module for LCA tool.
+Runs many projects from a manifest on a warm process pool with a resumable SQLite queue.
+"""
+
+import json
+import os
+import sqlite3
+import time
+import matplotlib
+import pandas as pd
+from collections import deque
+from concurrent.futures import FIRST_COMPLETED, Future, ProcessPoolExecutor, wait
+from concurrent.futures.process import BrokenProcessPool
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple, Union
+
+from .calculations import LCACalculator
+from .data_input import DataInput
+from .pipeline import LCAPipeline
+
+PATH_KEYS = ["input_data", "impact_factors", "output_data_dir", "output_figures_dir"]
+
+# Calculators compiled by this worker process, keyed by factors file and version.
+_calculator_cache: Dict[Tuple[str, float, int], LCACalculator] = {}
+
+
+def load_manifest(manifest_path: Union[str, Path]) -> List[Dict]:
+    """
+    Reads a batch manifest.
+
+    The manifest is a JSON list of projects shaped like the CONFIG of
+    run_analysis.py plus a unique 'name'. Relative paths are resolved against the
+    manifest's directory; projects without 'analysis_products' skip the figures.
+
+    Raises:
+        ValueError: If a project has no name, names repeat or paths are missing
+    """
+    manifest_path = Path(manifest_path)
+    with open(manifest_path, "r") as f:
+        projects = json.load(f)
+
+    names = set()
+    for project in projects:
+        name = project.get("name")
+        if not name or name in names:
+            raise ValueError(f"Every project needs a unique name, got: {name!r}")
+        names.add(name)
+        paths = project.get("paths", {})
+        missing = [key for key in PATH_KEYS if key not in paths]
+        if missing:
+            raise ValueError(f"Project {name} is missing paths: {missing}")
+        project["paths"] = {
+            key: str((manifest_path.parent / value).resolve())
+            for key, value in paths.items()
+        }
+    return projects
+
+
+class JobQueue:
+    """
+    Persistent job queue in a local SQLite database.
+
+    Each project is one row with its configuration, status ('pending', 'running',
+    'done' or 'failed'), attempt count, timing and error. Only the coordinating
+    process writes to the database. A job becomes 'running' when a worker claims
+    it; jobs left 'running' by a crashed run are put back to 'pending' when the
+    queue is reopened and keep their attempt, unlike jobs that never started.
+    """
+
+    def __init__(self, db_path: Union[str, Path]):
+        self.db_path = Path(db_path)
+        self._conn = sqlite3.connect(self.db_path)
+        self._conn.execute("""
+            CREATE TABLE IF NOT EXISTS jobs (
+                name TEXT PRIMARY KEY,
+                config TEXT NOT NULL,
+                status TEXT NOT NULL DEFAULT 'pending',
+                attempts INTEGER NOT NULL DEFAULT 0,
+                started_at REAL,
+                finished_at REAL,
+                duration REAL,
+                timings TEXT,
+                error TEXT
+            )
+            """)
+        with self._conn:
+            self._conn.execute(
+                "UPDATE jobs SET status = 'pending' WHERE status = 'running'"
+            )
+
+    def enqueue(self, projects: List[Dict]) -> int:
+        """
+        Adds projects that are not in the queue yet.
+
+        Re-submitting a manifest after a crash therefore keeps finished jobs.
+
+        Returns:
+            Number of newly added jobs
+        """
+        with self._conn:
+            before = self._conn.total_changes
+            self._conn.executemany(
+                "INSERT OR IGNORE INTO jobs (name, config) VALUES (?, ?)",
+                [(p["name"], json.dumps(p)) for p in projects],
+            )
+            return self._conn.total_changes - before
+
+    def pending(self, retry_failed: bool = False) -> List[Dict]:
+        """Returns the configurations of the jobs still to run."""
+        statuses = ("pending", "failed") if retry_failed else ("pending",)
+        placeholders = ", ".join("?" * len(statuses))
+        rows = self._conn.execute(
+            f"SELECT config FROM jobs WHERE status IN ({placeholders}) ORDER BY rowid",
+            statuses,
+        )
+        return [json.loads(config) for (config,) in rows]
+
+    def mark_running(self, name: str) -> None:
+        with self._conn:
+            self._conn.execute(
+                "UPDATE jobs SET status = 'running', attempts = attempts + 1, "
+                "started_at = ?, error = NULL WHERE name = ?",
+                (time.time(), name),
+            )
+
+    def mark_pending(self, name: str) -> None:
+        """Puts an interrupted job back; it keeps its attempt."""
+        with self._conn:
+            self._conn.execute(
+                "UPDATE jobs SET status = 'pending' WHERE name = ?", (name,)
+            )
+
+    def mark_finished(
+        self, name: str, timings: Optional[Dict] = None, error: Optional[str] = None
+    ) -> None:
+        with self._conn:
+            self._conn.execute(
+                "UPDATE jobs SET status = ?, finished_at = ?, duration = ?, "
+                "timings = ?, error = ? WHERE name = ?",
+                (
+                    "failed" if error else "done",
+                    time.time(),
+                    (timings or {}).get("total"),
+                    json.dumps(timings) if timings else None,
+                    error,
+                    name,
+                ),
+            )
+
+    def report(self) -> pd.DataFrame:
+        """Returns one row per job with its status, attempts, duration and error."""
+        return pd.read_sql_query(
+            "SELECT name, status, attempts, duration, timings, error "
+            "FROM jobs ORDER BY rowid",
+            self._conn,
+        )
+
+    def close(self) -> None:
+        self._conn.close()
+
+
+def _get_calculator(factors_path: str) -> LCACalculator:
+    """Returns this worker's compiled calculator for a factors file."""
+    stat = os.stat(factors_path)
+    key = (factors_path, stat.st_mtime, stat.st_size)
+    if key not in _calculator_cache:
+        factors = DataInput().read_impact_factors(factors_path)
+        _calculator_cache[key] = LCACalculator(impact_factors=factors)
+    return _calculator_cache[key]
+
+
+def _init_worker() -> None:
+    """Prepares a pool process once; libraries stay imported for all its jobs."""
+    matplotlib.use("Agg")
+
+
+def run_project(config: Dict) -> Dict:
+    """
+    Runs the full analysis of one project, as run_analysis.py does.
+
+    Returns:
+        Stage timings in seconds ('factors', 'data', 'impacts', 'aggregation',
+        'figures', 'total'), the number of rows and the worker's process ID
+    """
+    start = time.perf_counter()
+    timings = {}
+    figures = None if "analysis_products" in config else []
+    pipeline = LCAPipeline(config, figures=figures)
+
+    stage_start = time.perf_counter()
+    pipeline.calculator = _get_calculator(config["paths"]["impact_factors"])
+    timings["factors"] = time.perf_counter() - stage_start
+    for stage, step in (
+        ("data", pipeline.load_data),
+        ("impacts", pipeline.calculate),
+        ("aggregation", pipeline.aggregate),
+        ("figures", lambda: pipeline.render_figures(force=True)),
+    ):
+        stage_start = time.perf_counter()
+        step()
+        timings[stage] = time.perf_counter() - stage_start
+
+    timings["total"] = time.perf_counter() - start
+    timings["rows"] = len(pipeline.product_data)
+    timings["pid"] = os.getpid()
+    return timings
+
+
+class BatchRunner:
+    """
+    Executes the pending jobs of a JobQueue on a process pool.
+
+    Pool processes are started once and reused for every job, so libraries are
+    imported once per process and each process keeps the calculators it compiled
+    for later projects sharing the same factors file. If a worker dies, the pool
+    is replaced and the jobs it was running are tried once more before they fail.
+    """
+
+    def __init__(self, queue: JobQueue, max_workers: Optional[int] = None):
+        self.queue = queue
+        self.max_workers = max_workers
+
+    def run(self, retry_failed: bool = False, verbose: bool = True) -> pd.DataFrame:
+        """
+        Runs all pending (and optionally failed) jobs.
+
+        Returns:
+            The queue report after the run
+        """
+        jobs = deque(self.queue.pending(retry_failed))
+        if not jobs:
+            return self.queue.report()
+
+        workers = self.max_workers or os.cpu_count() or 1
+        futures: Dict[Future, Dict] = {}
+        interrupted = set()
+        pool = ProcessPoolExecutor(workers, initializer=_init_worker)
+        try:
+            while jobs or futures:
+                # A job is submitted (and marked running) only when a worker is
+                # free to claim it, so jobs an interrupted run never started stay
+                # pending without an attempt.
+                while jobs and len(futures) < workers:
+                    config = jobs.popleft()
+                    try:
+                        future = pool.submit(run_project, config)
+                    except BrokenProcessPool:
+                        # A worker died; its jobs are handled below
+                        pool.shutdown(wait=False)
+                        pool = ProcessPoolExecutor(workers, initializer=_init_worker)
+                        future = pool.submit(run_project, config)
+                    self.queue.mark_running(config["name"])
+                    futures[future] = config
+                done, _ = wait(futures, return_when=FIRST_COMPLETED)
+                for future in done:
+                    config = futures.pop(future)
+                    name = config["name"]
+                    crashed = isinstance(future.exception(), BrokenProcessPool)
+                    if crashed and name not in interrupted:
+                        # A crash cannot be attributed to one of the jobs of the
+                        # broken pool, so each of them runs once more.
+                        interrupted.add(name)
+                        self.queue.mark_pending(name)
+                        jobs.appendleft(config)
+                        continue
+                    self._finish(name, future, verbose)
+        finally:
+            pool.shutdown()
+        return self.queue.report()
+
+    def _finish(self, name: str, future: Future, verbose: bool) -> None:
+        """Records the outcome of a completed job."""
+        try:
+            timings = future.result()
+        except Exception as error:
+            self.queue.mark_finished(name, error=f"{type(error).__name__}: {error}")
+            if verbose:
+                print(f"[failed] {name}: {error}")
+            return
+        self.queue.mark_finished(name, timings)
+        if verbose:
+            print(f"[done]   {name} in {timings['total']:.2f}s")
+
+
+def run_batch(
+    manifest_path: Union[str, Path],
+    queue_path: Optional[Union[str, Path]] = None,
+    max_workers: Optional[int] = None,
+    retry_failed: bool = False,
+) -> pd.DataFrame:
+    """
+    Enqueues the projects of a manifest and runs everything that is not done yet.
+
+    Args:
+        manifest_path: JSON manifest (see load_manifest)
+        queue_path: SQLite queue file. Defaults to '<manifest>.queue.sqlite'.
+        max_workers: Pool size. Defaults to the number of CPUs.
+        retry_failed: Also re-run jobs that failed in an earlier run
+
+    Returns:
+        The queue report
+    """
+    manifest_path = Path(manifest_path)
+    queue = JobQueue(queue_path or manifest_path.with_suffix(".queue.sqlite"))
+    try:
+        queue.enqueue(load_manifest(manifest_path))
+        return BatchRunner(queue, max_workers).run(retry_failed)
+    finally:
+        queue.close()
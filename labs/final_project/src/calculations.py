@@ -1,6 +1,16 @@
 # src/calculations.py
 import pandas as pd
-from typing import Dict, List
+from typing import Dict, List, Optional, Union
+
+from .allocation import CoProductAllocator
+from .normalization import ImpactNormalizer
+from .utils import FACTOR_IMPACT_COLUMNS, IMPACT_COLUMNS
+
+
+def _normalize_stage(stage: str) -> str:
+    """Maps a stage name onto its canonical key (e.g., 'disposal' -> 'end-of-life')."""
+    stage = stage.lower()
+    return "end-of-life" if "end" in stage or "disposal" in stage else stage
 
 
 class LCACalculator:
@@ -17,21 +27,35 @@ class LCACalculator:
         self.impact_factors = impact_factors
         self._factors_df = self._prepare_factors_dataframe()
 
+    @classmethod
+    def from_factor_store(
+        cls,
+        store,
+        materials,
+        version: Optional[str] = None,
+        region: str = "",
+    ) -> "LCACalculator":
+        """
+        Creates a calculator holding only the factors of the given materials.
+
+        Args:
+            store: A FactorStore (see src/factor_store.py)
+            materials: Materials of the inventory, e.g. data['material_type']
+            version: Factor version. Defaults to the latest.
+            region: Optional region whose factors override the global ones
+        """
+        return cls(impact_factors=store.get_factors(materials, version, region))
+
     def _prepare_factors_dataframe(self) -> pd.DataFrame:
         """Converts the nested impact factors dictionary into a flat DataFrame for merging."""
         factors_list = []
         for material, stages in self.impact_factors.items():
             for stage, impacts in stages.items():
                 # Normalize keys for consistency (e.g., 'disposal' -> 'end-of-life')
-                stage_key = (
-                    "end-of-life"
-                    if "end" in stage.lower() or "disposal" in stage.lower()
-                    else stage.lower()
-                )
                 factors_list.append(
                     {
                         "material_type": material.lower(),
-                        "life_cycle_stage": stage_key,
+                        "life_cycle_stage": _normalize_stage(stage),
                         "carbon_factor": impacts.get("carbon_impact", 0),
                         "energy_factor": impacts.get("energy_impact", 0),
                         "water_factor": impacts.get("water_impact", 0),
@@ -74,8 +98,23 @@ class LCACalculator:
         ]
         return merged_df[result_columns]
 
-    def calculate_total_impacts(self, impacts: pd.DataFrame) -> pd.DataFrame:
-        """Calculates total impacts across all life cycle stages for each product."""
+    def calculate_total_impacts(
+        self,
+        impacts: pd.DataFrame,
+        allocation: Optional[CoProductAllocator] = None,
+    ) -> pd.DataFrame:
+        """
+        Calculates total impacts across all life cycle stages for each product.
+
+        Args:
+            impacts: Output of calculate_impacts
+            allocation: Optional CoProductAllocator; splits the totals of
+                multi-output processes across their co-products, which then take
+                the place of their processes in the output
+        """
+        if allocation is not None:
+            # Per-product rows, aggregated below like unallocated impacts
+            impacts = allocation.allocate_totals(impacts)
         total_impacts = (
             impacts.groupby(["product_id", "product_name"])
             .agg(
@@ -90,22 +129,28 @@ class LCACalculator:
         )
         return total_impacts
 
-    def normalize_impacts(self, impacts: pd.DataFrame) -> pd.DataFrame:
-        """Normalizes impacts to a common scale (0-1)."""
-        normalized = impacts.copy()
-        impact_columns = ["carbon_impact", "energy_impact", "water_impact"]
-        for col in impact_columns:
-            max_value = normalized[col].max()
-            if max_value > 0:
-                normalized[col] = normalized[col] / max_value
-        return normalized
+    def normalize_impacts(
+        self,
+        impacts: pd.DataFrame,
+        scheme: str = "max",
+        group_by: Optional[Union[str, List[str]]] = None,
+        references: Optional[Union[Dict[str, float], pd.DataFrame]] = None,
+    ) -> pd.DataFrame:
+        """
+        Normalizes impacts to a common scale (0-1 by default).
+        See ImpactNormalizer for the 'sum' and 'reference' schemes and grouping.
+        """
+        normalizer = ImpactNormalizer(scheme, group_by=group_by, references=references)
+        return normalizer.transform(impacts)
 
     def compare_alternatives(
         self, impacts: pd.DataFrame, product_ids: List[str]
     ) -> pd.DataFrame:
         """Compares environmental impacts between alternative products on an aggregated level."""
-        total_impacts = self.calculate_total_impacts(impacts)
-        comparison = total_impacts[total_impacts["product_id"].isin(product_ids)].copy()
+        # Only the selected products are aggregated; see ProductComparator for
+        # comparing a whole catalogue at once.
+        selected = impacts[impacts["product_id"].isin(product_ids)]
+        comparison = self.calculate_total_impacts(selected)
 
         # Calculate relative differences
         for impact_type in ["carbon_impact", "energy_impact", "water_impact"]:
@@ -0,0 +1,201 @@
+"""
+Product comparison module for LCA tool.
+Computes pairwise relative differences and nearest alternatives across large catalogues.
+"""
+
+import numpy as np
+import pandas as pd
+from pathlib import Path
+from scipy.spatial import cKDTree
+from typing import Dict, Iterator, List, Optional, Tuple, Union
+
+from .calculations import LCACalculator
+
+COMPARISON_IMPACTS = ["carbon_impact", "energy_impact", "water_impact"]
+
+
+class ProductComparator:
+    """
+    Compares every product with every other product.
+
+    The per-product totals are computed once. Pairwise relative differences are built
+    with broadcasted NumPy operations in row blocks, so memory stays bounded by
+    max_block_elements regardless of the catalogue size.
+    """
+
+    def __init__(
+        self,
+        total_impacts: pd.DataFrame,
+        impact_types: Optional[List[str]] = None,
+        max_block_elements: int = 2**24,
+    ):
+        """
+        Args:
+            total_impacts: Output of LCACalculator.calculate_total_impacts
+            impact_types: Impact columns to compare. Defaults to carbon, energy, water.
+            max_block_elements: Upper bound on the size of any intermediate
+                (rows x products) block; 2**24 float64 values are 128 MB.
+        """
+        self.impact_types = list(impact_types or COMPARISON_IMPACTS)
+        self.product_ids = pd.Index(total_impacts["product_id"])
+        self.values = total_impacts[self.impact_types].to_numpy(dtype=float)
+        self.max_block_elements = max_block_elements
+
+    @classmethod
+    def from_impacts(
+        cls, calculator: LCACalculator, impacts: pd.DataFrame, **kwargs
+    ) -> "ProductComparator":
+        """Aggregates the detailed impacts once and builds a comparator from them."""
+        return cls(calculator.calculate_total_impacts(impacts), **kwargs)
+
+    def _rows_per_block(self, columns: int) -> int:
+        return max(1, self.max_block_elements // max(columns, 1))
+
+    def _positions(self, product_ids: Optional[List[str]]) -> np.ndarray:
+        if product_ids is None:
+            return np.arange(len(self.product_ids))
+        positions = self.product_ids.get_indexer(product_ids)
+        if (positions < 0).any():
+            missing = list(np.asarray(product_ids)[positions < 0])
+            raise ValueError(f"Unknown product IDs: {missing}")
+        return positions
+
+    @staticmethod
+    def _relative_difference(rows: np.ndarray, columns: np.ndarray) -> np.ndarray:
+        """
+        (row - column) / column in percent, broadcast over a block.
+
+        As in LCACalculator.compare_alternatives, a non-positive reference yields 0.
+        """
+        with np.errstate(divide="ignore"):
+            scale = np.where(columns > 0, 100.0 / columns, 0.0)
+        block = np.subtract.outer(rows, columns)
+        block *= scale
+        return block
+
+    def iter_relative_difference_blocks(
+        self, impact_type: str, product_ids: Optional[List[str]] = None
+    ) -> Iterator[Tuple[np.ndarray, np.ndarray]]:
+        """
+        Yields the relative-difference matrix in row blocks of bounded size.
+
+        Entry [i, j] is the difference of product i relative to product j, in percent.
+
+        Yields:
+            (row positions, block) pairs, where block has one column per product
+        """
+        k = self.impact_types.index(impact_type)
+        positions = self._positions(product_ids)
+        values = self.values[positions, k]
+        step = self._rows_per_block(len(positions))
+        for start in range(0, len(positions), step):
+            rows = slice(start, start + step)
+            yield positions[rows], self._relative_difference(values[rows], values)
+
+    def relative_difference_matrix(
+        self, impact_type: str, product_ids: Optional[List[str]] = None
+    ) -> pd.DataFrame:
+        """
+        Returns the full N x N relative-difference matrix of one impact type.
+
+        Use write_relative_difference_matrix for catalogues that do not fit in memory.
+        """
+        positions = self._positions(product_ids)
+        labels = self.product_ids[positions]
+        matrix = np.empty((len(positions), len(positions)))
+        start = 0
+        for _, block in self.iter_relative_difference_blocks(impact_type, product_ids):
+            matrix[start : start + len(block)] = block
+            start += len(block)
+        return pd.DataFrame(matrix, index=labels, columns=labels)
+
+    def relative_difference_matrices(
+        self, product_ids: Optional[List[str]] = None
+    ) -> Dict[str, pd.DataFrame]:
+        """Returns the relative-difference matrix of every impact type."""
+        return {
+            impact_type: self.relative_difference_matrix(impact_type, product_ids)
+            for impact_type in self.impact_types
+        }
+
+    def write_relative_difference_matrix(
+        self, impact_type: str, file_path: Union[str, Path]
+    ) -> np.memmap:
+        """
+        Writes the full relative-difference matrix block by block to a .npy file.
+
+        Args:
+            impact_type: Impact column to compare
+            file_path: Destination .npy file; rows and columns follow self.product_ids
+
+        Returns:
+            Memory-mapped view of the written matrix
+        """
+        n = len(self.product_ids)
+        matrix = np.lib.format.open_memmap(
+            file_path, mode="w+", dtype=np.float64, shape=(n, n)
+        )
+        for rows, block in self.iter_relative_difference_blocks(impact_type):
+            matrix[rows] = block
+        matrix.flush()
+        return matrix
+
+    def nearest_alternatives(
+        self, k: int = 5, impact_types: Optional[List[str]] = None
+    ) -> pd.DataFrame:
+        """
+        Finds the k most similar products of every product.
+
+        Similarity is the Euclidean distance between the impact vectors, each impact
+        scaled by its maximum as in normalize_impacts. The impact space has only a few
+        dimensions, so a KD-tree answers all queries in O(n log n) instead of scanning
+        the N x N distance matrix.
+
+        Args:
+            k: Number of alternatives per product
+            impact_types: Impacts spanning the distance space. Defaults to all.
+
+        Returns:
+            Long DataFrame with 'product_id', 'alternative_id', 'rank', 'distance' and
+            the relative difference (in %) of the alternative for every impact type
+        """
+        columns = [
+            self.impact_types.index(c) for c in impact_types or self.impact_types
+        ]
+        values = self.values[:, columns]
+        scale = np.abs(values).max(axis=0)
+        scaled = values / np.where(scale > 0, scale, 1.0)
+
+        n = len(scaled)
+        k = min(k, n - 1)
+        if k <= 0:
+            return pd.DataFrame(
+                columns=["product_id", "alternative_id", "rank", "distance"]
+            )
+
+        # Query k + 1 neighbours and drop the product itself (or, if it ties with
+        # identical products, the farthest neighbour).
+        distances, neighbours = cKDTree(scaled).query(scaled, k=k + 1)
+        is_self = neighbours == np.arange(n)[:, None]
+        is_self[~is_self.any(axis=1), -1] = True
+        distances = distances[~is_self].reshape(n, k)
+        neighbours = neighbours[~is_self].reshape(n, k)
+
+        source = np.repeat(np.arange(n), k)
+        target = neighbours.ravel()
+        result = pd.DataFrame(
+            {
+                "product_id": self.product_ids[source],
+                "alternative_id": self.product_ids[target],
+                "rank": np.tile(np.arange(1, k + 1), n),
+                "distance": distances.ravel(),
+            }
+        )
+        with np.errstate(divide="ignore", invalid="ignore"):
+            for i, impact_type in enumerate(self.impact_types):
+                reference = self.values[source, i]
+                diff = (self.values[target, i] - reference) / reference * 100
+                result[f"{impact_type}_relative_diff_%"] = np.where(
+                    reference > 0, diff, 0.0
+                )
+        return result
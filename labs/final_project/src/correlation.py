@@ -0,0 +1,264 @@
+"""
+Correlation module for LCA tool.
+Accumulates impact correlations chunk by chunk, overall and per group, in one pass.
+"""
+
+import numpy as np
+import pandas as pd
+from pathlib import Path
+from typing import Dict, Hashable, List, Optional, Tuple, Union
+
+from .calculations import LCACalculator
+from .data_input import DataInput
+from .utils import IMPACT_COLUMNS
+
+
+def _merge_moments(
+    count_a: np.ndarray,
+    mean_a: np.ndarray,
+    comoment_a: np.ndarray,
+    count_b: np.ndarray,
+    mean_b: np.ndarray,
+    comoment_b: np.ndarray,
+) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """
+    Chan et al. merge of per-group counts (g,), means (g, k) and co-moment
+    matrices (g, k, k); the co-moment is the sum of products of deviations.
+    """
+    count = count_a + count_b
+    with np.errstate(divide="ignore", invalid="ignore"):
+        weight = np.where(count > 0, count_b / count, 0.0)
+    delta = mean_b - mean_a
+    mean = mean_a + delta * weight[:, None]
+    comoment = (
+        comoment_a
+        + comoment_b
+        + delta[:, :, None] * delta[:, None, :] * (count_a * weight)[:, None, None]
+    )
+    return count, mean, comoment
+
+
+class CorrelationAccumulator:
+    """
+    Single-pass Pearson correlations of the impact columns.
+
+    Every chunk is reduced to per-group counts, means and co-moment matrices with
+    a few bincounts, and merged into the running state with the parallel update
+    of Chan et al., which stays accurate for large values where raw sums of
+    squares would cancel. Memory is independent of the number of rows. The overall
+    matrix is the merge of all groups, so grouped and overall correlations come
+    from the same pass. Rows with a missing value in any column are skipped.
+    """
+
+    def __init__(
+        self, columns: Optional[List[str]] = None, group_by: Optional[str] = None
+    ):
+        """
+        Args:
+            columns: Columns to correlate. Defaults to carbon, energy, water and waste.
+            group_by: Optional column, e.g. 'material_type' or 'life_cycle_stage',
+                to keep separate correlations per value
+        """
+        self.columns = list(columns or IMPACT_COLUMNS)
+        self.group_by = group_by
+        size = len(self.columns)
+        self._groups: Dict[Hashable, int] = {}
+        self._count = np.zeros(0)
+        self._mean = np.zeros((0, size))
+        self._comoment = np.zeros((0, size, size))
+
+    @property
+    def count(self) -> pd.Series:
+        """Number of complete rows per group."""
+        return pd.Series(
+            self._count.astype(int), index=list(self._groups), name="count"
+        )
+
+    def _group_index(self, keys) -> np.ndarray:
+        """State positions of the given group keys, adding unseen groups."""
+        new = [key for key in keys if key not in self._groups]
+        if new:
+            for key in new:
+                self._groups[key] = len(self._groups)
+            size = len(self.columns)
+            self._count = np.concatenate([self._count, np.zeros(len(new))])
+            self._mean = np.concatenate([self._mean, np.zeros((len(new), size))])
+            self._comoment = np.concatenate(
+                [self._comoment, np.zeros((len(new), size, size))]
+            )
+        return np.array([self._groups[key] for key in keys], dtype=int)
+
+    def _combine(self, positions, count, mean, comoment) -> None:
+        """Merges partial states into the groups at the given positions."""
+        (
+            self._count[positions],
+            self._mean[positions],
+            self._comoment[positions],
+        ) = _merge_moments(
+            self._count[positions],
+            self._mean[positions],
+            self._comoment[positions],
+            count,
+            mean,
+            comoment,
+        )
+
+    def update(self, data: pd.DataFrame) -> None:
+        """
+        Adds a chunk of rows.
+
+        Args:
+            data: Rows holding the columns (and the group_by column, if any)
+        """
+        values = data[self.columns].to_numpy(dtype=float)
+        complete = ~np.isnan(values).any(axis=1)
+        if self.group_by is None:
+            codes = np.zeros(int(complete.sum()), dtype=int)
+            keys = [None]
+        else:
+            codes, keys = pd.factorize(data[self.group_by].to_numpy()[complete])
+            complete[complete] = codes >= 0
+            codes = codes[codes >= 0]
+        values = values[complete]
+        if not len(values):
+            return
+
+        n_groups = len(keys)
+        if n_groups == 1:
+            count = np.array([float(len(values))])
+            mean = values.mean(axis=0, keepdims=True)
+            centered = values - mean
+            comoment = (centered.T @ centered)[None]
+        else:
+            count = np.bincount(codes, minlength=n_groups).astype(float)
+            mean = (
+                np.column_stack(
+                    [
+                        np.bincount(codes, weights=col, minlength=n_groups)
+                        for col in values.T
+                    ]
+                )
+                / np.maximum(count, 1)[:, None]
+            )
+            centered = values - mean[codes]
+            size = len(self.columns)
+            comoment = np.empty((n_groups, size, size))
+            for i in range(size):
+                for j in range(i, size):
+                    comoment[:, i, j] = comoment[:, j, i] = np.bincount(
+                        codes,
+                        weights=centered[:, i] * centered[:, j],
+                        minlength=n_groups,
+                    )
+        self._combine(self._group_index(list(keys)), count, mean, comoment)
+
+    def update_file(
+        self,
+        file_path: Union[str, Path],
+        chunksize: int = 100_000,
+        calculator: Optional[LCACalculator] = None,
+    ) -> "CorrelationAccumulator":
+        """
+        Streams a CSV, NDJSON or JSON file through the accumulator.
+
+        Args:
+            file_path: Impacts file, or a raw inventory when a calculator is given
+            chunksize: Rows per chunk
+            calculator: Calculates the impacts of raw inventory chunks
+
+        Returns:
+            self
+        """
+        for chunk in DataInput().read_data_chunked(file_path, chunksize=chunksize):
+            if calculator is not None and "carbon_impact" not in chunk.columns:
+                chunk = calculator.calculate_impacts(chunk)
+            self.update(chunk)
+        return self
+
+    def merge(self, other: "CorrelationAccumulator") -> "CorrelationAccumulator":
+        """
+        Merges the state of another accumulator, e.g. from a parallel worker.
+
+        Raises:
+            ValueError: If the accumulators use different columns or groupings
+        """
+        if other.columns != self.columns or other.group_by != self.group_by:
+            raise ValueError("Cannot merge accumulators with different layouts")
+        if other._groups:
+            self._combine(
+                self._group_index(list(other._groups)),
+                other._count,
+                other._mean,
+                other._comoment,
+            )
+        return self
+
+    def _state(self, group: Optional[Hashable]) -> Tuple[float, np.ndarray]:
+        """Count and co-moment of one group, or of all groups merged."""
+        if group is not None:
+            if group not in self._groups:
+                raise ValueError(f"Unknown group: {group!r}")
+            i = self._groups[group]
+            return self._count[i], self._comoment[i]
+
+        size = len(self.columns)
+        state = (np.zeros(1), np.zeros((1, size)), np.zeros((1, size, size)))
+        for i in range(len(self._groups)):
+            state = _merge_moments(
+                *state,
+                self._count[i : i + 1],
+                self._mean[i : i + 1],
+                self._comoment[i : i + 1],
+            )
+        return state[0][0], state[2][0]
+
+    def covariance(
+        self, group: Optional[Hashable] = None, ddof: int = 1
+    ) -> pd.DataFrame:
+        """
+        Returns the covariance matrix, as DataFrame.cov() computes it.
+
+        Args:
+            group: Group value. Defaults to all rows.
+            ddof: Delta degrees of freedom
+        """
+        count, comoment = self._state(group)
+        covariance = comoment / (count - ddof) if count > ddof else comoment * np.nan
+        return pd.DataFrame(covariance, index=self.columns, columns=self.columns)
+
+    def correlation(self, group: Optional[Hashable] = None) -> pd.DataFrame:
+        """
+        Returns the Pearson correlation matrix, as DataFrame.corr() computes it.
+
+        Columns without variance correlate as NaN.
+
+        Args:
+            group: Group value. Defaults to all rows.
+        """
+        _, comoment = self._state(group)
+        scale = np.sqrt(np.diag(comoment))
+        with np.errstate(divide="ignore", invalid="ignore"):
+            correlation = comoment / np.outer(scale, scale)
+        correlation[np.outer(scale, scale) == 0] = np.nan
+        return pd.DataFrame(
+            np.clip(correlation, -1, 1), index=self.columns, columns=self.columns
+        )
+
+    def grouped_correlation(self) -> pd.DataFrame:
+        """
+        Returns the correlation matrix of every group.
+
+        Returns:
+            DataFrame indexed by (group, column), like groupby(...).corr()
+
+        Raises:
+            ValueError: If the accumulator has no group_by column
+        """
+        if self.group_by is None:
+            raise ValueError("The accumulator was created without group_by")
+        groups = sorted(self._groups, key=str)
+        return pd.concat(
+            [self.correlation(group) for group in groups],
+            keys=groups,
+            names=[self.group_by, None],
+        )
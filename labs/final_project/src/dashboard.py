@@ -0,0 +1,502 @@
+"""
+Dashboard module for LCA tool.
+Serves interactive impact queries from a pre-aggregated in-memory cube.
+
+Run with `python -m src.dashboard outputs/data/detailed_impacts.csv` and open the
+printed address in a browser.
+"""
+
+import argparse
+import asyncio
+import numpy as np
+import pandas as pd
+from collections import OrderedDict
+from pathlib import Path
+from typing import Dict, Optional, Sequence, Tuple, Union
+from urllib.parse import parse_qs, urlsplit
+
+from .calculations import LCACalculator
+from .data_input import DataInput
+from .http_io import (
+    HTTPError,
+    json_bytes,
+    read_request,
+    require_loopback,
+    write_response,
+)
+from .utils import IMPACT_COLUMNS
+
+DIMENSIONS = {
+    "product": "product_id",
+    "stage": "life_cycle_stage",
+    "material": "material_type",
+}
+
+
+class ImpactCube:
+    """
+    Columnar, pre-aggregated impacts for filter and drill-down queries.
+
+    The detailed impacts are collapsed once to one cell per (product, stage,
+    material), stored product-major as integer codes per dimension plus a float
+    matrix of the metrics, and rolled up further into a dense stage x material
+    cube and per-product totals. Each query uses the smallest structure that can
+    answer it:
+
+    * stage or material breakdowns without a product filter read the dense cube;
+    * product rankings without filters read the product totals;
+    * product filters (drill-downs) slice the cells of those products by offset;
+    * anything else sums the matching cells with bincount.
+
+    Query results are kept in an LRU cache of encoded JSON responses.
+    """
+
+    def __init__(self, impacts: pd.DataFrame, cache_size: int = 256):
+        """
+        Args:
+            impacts: Output of calculate_impacts
+            cache_size: Number of query responses kept in memory
+        """
+        self.cache_size = cache_size
+        self.hits = 0
+        self.misses = 0
+        self._cache: "OrderedDict[tuple, bytes]" = OrderedDict()
+        self.total_rows = len(impacts)
+
+        self.labels: Dict[str, pd.Index] = {}
+        codes = {}
+        for dimension, column in DIMENSIONS.items():
+            codes[dimension], labels = pd.factorize(impacts[column], sort=True)
+            self.labels[dimension] = pd.Index(labels)
+            self.labels[dimension].get_indexer(labels[:1])  # builds the hash table
+
+        # One cell per distinct (product, stage, material) combination; rows with a
+        # missing key cannot be filtered on and are left out.
+        complete = np.logical_and.reduce([codes[d] >= 0 for d in DIMENSIONS])
+        sizes = [len(self.labels[d]) for d in DIMENSIONS]
+        cell = np.ravel_multi_index([codes[d][complete] for d in DIMENSIONS], sizes)
+        cells, inverse = np.unique(cell, return_inverse=True)
+        self.codes = dict(
+            zip(
+                DIMENSIONS,
+                (c.astype(np.int32) for c in np.unravel_index(cells, sizes)),
+            )
+        )
+        values = impacts[IMPACT_COLUMNS].fillna(0).to_numpy(dtype=float)[complete]
+        self.values = np.column_stack(
+            [
+                np.bincount(inverse, weights=column, minlength=len(cells))
+                for column in values.T
+            ]
+        )
+        self.rows = np.bincount(inverse, minlength=len(cells))
+
+        # Cells are sorted by product, so each product owns a contiguous range.
+        n_products = len(self.labels["product"])
+        self._offsets = np.searchsorted(
+            self.codes["product"], np.arange(n_products + 1)
+        )
+        self._product_values, self._product_rows = self._sum_by(
+            self.codes["product"], n_products
+        )
+        shape = (len(self.labels["stage"]), len(self.labels["material"]))
+        flat = self.codes["stage"] * shape[1] + self.codes["material"]
+        cube_values, cube_rows = self._sum_by(flat, shape[0] * shape[1])
+        self._cube_values = cube_values.reshape(*shape, len(IMPACT_COLUMNS))
+        self._cube_rows = cube_rows.reshape(shape)
+
+    def __len__(self) -> int:
+        return len(self.rows)
+
+    def _sum_by(
+        self,
+        codes: np.ndarray,
+        size: int,
+        cells: Optional[np.ndarray] = None,
+    ) -> Tuple[np.ndarray, np.ndarray]:
+        """Metric sums and row counts of (a subset of) the cells per code."""
+        values, rows = self.values, self.rows
+        if cells is not None:
+            values, rows = values[cells], rows[cells]
+        sums = np.column_stack(
+            [np.bincount(codes, weights=col, minlength=size) for col in values.T]
+        ).reshape(size, len(IMPACT_COLUMNS))
+        return sums, np.bincount(codes, weights=rows, minlength=size)
+
+    def dimensions(self) -> Dict:
+        """Labels of the stage and material dimensions and the overall totals."""
+        return {
+            "stage": list(self.labels["stage"]),
+            "material": list(self.labels["material"]),
+            "products": len(self.labels["product"]),
+            "rows": self.total_rows,
+            "totals": dict(zip(IMPACT_COLUMNS, self.values.sum(axis=0).tolist())),
+        }
+
+    def _allowed(self, dimension: str, values: Sequence[str]) -> np.ndarray:
+        """Boolean lookup table over the labels of a dimension."""
+        allowed = np.zeros(len(self.labels[dimension]), dtype=bool)
+        positions = self.labels[dimension].get_indexer(list(values))
+        allowed[positions[positions >= 0]] = True
+        return allowed
+
+    def _aggregate(
+        self, group_by: str, filters: Dict[str, Sequence[str]]
+    ) -> Tuple[np.ndarray, np.ndarray]:
+        """Metric sums and row counts per label of group_by under the filters."""
+        stage = self._allowed("stage", filters["stage"]) if "stage" in filters else None
+        material = (
+            self._allowed("material", filters["material"])
+            if "material" in filters
+            else None
+        )
+
+        if "product" not in filters and group_by != "product":
+            values, rows = self._cube_values, self._cube_rows
+            if stage is not None:
+                values, rows = values * stage[:, None, None], rows * stage[:, None]
+            if material is not None:
+                values, rows = values * material[None, :, None], rows * material
+            axis = 1 if group_by == "stage" else 0
+            return values.sum(axis=axis), rows.sum(axis=axis)
+
+        if not filters:  # product ranking
+            return self._product_values, self._product_rows
+
+        cells = None
+        if "product" in filters:
+            products = np.flatnonzero(self._allowed("product", filters["product"]))
+            starts, ends = self._offsets[products], self._offsets[products + 1]
+            lengths = ends - starts
+            cells = np.repeat(starts - np.cumsum(lengths) + lengths, lengths)
+            cells += np.arange(lengths.sum())
+        for allowed, dimension in ((stage, "stage"), (material, "material")):
+            if allowed is not None:
+                codes = self.codes[dimension]
+                if cells is None:
+                    cells = np.flatnonzero(allowed[codes])
+                else:
+                    cells = cells[allowed[codes[cells]]]
+        return self._sum_by(
+            self.codes[group_by][cells], len(self.labels[group_by]), cells
+        )
+
+    def query(
+        self,
+        group_by: str = "material",
+        filters: Optional[Dict[str, Sequence[str]]] = None,
+        metric: str = "carbon_impact",
+        limit: Optional[int] = None,
+    ) -> Dict:
+        """
+        Sums the metrics of the matching cells per value of a dimension.
+
+        Args:
+            group_by: 'product', 'stage' or 'material'
+            filters: {dimension: allowed values}; unknown values match nothing
+            metric: Metric the groups are sorted by (descending)
+            limit: Maximum number of groups returned; all when None
+
+        Returns:
+            Dictionary with the 'groups' labels, one list per metric in 'values',
+            the inventory 'rows' per group and the matched inventory rows in
+            'matched_rows'
+
+        Raises:
+            ValueError: If the dimension or metric is unknown or limit is negative
+        """
+        if group_by not in DIMENSIONS:
+            raise ValueError(f"Unknown dimension: {group_by}")
+        if metric not in IMPACT_COLUMNS:
+            raise ValueError(f"Unknown metric: {metric}")
+        if limit is not None and limit < 0:
+            raise ValueError("limit must not be negative")
+        filters = filters or {}
+        unknown = set(filters) - set(DIMENSIONS)
+        if unknown:
+            raise ValueError(f"Unknown filter dimensions: {sorted(unknown)}")
+
+        sums, counts = self._aggregate(group_by, filters)
+        present = np.flatnonzero(counts > 0)
+        key = -sums[present, IMPACT_COLUMNS.index(metric)]
+        if limit is not None and limit < len(present):
+            top = np.argpartition(key, limit)[:limit]
+            present, key = present[top], key[top]
+        order = present[np.argsort(key, kind="stable")]
+        return {
+            "group_by": group_by,
+            "metric": metric,
+            "groups": self.labels[group_by].take(order).tolist(),
+            "values": {
+                m: sums[order, k].tolist() for k, m in enumerate(IMPACT_COLUMNS)
+            },
+            "rows": counts[order].astype(int).tolist(),
+            "matched_rows": int(counts.sum()),
+        }
+
+    def query_json(
+        self,
+        group_by: str = "material",
+        filters: Optional[Dict[str, Sequence[str]]] = None,
+        metric: str = "carbon_impact",
+        limit: Optional[int] = None,
+    ) -> bytes:
+        """Encoded query() response, served from the LRU cache when possible."""
+        if limit is not None and group_by in self.labels:
+            # Limits beyond the number of groups return the same response
+            limit = min(limit, len(self.labels[group_by]))
+        key = (
+            group_by,
+            tuple(sorted((d, tuple(sorted(v))) for d, v in (filters or {}).items())),
+            metric,
+            limit,
+        )
+        if key in self._cache:
+            self._cache.move_to_end(key)
+            self.hits += 1
+            return self._cache[key]
+        self.misses += 1
+        payload = json_bytes(self.query(group_by, filters, metric, limit))
+        self._cache[key] = payload
+        while len(self._cache) > self.cache_size:
+            self._cache.popitem(last=False)
+        return payload
+
+
+class DashboardServer:
+    """
+    Local asyncio HTTP server for an ImpactCube.
+
+    Endpoints:
+        GET /                   dashboard page (charts drawn client-side)
+        GET /api/dimensions     stage and material labels and overall totals
+        GET /api/query          group_by, metric, limit and comma-separated
+                                product/stage/material filters, e.g.
+                                /api/query?group_by=stage&material=steel,wood
+        GET /api/stats          cube size and cache hits/misses
+    """
+
+    def __init__(self, cube: ImpactCube):
+        self.cube = cube
+        self._server: Optional[asyncio.AbstractServer] = None
+
+    async def start(self, host: str = "127.0.0.1", port: int = 8766) -> int:
+        """
+        Starts listening and returns the bound port.
+
+        Raises:
+            ValueError: If host is not a loopback address
+        """
+        require_loopback(host)
+        self._server = await asyncio.start_server(self._handle, host, port)
+        return self._server.sockets[0].getsockname()[1]
+
+    async def serve_forever(self) -> None:
+        async with self._server:
+            await self._server.serve_forever()
+
+    async def close(self) -> None:
+        if self._server is not None:
+            self._server.close()
+            await self._server.wait_closed()
+
+    async def _handle(
+        self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter
+    ) -> None:
+        content_type = "application/json"
+        try:
+            method, target, _, _ = await read_request(reader)
+            url = urlsplit(target)
+            if method != "GET":
+                raise HTTPError(404, f"No route for {method} {url.path}")
+            status, content_type, payload = 200, *self._route(url.path, url.query)
+        except HTTPError as error:
+            status, payload = error.status, json_bytes({"error": str(error)})
+        except (ValueError, KeyError) as error:
+            status, payload = 400, json_bytes({"error": str(error)})
+        except Exception as error:
+            status, payload = 500, json_bytes(
+                {"error": f"{type(error).__name__}: {error}"}
+            )
+        await write_response(writer, status, content_type, payload)
+
+    def _route(self, path: str, query: str) -> Tuple[str, bytes]:
+        params = {k: v[-1] for k, v in parse_qs(query).items()}
+        if path == "/":
+            return "text/html; charset=utf-8", DASHBOARD_PAGE.encode()
+        if path == "/api/dimensions":
+            return "application/json", json_bytes(self.cube.dimensions())
+        if path == "/api/stats":
+            stats = {
+                "cells": len(self.cube),
+                "rows": self.cube.total_rows,
+                "cache_hits": self.cube.hits,
+                "cache_misses": self.cube.misses,
+            }
+            return "application/json", json_bytes(stats)
+        if path == "/api/query":
+            filters = {
+                dimension: params[dimension].split(",")
+                for dimension in DIMENSIONS
+                if params.get(dimension)
+            }
+            limit = _parse_limit(params["limit"]) if params.get("limit") else None
+            return "application/json", self.cube.query_json(
+                params.get("group_by", "material"),
+                filters,
+                params.get("metric", "carbon_impact"),
+                limit,
+            )
+        raise HTTPError(404, f"No route for GET {path}")
+
+
+def _parse_limit(value: str) -> int:
+    """
+    Parses the limit query parameter.
+
+    Raises:
+        HTTPError: If the limit is not a non-negative integer
+    """
+    try:
+        limit = int(value)
+    except ValueError:
+        limit = -1
+    if limit < 0:
+        raise HTTPError(400, f"limit must be a non-negative integer, got {value!r}")
+    return limit
+
+
+def load_impacts(
+    data_path: Union[str, Path], factors_path: Optional[Union[str, Path]] = None
+) -> pd.DataFrame:
+    """
+    Reads detailed impacts, or calculates them from a raw inventory.
+
+    Raises:
+        ValueError: If the file has no impact columns and no factors are given
+    """
+    data_input = DataInput()
+    data = data_input.read_data(data_path)
+    if "carbon_impact" in data.columns:
+        return data
+    if factors_path is None:
+        raise ValueError(
+            f"{data_path} holds no impacts; pass the impact factors to calculate them"
+        )
+    factors = data_input.read_impact_factors(factors_path)
+    return LCACalculator(impact_factors=factors).calculate_impacts(data)
+
+
+DASHBOARD_PAGE = """<!DOCTYPE html>
+<html lang="en">
+<head>
+<meta charset="utf-8">
+<title>LCA Dashboard</title>
+<style>
+body { font-family: sans-serif; margin: 1.5em auto; max-width: 1000px; color: #222; }
+.controls { display: flex; flex-wrap: wrap; gap: 1em; align-items: end; }
+label { display: flex; flex-direction: column; font-size: .85em; }
+.bar { display: flex; align-items: center; margin: 2px 0; cursor: pointer; }
+.bar span { width: 220px; overflow: hidden; white-space: nowrap; font-size: .85em; }
+.bar div { background: #2a7; height: 18px; margin-right: .5em; }
+.bar em { font-size: .8em; font-style: normal; color: #555; }
+#crumbs { margin: 1em 0; color: #555; }
+</style>
+</head>
+<body>
+<h1>LCA Dashboard</h1>
+<div class="controls">
+  <label>Group by<select id="group_by">
+    <option value="material">Material</option><option value="stage">Stage</option>
+    <option value="product">Product</option></select></label>
+  <label>Metric<select id="metric">
+    <option value="carbon_impact">Carbon (kg CO2e)</option>
+    <option value="energy_impact">Energy (kWh)</option>
+    <option value="water_impact">Water (L)</option>
+    <option value="waste_generated_kg">Waste (kg)</option></select></label>
+  <label>Stage<select id="stage" multiple size="3"></select></label>
+  <label>Material<select id="material" multiple size="3"></select></label>
+  <label>Products (comma-separated)<input id="product"></label>
+  <label>Top<input id="limit" type="number" value="25" min="1"></label>
+</div>
+<div id="crumbs"></div>
+<div id="chart"></div>
+<script>
+const $ = (id) => document.getElementById(id);
+const selected = (id) => [...$(id).selectedOptions].map((o) => o.value).join(",");
+async function refresh() {
+  const params = new URLSearchParams({
+    group_by: $("group_by").value, metric: $("metric").value, limit: $("limit").value,
+    stage: selected("stage"), material: selected("material"),
+    product: $("product").value,
+  });
+  const started = performance.now();
+  const result = await (await fetch("/api/query?" + params)).json();
+  const values = result.values[result.metric];
+  const top = Math.max(...values.map(Math.abs), 1e-12);
+  $("crumbs").textContent = `${result.matched_rows.toLocaleString()} rows, ` +
+    `${(performance.now() - started).toFixed(1)} ms`;
+  $("chart").replaceChildren(...result.groups.map((group, i) => {
+    const row = document.createElement("div");
+    row.className = "bar";
+    const width = 400 * Math.abs(values[i]) / top;
+    const label = values[i].toLocaleString(undefined, {maximumFractionDigits: 2});
+    row.innerHTML =
+      `<span></span><div style="width:${width}px"></div><em>${label}</em>`;
+    row.firstChild.textContent = group;
+    row.onclick = () => drillDown(result.group_by, group);
+    return row;
+  }));
+}
+function drillDown(dimension, value) {
+  if (dimension === "product") {
+    $("product").value = value;
+    $("group_by").value = "stage";
+  } else {
+    [...$(dimension).options].forEach((o) => { o.selected = o.value === value; });
+    $("group_by").value = dimension === "material" ? "stage" : "product";
+  }
+  refresh();
+}
+(async () => {
+  const dims = await (await fetch("/api/dimensions")).json();
+  for (const name of ["stage", "material"]) {
+    $(name).replaceChildren(...dims[name].map((v) => new Option(v, v)));
+  }
+  document.querySelectorAll("select, input").forEach((el) => el.onchange = refresh);
+  refresh();
+})();
+</script>
+</body>
+</html>
+"""
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Serve an interactive LCA dashboard.")
+    parser.add_argument("data", help="Detailed impacts (or raw inventory) file.")
+    parser.add_argument(
+        "--factors", help="Impact factors, to calculate the impacts of an inventory."
+    )
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8766)
+    parser.add_argument("--cache-size", type=int, default=256)
+    args = parser.parse_args()
+
+    cube = ImpactCube(load_impacts(args.data, args.factors), args.cache_size)
+    print(f"Loaded {cube.total_rows:,} rows into {len(cube):,} cells")
+
+    async def serve():
+        server = DashboardServer(cube)
+        port = await server.start(args.host, args.port)
+        print(f"LCA dashboard on http://{args.host}:{port}")
+        await server.serve_forever()
+
+    try:
+        asyncio.run(serve())
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()
@@ -5,13 +5,24 @@ Handles reading and validating input data from various sources.
 
 import pandas as pd
 import json
+import re
 from pathlib import Path
-from typing import Dict, Union
+from typing import Dict, Iterator, List, Union
+
+try:
+    import pyarrow as pa
+    import pyarrow.json as pa_json
+except ImportError:  # NDJSON is parsed with pandas instead
+    pa = pa_json = None
+
+NDJSON_FORMATS = (".ndjson", ".jsonl")
+JSON_BLOCK_SIZE = 1 << 20
+_JSON_SEPARATORS = re.compile(r"[\s,]*")
 
 
 class DataInput:
     def __init__(self):
-        self.supported_formats = [".csv", ".xlsx", ".json"]
+        self.supported_formats = [".csv", ".xlsx", ".json", ".ndjson", ".jsonl"]
         self.required_columns = [
             "product_id",
             "product_name",
@@ -28,6 +39,17 @@ class DataInput:
             "carbon_footprint_kg_co2e",
             "water_usage_liters",
         ]
+        self.numeric_columns = [
+            "quantity_kg",
+            "energy_consumption_kwh",
+            "transport_distance_km",
+            "waste_generated_kg",
+            "recycling_rate",
+            "landfill_rate",
+            "incineration_rate",
+            "carbon_footprint_kg_co2e",
+            "water_usage_liters",
+        ]
 
     def read_data(self, file_path: Union[str, Path]) -> pd.DataFrame:
         """
@@ -56,6 +78,169 @@ class DataInput:
             return pd.read_excel(file_path)
         elif file_path.suffix == ".json":
             return pd.read_json(file_path)
+        elif file_path.suffix in NDJSON_FORMATS:
+            chunks = list(self._read_ndjson(file_path, 1_000_000))
+            if not chunks:  # a file without records
+                return pd.DataFrame(
+                    {
+                        col: pd.Series(
+                            dtype=float if col in self.numeric_columns else str
+                        )
+                        for col in self.required_columns
+                    }
+                )
+            return pd.concat(chunks, ignore_index=True)
+
+    def read_data_chunked(
+        self, file_path: Union[str, Path], chunksize: int = 100_000
+    ) -> Iterator[pd.DataFrame]:
+        """
+        Read data in chunks of at most chunksize rows.
+
+        CSV and newline-delimited JSON (.ndjson, .jsonl) files are streamed, as are
+        .json files holding an array of records. Other formats have to be parsed as
+        a whole and are then yielded in slices.
+
+        Args:
+            file_path: Path to the input file
+            chunksize: Maximum number of rows per chunk
+
+        Yields:
+            DataFrames with the columns of the input file
+
+        Raises:
+            ValueError: If file format is not supported
+            FileNotFoundError: If file does not exist
+        """
+        file_path = Path(file_path)
+        if file_path.exists():
+            if file_path.suffix == ".csv":
+                with pd.read_csv(file_path, chunksize=chunksize) as reader:
+                    yield from reader
+                return
+            if file_path.suffix in NDJSON_FORMATS:
+                yield from self._read_ndjson(file_path, chunksize)
+                return
+            if file_path.suffix == ".json" and self._is_json_array(file_path):
+                yield from self._read_json_array(file_path, chunksize)
+                return
+
+        data = self.read_data(file_path)
+        for start in range(0, len(data), chunksize):
+            yield data.iloc[start : start + chunksize]
+
+    def _typed_frame(self, records: List[Dict]) -> pd.DataFrame:
+        """Builds a frame from parsed records with the numeric columns as floats."""
+        data = pd.DataFrame.from_records(records)
+        for col in self.numeric_columns:
+            if col in data.columns:
+                data[col] = pd.to_numeric(data[col], errors="coerce")
+        return data
+
+    def _read_ndjson(self, file_path: Path, chunksize: int) -> Iterator[pd.DataFrame]:
+        """
+        Streams newline-delimited JSON.
+
+        With pyarrow, blocks of lines are parsed straight into typed Arrow columns
+        (no Python object per value); otherwise pandas parses chunksize lines at a
+        time. A file without records yields no chunks.
+        """
+        fields = self._ndjson_fields(file_path)
+        if not fields:
+            return
+        if pa_json is None:
+            dtypes = {
+                col: float if col in self.numeric_columns else str
+                for col in self.required_columns
+            }
+            with pd.read_json(
+                file_path, lines=True, chunksize=chunksize, dtype=dtypes
+            ) as reader:
+                yield from reader
+            return
+
+        # Only fields present in the file are typed; an explicit schema would
+        # otherwise add missing required fields as all-null columns.
+        schema = pa.schema(
+            [
+                (col, pa.float64() if col in self.numeric_columns else pa.string())
+                for col in self.required_columns
+                if col in fields
+            ]
+        )
+        reader = pa_json.open_json(
+            file_path,
+            read_options=pa_json.ReadOptions(block_size=JSON_BLOCK_SIZE),
+            parse_options=pa_json.ParseOptions(
+                explicit_schema=schema, unexpected_field_behavior="infer"
+            ),
+        )
+        pending, rows = [], 0
+        for batch in reader:
+            pending.append(batch)
+            rows += batch.num_rows
+            while rows >= chunksize:
+                table = pa.Table.from_batches(pending)
+                yield table.slice(0, chunksize).to_pandas()
+                rest = table.slice(chunksize)
+                pending, rows = rest.to_batches(), rest.num_rows
+        if rows:
+            yield pa.Table.from_batches(pending).to_pandas()
+
+    @staticmethod
+    def _ndjson_fields(file_path: Path) -> set:
+        """Field names of the first record of a newline-delimited JSON file."""
+        with open(file_path, "r") as f:
+            for line in f:
+                if line.strip():
+                    return set(json.loads(line))
+        return set()
+
+    @staticmethod
+    def _is_json_array(file_path: Path) -> bool:
+        with open(file_path, "r") as f:
+            return f.read(4096).lstrip().startswith("[")
+
+    def _read_json_array(
+        self, file_path: Path, chunksize: int
+    ) -> Iterator[pd.DataFrame]:
+        """
+        Streams a JSON array of record objects.
+
+        The file is read in blocks and one record at a time is decoded from the
+        buffer, so only the current block and chunk are held in memory.
+
+        Raises:
+            ValueError: If the array is truncated or malformed
+        """
+        decoder = json.JSONDecoder()
+        records = []
+        with open(file_path, "r") as f:
+            buffer = f.read(JSON_BLOCK_SIZE).lstrip()[1:]  # skip the opening '['
+            pos = 0
+            while True:
+                pos = _JSON_SEPARATORS.match(buffer, pos).end()
+                if pos < len(buffer) and buffer[pos] == "]":
+                    break
+                try:
+                    if pos == len(buffer):
+                        raise json.JSONDecodeError("Need more data", buffer, pos)
+                    record, pos = decoder.raw_decode(buffer, pos)
+                except json.JSONDecodeError:
+                    # The record continues in the next block.
+                    block = f.read(JSON_BLOCK_SIZE)
+                    if not block:
+                        raise ValueError(
+                            f"Truncated or invalid JSON array: {file_path}"
+                        )
+                    buffer, pos = buffer[pos:] + block, 0
+                    continue
+                records.append(record)
+                if len(records) == chunksize:
+                    yield self._typed_frame(records)
+                    records = []
+        if records:
+            yield self._typed_frame(records)
 
     def validate_data(self, data: pd.DataFrame) -> bool:
         """
@@ -72,19 +257,7 @@ class DataInput:
             return False
 
         # Validate numeric columns
-        numeric_columns = [
-            "quantity_kg",
-            "energy_consumption_kwh",
-            "transport_distance_km",
-            "waste_generated_kg",
-            "recycling_rate",
-            "landfill_rate",
-            "incineration_rate",
-            "carbon_footprint_kg_co2e",
-            "water_usage_liters",
-        ]
-
-        for col in numeric_columns:
+        for col in self.numeric_columns:
             if not pd.to_numeric(data[col], errors="coerce").notnull().all():
                 return False
 
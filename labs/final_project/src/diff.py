@@ -0,0 +1,210 @@
+"""
+Result diff module for LCA tool.
+Compares two impact result sets per row and per product, in memory or in chunks.
+
+Run with `python -m src.diff old/detailed_impacts.csv new/detailed_impacts.csv`.
+"""
+
+import argparse
+import tempfile
+import numpy as np
+import pandas as pd
+from pathlib import Path
+from typing import List, Optional, Sequence, Tuple, Union
+
+from .utils import FACTOR_IMPACT_COLUMNS
+
+DIFF_KEYS = ["product_id", "life_cycle_stage", "material_type"]
+
+
+class ImpactDiff:
+    """
+    Joins two result sets on their keys and reports what changed.
+
+    Rows sharing a key are summed before joining. A row (or product) counts as
+    changed when, for at least one impact column, the absolute delta exceeds
+    abs_threshold and the relative delta exceeds rel_threshold percent. Rows present
+    in only one result set are reported as 'added' or 'removed'.
+    """
+
+    def __init__(
+        self,
+        keys: Optional[Sequence[str]] = None,
+        columns: Optional[Sequence[str]] = None,
+        abs_threshold: float = 0.0,
+        rel_threshold: float = 0.0,
+    ):
+        """
+        Args:
+            keys: Join keys. Defaults to product_id, life_cycle_stage, material_type.
+            columns: Impact columns to compare. Defaults to carbon, energy and water.
+            abs_threshold: Minimum absolute change
+            rel_threshold: Minimum relative change, in percent of the old value
+
+        Raises:
+            ValueError: If the keys do not include product_id
+        """
+        self.keys = list(keys or DIFF_KEYS)
+        self.columns = list(columns or FACTOR_IMPACT_COLUMNS)
+        if "product_id" not in self.keys:
+            raise ValueError("The diff keys must include 'product_id'")
+        self.abs_threshold = abs_threshold
+        self.rel_threshold = rel_threshold
+
+    def _prepare(self, data: pd.DataFrame) -> pd.DataFrame:
+        """Keeps the keys and columns and sums duplicate keys."""
+        return data.groupby(self.keys, sort=False)[self.columns].sum()
+
+    def _delta(self, joined: pd.DataFrame, by: List[str]) -> pd.DataFrame:
+        """Adds delta columns and a status to an outer-joined frame and filters it."""
+        result = joined.reset_index()
+        changed = np.zeros(len(result), dtype=bool)
+        for col in self.columns:
+            old = result[f"{col}_old"].fillna(0).to_numpy(dtype=float)
+            new = result[f"{col}_new"].fillna(0).to_numpy(dtype=float)
+            delta = new - old
+            with np.errstate(divide="ignore", invalid="ignore"):
+                relative = np.where(
+                    old != 0, delta / np.abs(old) * 100, np.where(delta == 0, 0, np.inf)
+                )
+            result[f"{col}_delta"] = delta
+            result[f"{col}_delta_%"] = relative
+            changed |= (np.abs(delta) > self.abs_threshold) & (
+                np.abs(relative) > self.rel_threshold
+            )
+
+        added = result["_in_old"].isna().to_numpy()
+        removed = result["_in_new"].isna().to_numpy()
+        status = np.where(changed, "changed", "unchanged").astype(object)
+        status[added] = "added"
+        status[removed] = "removed"
+        result["status"] = status
+        result = result[status != "unchanged"].drop(columns=["_in_old", "_in_new"])
+        return result.sort_values(by).reset_index(drop=True)
+
+    def _join(self, old: pd.DataFrame, new: pd.DataFrame) -> pd.DataFrame:
+        """Hash-joins two key-indexed frames, keeping keys found on either side."""
+        old = old.add_suffix("_old").assign(_in_old=True)
+        new = new.add_suffix("_new").assign(_in_new=True)
+        return old.join(new, how="outer")
+
+    def compare(
+        self, old: pd.DataFrame, new: pd.DataFrame
+    ) -> Tuple[pd.DataFrame, pd.DataFrame]:
+        """
+        Compares two result sets held in memory.
+
+        Args:
+            old: Previous results, e.g. a detailed_impacts.csv
+            new: Current results with the same keys
+
+        Returns:
+            (row diff, product diff). Both hold the old and new values, the deltas
+            ('<col>_delta') and relative deltas ('<col>_delta_%') of every impact
+            column and a 'status', and only list added, removed or changed entries.
+        """
+        old_rows = self._prepare(old)
+        new_rows = self._prepare(new)
+        rows = self._delta(self._join(old_rows, new_rows), self.keys)
+
+        old_products = old_rows.groupby(level="product_id").sum()
+        new_products = new_rows.groupby(level="product_id").sum()
+        products = self._delta(self._join(old_products, new_products), ["product_id"])
+        return rows, products
+
+    def compare_csv(
+        self,
+        old_path: Union[str, Path],
+        new_path: Union[str, Path],
+        chunksize: int = 500_000,
+        partitions: int = 16,
+        spill_dir: Optional[Union[str, Path]] = None,
+    ) -> Tuple[pd.DataFrame, pd.DataFrame]:
+        """
+        Compares two result CSVs in bounded memory.
+
+        Both files are streamed once and hash-partitioned by product to temporary
+        files, so every product's rows land in the same partition on both sides.
+        The partitions are then compared one pair at a time; memory is bounded by a
+        chunk plus one partition pair, roughly (file size / partitions).
+
+        Args:
+            old_path: Previous results CSV
+            new_path: Current results CSV
+            chunksize: Rows read per chunk
+            partitions: Number of spill partitions
+            spill_dir: Directory for the partitions. Defaults to the system temp.
+
+        Returns:
+            (row diff, product diff), as in compare()
+        """
+        usecols = self.keys + self.columns
+        dtypes = {key: str for key in self.keys}
+        with tempfile.TemporaryDirectory(dir=spill_dir) as workdir:
+            workdir = Path(workdir)
+            for side, path in (("old", old_path), ("new", new_path)):
+                for chunk in pd.read_csv(
+                    path, usecols=usecols, dtype=dtypes, chunksize=chunksize
+                ):
+                    buckets = pd.util.hash_array(
+                        chunk["product_id"].to_numpy(dtype=str)
+                    )
+                    for i, part in chunk.groupby(buckets % partitions, sort=False):
+                        part_path = workdir / f"{side}_{i}.csv"
+                        part.to_csv(
+                            part_path,
+                            mode="a",
+                            header=not part_path.exists(),
+                            index=False,
+                        )
+
+            def read_part(side: str, i: int) -> pd.DataFrame:
+                part_path = workdir / f"{side}_{i}.csv"
+                if not part_path.exists():
+                    return pd.DataFrame(columns=usecols)
+                return pd.read_csv(part_path, dtype=dtypes)
+
+            row_diffs, product_diffs = [], []
+            for i in range(partitions):
+                old_part, new_part = read_part("old", i), read_part("new", i)
+                rows, products = self.compare(old_part, new_part)
+                row_diffs.append(rows)
+                product_diffs.append(products)
+
+        rows = pd.concat(row_diffs, ignore_index=True).sort_values(self.keys)
+        products = pd.concat(product_diffs, ignore_index=True).sort_values("product_id")
+        return rows.reset_index(drop=True), products.reset_index(drop=True)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Compare two LCA result files.")
+    parser.add_argument("old", help="Previous results CSV.")
+    parser.add_argument("new", help="Current results CSV.")
+    parser.add_argument("--abs-threshold", type=float, default=0.0)
+    parser.add_argument(
+        "--rel-threshold", type=float, default=0.0, help="Percent of the old value."
+    )
+    parser.add_argument("--chunksize", type=int, default=500_000)
+    parser.add_argument("--partitions", type=int, default=16)
+    parser.add_argument("--output-dir", default=".", help="Where to write the diffs.")
+    args = parser.parse_args()
+
+    differ = ImpactDiff(
+        abs_threshold=args.abs_threshold, rel_threshold=args.rel_threshold
+    )
+    rows, products = differ.compare_csv(
+        args.old, args.new, chunksize=args.chunksize, partitions=args.partitions
+    )
+    output_dir = Path(args.output_dir)
+    output_dir.mkdir(parents=True, exist_ok=True)
+    rows.to_csv(output_dir / "row_diff.csv", index=False)
+    products.to_csv(output_dir / "product_diff.csv", index=False)
+
+    print(products["status"].value_counts().to_string())
+    print(
+        f"Diffs of {len(rows):,} rows and {len(products):,} products written to {output_dir}"
+    )
+
+
+if __name__ == "__main__":
+    main()
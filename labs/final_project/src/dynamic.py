@@ -0,0 +1,249 @@
+"""
+Dynamic (time-dependent) LCA module.
+Handles impact factors that change over the years, e.g. a decarbonising electricity grid.
+"""
+
+import numpy as np
+import pandas as pd
+from typing import Dict, Optional, Tuple
+
+from .calculations import LCACalculator, _normalize_stage
+from .utils import FACTOR_IMPACT_COLUMNS
+
+DIRECT_COLUMNS = [
+    "carbon_footprint_kg_co2e",
+    "energy_consumption_kwh",
+    "water_usage_liters",
+]
+
+
+class DynamicLCACalculator(LCACalculator):
+    """
+    Extends LCACalculator with year-indexed impact factors.
+
+    The factors are compiled into a dense material x stage x year x impact array, so the
+    per-row factors are obtained with a single vectorized gather over all axes.
+    """
+
+    def __init__(
+        self,
+        impact_factors: Dict,
+        factor_curves: Dict,
+        years: Optional[Tuple[int, int]] = None,
+    ):
+        """
+        Initializes the calculator with static factors and year-indexed factor curves.
+
+        Args:
+            impact_factors: Static impact factors, used where no curve is given.
+            factor_curves: Nested dictionary {material: {stage: {impact: {year: value}}}}.
+                Values between the given years are linearly interpolated and held
+                constant outside of them.
+            years: Optional (first_year, last_year) range; inventory years outside
+                it are rejected. Defaults to the range spanned by the curves,
+                extended to the years of the inventories calculated.
+        """
+        super().__init__(impact_factors)
+        self.factor_curves = factor_curves
+        self.fixed_years = years is not None
+        self.years = self._resolve_years(years)
+        self._materials, self._stages, self._factor_cube = self._compile_factor_cube()
+
+    def _resolve_years(self, years: Optional[Tuple[int, int]]) -> np.ndarray:
+        """Returns the array of years covered by the factor cube."""
+        if years is None:
+            keyframes = [
+                int(year)
+                for stages in self.factor_curves.values()
+                for impacts in stages.values()
+                for curve in impacts.values()
+                for year in curve
+            ]
+            if not keyframes:
+                raise ValueError("Factor curves must contain at least one year")
+            years = (min(keyframes), max(keyframes))
+        first_year, last_year = years
+        if last_year < first_year:
+            raise ValueError(f"Invalid year range: {first_year}-{last_year}")
+        return np.arange(first_year, last_year + 1)
+
+    def _compile_factor_cube(self) -> Tuple[pd.Index, pd.Index, np.ndarray]:
+        """
+        Builds the material x stage x year x impact factor array.
+
+        An extra all-zero material and stage slot is appended at the end, so unknown
+        keys (coded as -1) gather zero factors, as in the static calculator.
+        """
+        materials = pd.Index(
+            sorted(
+                {m.lower() for m in self.impact_factors}
+                | {m.lower() for m in self.factor_curves}
+            )
+        )
+        stages = pd.Index(
+            sorted(
+                {_normalize_stage(s) for st in self.impact_factors.values() for s in st}
+                | {
+                    _normalize_stage(s)
+                    for st in self.factor_curves.values()
+                    for s in st
+                }
+            )
+        )
+        cube = np.zeros(
+            (
+                len(materials) + 1,
+                len(stages) + 1,
+                len(self.years),
+                len(FACTOR_IMPACT_COLUMNS),
+            )
+        )
+
+        # Static factors fill every year first ...
+        static = self._factors_df
+        if not static.empty:
+            m_idx = materials.get_indexer(static["material_type"])
+            s_idx = stages.get_indexer(static["life_cycle_stage"])
+            cube[m_idx, s_idx] = static[
+                ["carbon_factor", "energy_factor", "water_factor"]
+            ].to_numpy()[:, None, :]
+
+        # ... and are then overridden by the interpolated curves.
+        for material, stage_curves in self.factor_curves.items():
+            m = materials.get_loc(material.lower())
+            for stage, impacts in stage_curves.items():
+                s = stages.get_loc(_normalize_stage(stage))
+                for k, impact_type in enumerate(FACTOR_IMPACT_COLUMNS):
+                    curve = impacts.get(impact_type)
+                    if not curve:
+                        continue
+                    keyframes = sorted((int(y), float(v)) for y, v in curve.items())
+                    x, y = zip(*keyframes)
+                    cube[m, s, :, k] = np.interp(self.years, x, y)
+        return materials, stages, cube
+
+    def _check_years(self, year: pd.Series) -> np.ndarray:
+        """
+        Validates the years of an inventory, extending the default range to them.
+
+        Curves are constant outside their years, so a wider range only repeats
+        the edge factors.
+
+        Raises:
+            ValueError: If a year is missing or outside a range given explicitly
+        """
+        if year.isna().any():
+            raise ValueError("Every inventory row needs a 'year'")
+        year = year.to_numpy(dtype=np.int64)
+        if not len(year):
+            return year
+        first, last = int(year.min()), int(year.max())
+        if first < self.years[0] or last > self.years[-1]:
+            if self.fixed_years:
+                raise ValueError(
+                    f"Years {first}-{last} are outside the compiled range "
+                    f"{self.years[0]}-{self.years[-1]}"
+                )
+            self.years = np.arange(
+                min(first, self.years[0]), max(last, self.years[-1]) + 1
+            )
+            self._materials, self._stages, self._factor_cube = (
+                self._compile_factor_cube()
+            )
+        return year
+
+    def get_factors(self, data: pd.DataFrame) -> np.ndarray:
+        """
+        Gathers the (n_rows, 3) carbon/energy/water factors for each inventory row.
+
+        Raises:
+            ValueError: If a year is missing or outside the compiled range
+        """
+        y_idx = self._check_years(data["year"]) - self.years[0]
+        m_idx = self._materials.get_indexer(data["material_type"].str.lower())
+        s_idx = self._stages.get_indexer(
+            data["life_cycle_stage"].str.lower().map(_normalize_stage)
+        )
+        return self._factor_cube[m_idx, s_idx, y_idx]
+
+    def calculate_impacts(self, data: pd.DataFrame) -> pd.DataFrame:
+        """
+        Calculates impacts using the factors of each row's manufacturing year.
+
+        Args:
+            data: Inventory DataFrame including a 'year' column.
+
+        Returns:
+            The inventory with 'carbon_impact', 'energy_impact' and 'water_impact' columns.
+
+        Raises:
+            ValueError: If the inventory has no 'year' column
+        """
+        if "year" not in data.columns:
+            raise ValueError("Time-dependent calculation requires a 'year' column")
+
+        factors = self.get_factors(data)
+        impacts = data["quantity_kg"].to_numpy(dtype=float)[:, None] * factors + data[
+            DIRECT_COLUMNS
+        ].fillna(0).to_numpy(dtype=float)
+        result = data.copy()
+        result[FACTOR_IMPACT_COLUMNS] = impacts
+        return result
+
+    def time_series(
+        self, impacts: pd.DataFrame, impact_type: str = "carbon_impact"
+    ) -> pd.DataFrame:
+        """
+        Builds a product x year table of the given impact.
+
+        Args:
+            impacts: Output of calculate_impacts
+            impact_type: Impact column to aggregate
+
+        Returns:
+            DataFrame indexed by product_id with one column per compiled year
+
+        Raises:
+            ValueError: If a year is missing or outside the compiled range
+        """
+        year = self._check_years(impacts["year"])
+        series = (
+            impacts.assign(year=year)
+            .groupby(["product_id", "year"])[impact_type]
+            .sum()
+            .unstack(fill_value=0.0)
+        )
+        return series.reindex(columns=self.years, fill_value=0.0)
+
+    def cumulative_impacts(
+        self, impacts: pd.DataFrame, impact_type: str = "carbon_impact"
+    ) -> pd.DataFrame:
+        """Returns the running total of the given impact per product over the years."""
+        return self.time_series(impacts, impact_type).cumsum(axis=1)
+
+    def discounted_impacts(
+        self,
+        impacts: pd.DataFrame,
+        discount_rate: float,
+        base_year: Optional[int] = None,
+        impact_type: str = "carbon_impact",
+        cumulative: bool = False,
+    ) -> pd.DataFrame:
+        """
+        Discounts the yearly impacts per product to a base year.
+
+        Args:
+            impacts: Output of calculate_impacts
+            discount_rate: Annual discount rate (e.g., 0.03 for 3%)
+            base_year: Year with a weight of 1. Defaults to the first compiled year.
+            impact_type: Impact column to aggregate
+            cumulative: If True, returns the running total of the discounted impacts
+
+        Returns:
+            DataFrame indexed by product_id with one column per compiled year
+        """
+        if base_year is None:
+            base_year = int(self.years[0])
+        weights = (1.0 + discount_rate) ** -(self.years - base_year).astype(float)
+        discounted = self.time_series(impacts, impact_type) * weights
+        return discounted.cumsum(axis=1) if cumulative else discounted
@@ -0,0 +1,287 @@
+"""
+Impact factor store module for LCA tool.
+Keeps versioned factor libraries in SQLite and loads only the materials a run needs.
+
+Import a library with
+`python -m src.factor_store factors.sqlite import impact_factors.json --version v1`.
+"""
+
+import argparse
+import sqlite3
+import time
+import pandas as pd
+from collections import OrderedDict
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Union
+
+from .calculations import LCACalculator, _normalize_stage
+from .data_input import DataInput
+from .utils import FACTOR_IMPACT_COLUMNS
+
+# SQLite allows at most 999 parameters per statement in older builds.
+QUERY_BATCH = 900
+
+
+class FactorStore:
+    """
+    Versioned impact factor library in a local SQLite database.
+
+    Factors are stored one row per (version, material, stage, region) under a
+    primary-key index, so looking up a few materials out of tens of thousands is an
+    index seek. Looked-up materials (including misses) are kept in an LRU cache.
+    Region-specific factors override the global ones (region '').
+    """
+
+    def __init__(self, db_path: Union[str, Path], cache_size: int = 4096):
+        """
+        Args:
+            db_path: SQLite database file; created if it does not exist
+            cache_size: Number of (version, region, material) entries kept in memory
+        """
+        self.db_path = Path(db_path)
+        self.cache_size = cache_size
+        self.hits = 0
+        self.misses = 0
+        self._cache: "OrderedDict[tuple, Dict]" = OrderedDict()
+        self._conn = sqlite3.connect(self.db_path)
+        with self._conn:
+            self._conn.executescript("""
+                CREATE TABLE IF NOT EXISTS versions (
+                    version TEXT PRIMARY KEY,
+                    created_at REAL NOT NULL,
+                    description TEXT
+                );
+                CREATE TABLE IF NOT EXISTS factors (
+                    version TEXT NOT NULL,
+                    material TEXT NOT NULL,
+                    stage TEXT NOT NULL,
+                    region TEXT NOT NULL DEFAULT '',
+                    carbon_impact REAL,
+                    energy_impact REAL,
+                    water_impact REAL,
+                    PRIMARY KEY (version, material, stage, region)
+                ) WITHOUT ROWID;
+                """)
+
+    def add_version(
+        self,
+        version: str,
+        factors: Union[Dict, str, Path],
+        description: str = "",
+        region: str = "",
+    ) -> int:
+        """
+        Stores a factor library as a new version.
+
+        Args:
+            version: Version label, e.g. '2024.1'
+            factors: Nested {material: {stage: {impact: value}}} dictionary in the
+                format of impact_factors.json, or the path of such a file
+            description: Free-text notes on the version
+            region: Region the factors apply to ('' for global). Impacts a
+                regional factor leaves out fall back to the global factor.
+
+        Returns:
+            Number of stored factor rows
+
+        Raises:
+            ValueError: If the version already holds factors for the region
+        """
+        if not isinstance(factors, dict):
+            factors = DataInput().read_impact_factors(factors)
+        exists = self._conn.execute(
+            "SELECT 1 FROM factors WHERE version = ? AND region = ? LIMIT 1",
+            (version, region),
+        ).fetchone()
+        if exists:
+            raise ValueError(f"Factor version {version!r} already exists")
+
+        rows = [
+            (
+                version,
+                material.lower(),
+                _normalize_stage(stage),
+                region,
+                *(impacts.get(impact) for impact in FACTOR_IMPACT_COLUMNS),
+            )
+            for material, stages in factors.items()
+            for stage, impacts in stages.items()
+        ]
+        with self._conn:
+            self._conn.execute(
+                "INSERT OR IGNORE INTO versions VALUES (?, ?, ?)",
+                (version, time.time(), description),
+            )
+            self._conn.executemany(
+                "INSERT OR REPLACE INTO factors VALUES (?, ?, ?, ?, ?, ?, ?)", rows
+            )
+        return len(rows)
+
+    def versions(self) -> pd.DataFrame:
+        """Returns the stored versions, oldest first, with their factor counts."""
+        return pd.read_sql_query(
+            "SELECT v.version, v.created_at, v.description, "
+            "COUNT(f.material) AS factors FROM versions v "
+            "LEFT JOIN factors f ON f.version = v.version "
+            "GROUP BY v.version ORDER BY v.created_at",
+            self._conn,
+        )
+
+    def latest_version(self) -> str:
+        """
+        Returns the most recently added version.
+
+        Raises:
+            ValueError: If the store is empty
+        """
+        row = self._conn.execute(
+            "SELECT version FROM versions ORDER BY created_at DESC LIMIT 1"
+        ).fetchone()
+        if row is None:
+            raise ValueError(f"No factor versions in {self.db_path}")
+        return row[0]
+
+    def _fetch(self, version: str, region: str, materials: List[str]) -> Dict:
+        """
+        Queries the database for the given materials.
+
+        Regional factors override the global ones impact by impact; impacts
+        missing from a regional row keep their global value.
+        """
+        found = {material: {} for material in materials}
+        regions = ("", region) if region else ("",)
+        for start in range(0, len(materials), QUERY_BATCH):
+            batch = materials[start : start + QUERY_BATCH]
+            placeholders = ", ".join("?" * len(batch))
+            rows = self._conn.execute(
+                "SELECT material, stage, region, carbon_impact, energy_impact, "
+                "water_impact FROM factors WHERE version = ? AND region IN "
+                f"({', '.join('?' * len(regions))}) AND material IN ({placeholders}) "
+                "ORDER BY region",  # '' sorts first, so regional rows override
+                (version, *regions, *batch),
+            )
+            for material, stage, _, *values in rows:
+                factor = found[material].setdefault(stage, {})
+                for impact, value in zip(FACTOR_IMPACT_COLUMNS, values):
+                    if value is not None or impact not in factor:
+                        factor[impact] = value
+        # Impacts given neither regionally nor globally count as zero
+        for stages in found.values():
+            for factor in stages.values():
+                for impact, value in factor.items():
+                    if value is None:
+                        factor[impact] = 0
+        return found
+
+    def get_factors(
+        self,
+        materials: Iterable[str],
+        version: Optional[str] = None,
+        region: str = "",
+    ) -> Dict:
+        """
+        Returns the factors of the given materials.
+
+        Args:
+            materials: Material names (case-insensitive)
+            version: Factor version. Defaults to the latest.
+            region: Optional region whose factors override the global ones
+
+        Returns:
+            Nested dictionary in the format of impact_factors.json; unknown
+            materials are left out
+        """
+        version = version or self.latest_version()
+        materials = list(dict.fromkeys(str(m).lower() for m in materials))
+        result, missing = {}, []
+        for material in materials:
+            key = (version, region, material)
+            if key in self._cache:
+                self._cache.move_to_end(key)
+                self.hits += 1
+                result[material] = self._cache[key]
+            else:
+                self.misses += 1
+                missing.append(material)
+
+        if missing:
+            for material, stages in self._fetch(version, region, missing).items():
+                self._cache[(version, region, material)] = stages
+                result[material] = stages
+            while len(self._cache) > self.cache_size:
+                self._cache.popitem(last=False)
+        return {m: stages for m, stages in result.items() if stages}
+
+    def close(self) -> None:
+        self._conn.close()
+
+
+class StoreBackedCalculator(LCACalculator):
+    """
+    LCACalculator that loads factors lazily from a FactorStore.
+
+    Each calculate_impacts call fetches only the materials of the inventory it has
+    not seen yet, so streaming chunk after chunk through one calculator touches
+    the store once per material.
+    """
+
+    def __init__(
+        self, store: FactorStore, version: Optional[str] = None, region: str = ""
+    ):
+        self.store = store
+        self.factor_version = version or store.latest_version()
+        self.region = region
+        self._loaded = set()
+        super().__init__(impact_factors={})
+
+    def _prepare_factors_dataframe(self) -> pd.DataFrame:
+        factors_df = super()._prepare_factors_dataframe()
+        if factors_df.empty:
+            factors_df = pd.DataFrame(
+                columns=[
+                    "material_type",
+                    "life_cycle_stage",
+                    "carbon_factor",
+                    "energy_factor",
+                    "water_factor",
+                ]
+            ).astype({"material_type": str, "life_cycle_stage": str})
+        return factors_df
+
+    def calculate_impacts(self, data: pd.DataFrame) -> pd.DataFrame:
+        materials = set(data["material_type"].astype(str).str.lower().unique())
+        new = materials - self._loaded
+        if new:
+            self.impact_factors.update(
+                self.store.get_factors(new, self.factor_version, self.region)
+            )
+            self._loaded |= new
+            self._factors_df = self._prepare_factors_dataframe()
+        return super().calculate_impacts(data)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Manage an impact factor store.")
+    parser.add_argument("db", help="SQLite factor store.")
+    commands = parser.add_subparsers(dest="command", required=True)
+    add = commands.add_parser("import", help="Import a JSON factor file as a version.")
+    add.add_argument("factors", help="Impact factors JSON file.")
+    add.add_argument("--version", required=True)
+    add.add_argument("--region", default="")
+    add.add_argument("--description", default="")
+    commands.add_parser("versions", help="List the stored versions.")
+    args = parser.parse_args()
+
+    store = FactorStore(args.db)
+    if args.command == "import":
+        count = store.add_version(
+            args.version, args.factors, args.description, args.region
+        )
+        print(f"Stored {count} factors as version {args.version}")
+    else:
+        print(store.versions().to_string(index=False))
+    store.close()
+
+
+if __name__ == "__main__":
+    main()
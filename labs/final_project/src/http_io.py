@@ -0,0 +1,76 @@
+"""
+HTTP helpers for LCA tool.
+Minimal HTTP/1.1 request and response handling shared by the local servers.
+"""
+
+import asyncio
+import ipaddress
+import json
+from typing import Dict, Tuple
+
+REASONS = {
+    200: "OK",
+    400: "Bad Request",
+    404: "Not Found",
+    415: "Unsupported Media Type",
+    500: "Internal Server Error",
+}
+
+
+class HTTPError(Exception):
+    """An error that is reported to the client with the given status code."""
+
+    def __init__(self, status: int, message: str):
+        super().__init__(message)
+        self.status = status
+
+
+async def read_request(
+    reader: asyncio.StreamReader,
+) -> Tuple[str, str, Dict[str, str], bytes]:
+    """Reads one HTTP/1.1 request (request line, headers and Content-Length body)."""
+    request_line = (await reader.readline()).decode("latin-1").strip()
+    if not request_line:
+        raise HTTPError(400, "Empty request")
+    method, target, _ = request_line.split(" ", 2)
+    headers = {}
+    while True:
+        line = (await reader.readline()).decode("latin-1").strip()
+        if not line:
+            break
+        name, _, value = line.partition(":")
+        headers[name.strip().lower()] = value.strip()
+    length = int(headers.get("content-length", 0))
+    body = await reader.readexactly(length) if length else b""
+    return method.upper(), target, headers, body
+
+
+async def write_response(
+    writer: asyncio.StreamWriter, status: int, content_type: str, payload: bytes
+) -> None:
+    """Writes one HTTP/1.1 response and closes the connection."""
+    writer.write(
+        (
+            f"HTTP/1.1 {status} {REASONS.get(status, 'Error')}\r\n"
+            f"Content-Type: {content_type}\r\n"
+            f"Content-Length: {len(payload)}\r\n"
+            "Connection: close\r\n\r\n"
+        ).encode()
+        + payload
+    )
+    await writer.drain()
+    writer.close()
+
+
+def require_loopback(host: str) -> None:
+    """
+    Raises:
+        ValueError: If host is not a loopback address
+    """
+    if host != "localhost" and not ipaddress.ip_address(host).is_loopback:
+        raise ValueError("LCA servers only listen on loopback addresses")
+
+
+def json_bytes(obj) -> bytes:
+    """Encodes a JSON response payload."""
+    return json.dumps(obj).encode()
@@ -0,0 +1,220 @@
+"""
+Instrumentation module for LCA tool.
+Times the LCA classes' method calls and writes them as Chrome traces or structured logs.
+"""
+
+import functools
+import inspect
+import json
+import os
+import sys
+import threading
+import time
+import tracemalloc
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Dict, Iterator, List, Optional, TextIO, Union
+
+import pandas as pd
+
+from .calculations import LCACalculator
+from .data_input import DataInput
+from .pipeline import LCAPipeline
+from .visualization import LCAVisualizer
+
+TRACE_ENV_VAR = "LCA_TRACE"
+TRACED_CLASSES = (DataInput, LCACalculator, LCAVisualizer, LCAPipeline)
+
+
+def _rows(value) -> Optional[int]:
+    """Row count of a DataFrame or Series argument or result, else None."""
+    if isinstance(value, (pd.DataFrame, pd.Series)):
+        return len(value)
+    return None
+
+
+class Tracer:
+    """
+    Records one span per instrumented call: wall time, row counts and peak memory.
+
+    Nothing is patched until install() is called, so a tracer that is never
+    installed (the default) costs nothing. Once installed, every public method of
+    DataInput, LCACalculator, LCAVisualizer and LCAPipeline is wrapped; uninstall()
+    restores the original methods.
+
+    Output formats:
+        'chrome': a {"traceEvents": [...]} file for chrome://tracing or Perfetto
+        'jsonl': one JSON object per span (structured logs)
+    """
+
+    formats = ("chrome", "jsonl")
+
+    def __init__(
+        self,
+        output: Optional[Union[str, Path, TextIO]] = None,
+        format: Optional[str] = None,
+        memory: bool = True,
+    ):
+        """
+        Args:
+            output: Destination file or stream. Defaults to stderr (as jsonl).
+            format: 'chrome' or 'jsonl'. Defaults to 'chrome' for .json paths and
+                'jsonl' otherwise.
+            memory: Whether to sample peak memory with tracemalloc, which slows
+                allocation-heavy code; timings stay comparable across spans.
+
+        Raises:
+            ValueError: If the format is unknown
+        """
+        if format is None:
+            is_json = isinstance(output, (str, Path)) and Path(output).suffix == ".json"
+            format = "chrome" if is_json else "jsonl"
+        if format not in self.formats:
+            raise ValueError(f"Unsupported trace format: {format}")
+        self.output = output if output is not None else sys.stderr
+        self.format = format
+        self.memory = memory
+        self.spans: List[Dict] = []
+        self._originals: Dict = {}
+        self._peaks: List[int] = []
+        self._started_tracemalloc = False
+        self._origin = time.perf_counter_ns()
+
+    @contextmanager
+    def span(self, name: str, category: str = "lca", **args) -> Iterator[Dict]:
+        """
+        Times a block of code.
+
+        Yields:
+            The mutable args of the span, so callers can attach e.g. row counts
+        """
+        if self.memory:
+            # Nested spans: fold the running peak into the parent before resetting.
+            current, peak = tracemalloc.get_traced_memory()
+            if self._peaks:
+                self._peaks[-1] = max(self._peaks[-1], peak)
+            self._peaks.append(0)
+            tracemalloc.reset_peak()
+            start_memory = current
+        start = time.perf_counter_ns()
+        try:
+            yield args
+        finally:
+            end = time.perf_counter_ns()
+            if self.memory:
+                peak = max(self._peaks.pop(), tracemalloc.get_traced_memory()[1])
+                if self._peaks:
+                    self._peaks[-1] = max(self._peaks[-1], peak)
+                tracemalloc.reset_peak()
+                args["peak_memory_mb"] = round((peak - start_memory) / 2**20, 3)
+            self._record(name, category, start, end, args)
+
+    def _record(self, name: str, category: str, start: int, end: int, args: Dict):
+        span = {
+            "name": name,
+            "cat": category,
+            "start_us": (start - self._origin) / 1000,
+            "duration_ms": (end - start) / 1e6,
+            "thread": threading.get_ident(),
+            **args,
+        }
+        self.spans.append(span)
+        if self.format == "jsonl" and not isinstance(self.output, (str, Path)):
+            self.output.write(json.dumps(span) + "\n")
+
+    def _wrap(self, cls: type, method_name: str, method):
+        name = f"{cls.__name__}.{method_name}"
+        category = cls.__module__.rsplit(".", 1)[-1]
+
+        @functools.wraps(method)
+        def traced(*call_args, **call_kwargs):
+            frames = [a for a in call_args[1:] if _rows(a) is not None]
+            with self.span(name, category) as span_args:
+                if frames:
+                    span_args["rows_in"] = _rows(frames[0])
+                result = method(*call_args, **call_kwargs)
+                if _rows(result) is not None:
+                    span_args["rows_out"] = _rows(result)
+            return result
+
+        return traced
+
+    def install(self) -> "Tracer":
+        """Wraps the public methods of the traced classes."""
+        if self._originals:
+            return self
+        if self.memory and not tracemalloc.is_tracing():
+            tracemalloc.start()
+            self._started_tracemalloc = True
+        for cls in TRACED_CLASSES:
+            for method_name, method in list(vars(cls).items()):
+                if method_name.startswith("_") or not inspect.isfunction(method):
+                    continue
+                self._originals[(cls, method_name)] = method
+                setattr(cls, method_name, self._wrap(cls, method_name, method))
+        return self
+
+    def uninstall(self) -> None:
+        """Restores the original methods."""
+        for (cls, method_name), method in self._originals.items():
+            setattr(cls, method_name, method)
+        self._originals.clear()
+        if self._started_tracemalloc:
+            tracemalloc.stop()
+            self._started_tracemalloc = False
+
+    def chrome_trace(self) -> Dict:
+        """Returns the spans as Chrome trace 'complete' events."""
+        events = []
+        for span in self.spans:
+            meta = ("name", "cat", "start_us", "duration_ms", "thread")
+            events.append(
+                {
+                    "name": span["name"],
+                    "cat": span["cat"],
+                    "ph": "X",
+                    "ts": span["start_us"],
+                    "dur": span["duration_ms"] * 1000,
+                    "pid": os.getpid(),
+                    "tid": span["thread"],
+                    "args": {k: v for k, v in span.items() if k not in meta},
+                }
+            )
+        return {"traceEvents": events, "displayTimeUnit": "ms"}
+
+    def close(self) -> None:
+        """Uninstalls the tracer and writes the collected spans to a file output."""
+        self.uninstall()
+        if not isinstance(self.output, (str, Path)):
+            if self.format == "chrome":
+                json.dump(self.chrome_trace(), self.output)
+            return
+        with open(self.output, "w") as f:
+            if self.format == "chrome":
+                json.dump(self.chrome_trace(), f)
+            else:
+                f.writelines(json.dumps(span) + "\n" for span in self.spans)
+
+    def __enter__(self) -> "Tracer":
+        return self.install()
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+
+def tracer_from_env(environ: Optional[Dict[str, str]] = None) -> Optional[Tracer]:
+    """
+    Creates a tracer from the LCA_TRACE environment variable.
+
+    LCA_TRACE=1 logs spans to stderr, LCA_TRACE=trace.json writes a Chrome trace and
+    any other path writes JSON lines. Unset, empty or '0' disables tracing.
+
+    Returns:
+        An uninstalled Tracer, or None if tracing is disabled
+    """
+    value = (environ if environ is not None else os.environ).get(TRACE_ENV_VAR, "")
+    if value in ("", "0"):
+        return None
+    if value.lower() in ("1", "true", "stderr"):
+        return Tracer()
+    return Tracer(value)
@@ -0,0 +1,173 @@
+"""
+Normalization module for LCA tool.
+Scales impact columns by global or group-wise references, in memory or in chunks.
+"""
+
+import numpy as np
+import pandas as pd
+from pathlib import Path
+from typing import Dict, List, Optional, Union
+
+from .utils import FACTOR_IMPACT_COLUMNS
+
+
+class ImpactNormalizer:
+    """
+    Divides impact columns by a reference value.
+
+    Schemes:
+        'max': the largest value (of the group), giving a 0-1 scale as before
+        'sum': the total (of the group), giving each row's share
+        'reference': externally supplied values, e.g. per-capita footprints
+
+    Without group_by a single reference per column is used; with group_by (e.g.
+    'material_type' or ['material_type', 'life_cycle_stage']) each group has its own.
+    Non-positive references leave the values unchanged, matching normalize_impacts.
+    """
+
+    schemes = ("max", "sum", "reference")
+
+    def __init__(
+        self,
+        scheme: str = "max",
+        group_by: Optional[Union[str, List[str]]] = None,
+        references: Optional[Union[Dict[str, float], pd.DataFrame]] = None,
+        columns: Optional[List[str]] = None,
+    ):
+        """
+        Args:
+            scheme: 'max', 'sum' or 'reference'
+            group_by: Optional column(s) defining the normalization groups
+            references: Reference values for the 'reference' scheme, as a
+                {column: value} dictionary (the same for every group) or a
+                DataFrame indexed by the group_by columns
+            columns: Columns to normalize. Defaults to carbon, energy and water.
+
+        Raises:
+            ValueError: If the scheme is unknown or references are missing
+        """
+        if scheme not in self.schemes:
+            raise ValueError(f"Unsupported normalization scheme: {scheme}")
+        if scheme == "reference" and references is None:
+            raise ValueError("The 'reference' scheme requires reference values")
+        self.scheme = scheme
+        self.group_by = [group_by] if isinstance(group_by, str) else group_by
+        if self.group_by is not None:
+            self.group_by = list(self.group_by)
+        self.columns = list(columns or FACTOR_IMPACT_COLUMNS)
+        if isinstance(references, dict):
+            references = pd.DataFrame([references])
+        self.references = references
+
+    def compute_references(self, data: pd.DataFrame) -> pd.DataFrame:
+        """
+        Computes the reference values of a (partial) dataset in one grouped pass.
+
+        Returns:
+            DataFrame with one row (no grouping) or one row per group
+        """
+        if self.scheme == "reference":
+            return self.references
+        if self.group_by is None:
+            values = data[self.columns].agg(self.scheme)
+            return values.to_frame().T.reset_index(drop=True)
+        return data.groupby(self.group_by)[self.columns].agg(self.scheme)
+
+    def combine_references(
+        self, first: Optional[pd.DataFrame], second: pd.DataFrame
+    ) -> pd.DataFrame:
+        """Merges the references of two chunks (max of maxima, sum of sums)."""
+        if first is None or self.scheme == "reference":
+            return second
+        combined = pd.concat([first, second])
+        if self.group_by is None:
+            return combined.agg(self.scheme).to_frame().T.reset_index(drop=True)
+        return combined.groupby(level=list(range(len(self.group_by)))).agg(self.scheme)
+
+    def _gather(self, data: pd.DataFrame, references: pd.DataFrame) -> np.ndarray:
+        """
+        Returns the (n_rows, n_columns) reference of every row.
+
+        A single reference row that is not indexed by the groups (e.g. from a
+        dictionary) applies to every group.
+
+        Raises:
+            ValueError: If several references are not indexed by group_by
+        """
+        references = references[self.columns]
+        if self.group_by is None or list(references.index.names) != self.group_by:
+            if self.group_by is not None and len(references) != 1:
+                raise ValueError(
+                    f"Group-wise references must be indexed by {self.group_by}"
+                )
+            return references.to_numpy(dtype=float)[:1]  # broadcasts over the rows
+        if len(self.group_by) == 1:
+            keys = pd.Index(data[self.group_by[0]])
+        else:
+            keys = pd.MultiIndex.from_frame(data[self.group_by])
+        return references.reindex(keys).to_numpy(dtype=float)
+
+    def transform(
+        self, data: pd.DataFrame, references: Optional[pd.DataFrame] = None
+    ) -> pd.DataFrame:
+        """
+        Normalizes all columns at once.
+
+        Only the normalized columns are new; the other columns are shared with the
+        input rather than copied.
+
+        Args:
+            data: DataFrame to normalize
+            references: Precomputed references (e.g., from a first pass over a
+                larger dataset). Defaults to the references of data itself.
+
+        Returns:
+            DataFrame with the normalized columns
+        """
+        if references is None:
+            references = self.compute_references(data)
+        values = data[self.columns].to_numpy(dtype=float)
+        scale = self._gather(data, references)
+        with np.errstate(divide="ignore", invalid="ignore"):
+            normalized = np.where(scale > 0, values / scale, values)
+
+        result = data.copy(deep=False)
+        result[self.columns] = normalized
+        return result
+
+    def normalize_csv(
+        self,
+        input_path: Union[str, Path],
+        output_path: Union[str, Path],
+        chunksize: int = 100_000,
+    ) -> pd.DataFrame:
+        """
+        Normalizes a CSV file that does not fit in memory with two chunked passes.
+
+        The first pass accumulates the references, the second normalizes each chunk
+        and appends it to the output file.
+
+        Args:
+            input_path: CSV file to normalize
+            output_path: Destination CSV file
+            chunksize: Number of rows per chunk
+
+        Returns:
+            The references that were applied
+        """
+        references = None
+        if self.scheme != "reference":
+            for chunk in pd.read_csv(input_path, chunksize=chunksize):
+                references = self.combine_references(
+                    references, self.compute_references(chunk)
+                )
+        else:
+            references = self.references
+
+        header = True
+        for chunk in pd.read_csv(input_path, chunksize=chunksize):
+            self.transform(chunk, references).to_csv(
+                output_path, mode="w" if header else "a", header=header, index=False
+            )
+            header = False
+        return references
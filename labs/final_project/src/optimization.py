@@ -0,0 +1,231 @@
+"""
+Optimization module for LCA tool.
+Finds the material mix that minimises an impact subject to mass, cost and energy constraints.
+"""
+
+import numpy as np
+import pandas as pd
+from scipy import sparse
+from scipy.optimize import linprog
+from typing import Dict, List, Optional, Tuple
+
+from .calculations import LCACalculator, _normalize_stage
+
+FACTOR_COLUMNS = {
+    "carbon_impact": "carbon_factor",
+    "energy_impact": "energy_factor",
+    "water_impact": "water_factor",
+}
+
+
+class MaterialSubstitutionOptimizer:
+    """
+    Solves material substitution problems as linear programs.
+
+    Each product variant asks for a total mass split across the candidate materials.
+    The per-kg impact of a material is the sum of its factors over the selected life
+    cycle stages. All variants of a batch are stacked into one block-diagonal LP and
+    solved with a single HiGHS call, after a phase-1 LP has removed the variants whose
+    limits cannot be met.
+    """
+
+    def __init__(
+        self,
+        calculator: LCACalculator,
+        material_costs: Dict[str, float],
+        stages: Optional[List[str]] = None,
+        share_bounds: Optional[Dict[str, Tuple[float, float]]] = None,
+    ):
+        """
+        Args:
+            calculator: Calculator whose factor table provides the per-kg impacts.
+            material_costs: Cost per kg of each candidate material.
+            stages: Life cycle stages to include. Defaults to all stages.
+            share_bounds: Optional (min_share, max_share) of the total mass per material.
+
+        Raises:
+            ValueError: If a candidate material has no impact factors or the share
+                bounds cannot add up to the total mass
+        """
+        factors = calculator._factors_df
+        if stages is not None:
+            stages = [_normalize_stage(s) for s in stages]
+            factors = factors[factors["life_cycle_stage"].isin(stages)]
+        per_kg = factors.groupby("material_type")[list(FACTOR_COLUMNS.values())].sum()
+
+        self.materials = [m.lower() for m in material_costs]
+        missing = [m for m in self.materials if m not in per_kg.index]
+        if missing:
+            raise ValueError(f"No impact factors for materials: {missing}")
+
+        self.factors = per_kg.loc[self.materials]
+        self.costs = np.array(list(material_costs.values()), dtype=float)
+        share_bounds = {k.lower(): v for k, v in (share_bounds or {}).items()}
+        self._share_bounds = np.array(
+            [share_bounds.get(m, (0.0, 1.0)) for m in self.materials], dtype=float
+        )
+        if self._share_bounds[:, 0].sum() > 1 or self._share_bounds[:, 1].sum() < 1:
+            raise ValueError("Share bounds cannot add up to the total mass")
+
+    def _build_constraints(self, variants: pd.DataFrame) -> Dict:
+        """
+        Stacks the constraints of a block of variants into block-diagonal matrices.
+
+        Returns:
+            Dictionary with the linprog arguments A_ub, b_ub, A_eq, b_eq and bounds,
+            plus 'owner', the variant position of each A_ub row
+        """
+        n_variants, n_materials = len(variants), len(self.materials)
+        identity = sparse.identity(n_variants, format="csr")
+        mass = variants["mass_kg"].to_numpy(dtype=float)
+
+        a_ub, b_ub, owner = [], [], []
+        for column, row in [
+            ("max_cost", self.costs),
+            ("max_energy", self.factors["energy_factor"].to_numpy()),
+        ]:
+            if column not in variants:
+                continue
+            limit = variants[column].to_numpy(dtype=float)
+            active = np.isfinite(limit)
+            if active.any():
+                a_ub.append(sparse.kron(identity[active], row[None, :]))
+                b_ub.append(limit[active])
+                owner.append(np.flatnonzero(active))
+
+        shares = self._share_bounds
+        return {
+            "A_ub": sparse.vstack(a_ub, format="csr") if a_ub else None,
+            "b_ub": np.concatenate(b_ub) if b_ub else None,
+            "owner": np.concatenate(owner) if owner else np.empty(0, dtype=int),
+            "A_eq": sparse.kron(identity, np.ones((1, n_materials)), format="csr"),
+            "b_eq": mass,
+            "bounds": np.column_stack(
+                [
+                    (mass[:, None] * shares[None, :, 0]).ravel(),
+                    (mass[:, None] * shares[None, :, 1]).ravel(),
+                ]
+            ),
+        }
+
+    def _find_infeasible(self, variants: pd.DataFrame) -> np.ndarray:
+        """
+        Flags the variants whose limits cannot be met, with one phase-1 LP.
+
+        Every limit gets an elastic slack variable and the LP minimises the total
+        relative violation. It is always feasible, and the variants left with a
+        positive slack are exactly the infeasible ones.
+        """
+        infeasible = np.zeros(len(variants), dtype=bool)
+        lp = self._build_constraints(variants)
+        if lp["A_ub"] is None:
+            return infeasible
+
+        n_rows, n_columns = lp["A_ub"].shape
+        scale = 1.0 + np.abs(lp["b_ub"])
+        result = linprog(
+            np.concatenate([np.zeros(n_columns), 1.0 / scale]),
+            A_ub=sparse.hstack([lp["A_ub"], -sparse.identity(n_rows)], format="csr"),
+            b_ub=lp["b_ub"],
+            A_eq=sparse.hstack(
+                [lp["A_eq"], sparse.csr_matrix((len(variants), n_rows))],
+                format="csr",
+            ),
+            b_eq=lp["b_eq"],
+            bounds=np.vstack([lp["bounds"], np.tile([0.0, np.inf], (n_rows, 1))]),
+            method="highs",
+        )
+        if result.status == 0:
+            violated = result.x[n_columns:] > 1e-7 * scale
+            infeasible[lp["owner"][violated]] = True
+        return infeasible
+
+    def _solve_block(
+        self, variants: pd.DataFrame, objective: np.ndarray
+    ) -> Optional[np.ndarray]:
+        """Solves a block of variants in one LP. Returns None if the LP is not optimal."""
+        lp = self._build_constraints(variants)
+        result = linprog(
+            np.tile(objective, len(variants)),
+            A_ub=lp["A_ub"],
+            b_ub=lp["b_ub"],
+            A_eq=lp["A_eq"],
+            b_eq=lp["b_eq"],
+            bounds=lp["bounds"],
+            method="highs",
+        )
+        if result.status != 0:
+            return None
+        return result.x.reshape(len(variants), len(self.materials))
+
+    def _solve_recursive(
+        self, variants: pd.DataFrame, objective: np.ndarray
+    ) -> np.ndarray:
+        """
+        Solves a block, bisecting it if it still fails (e.g., for numerical reasons) so
+        that a single bad variant does not invalidate the rest. Failed variants are
+        returned as NaN rows.
+        """
+        solution = self._solve_block(variants, objective)
+        if solution is not None:
+            return solution
+        if len(variants) == 1:
+            return np.full((1, len(self.materials)), np.nan)
+        half = len(variants) // 2
+        return np.vstack(
+            [
+                self._solve_recursive(variants.iloc[:half], objective),
+                self._solve_recursive(variants.iloc[half:], objective),
+            ]
+        )
+
+    def optimize(
+        self,
+        variants: pd.DataFrame,
+        minimize: str = "carbon_impact",
+        batch_size: int = 1000,
+    ) -> pd.DataFrame:
+        """
+        Finds the minimum-impact material mix for every product variant.
+
+        Args:
+            variants: One row per variant with 'variant_id' and 'mass_kg' columns and
+                optional 'max_cost' and 'max_energy' limits (NaN means unconstrained).
+            minimize: Impact to minimise ('carbon_impact', 'energy_impact' or
+                'water_impact')
+            batch_size: Number of variants stacked into one LP
+
+        Returns:
+            DataFrame with the status, optimal mass per material ('<material>_kg'),
+            the resulting impacts and the cost of each variant
+
+        Raises:
+            ValueError: If the objective or the variants are invalid
+        """
+        if minimize not in FACTOR_COLUMNS:
+            raise ValueError(f"Unsupported objective: {minimize}")
+        if not {"variant_id", "mass_kg"}.issubset(variants.columns):
+            raise ValueError("Variants must have 'variant_id' and 'mass_kg' columns")
+
+        objective = self.factors[FACTOR_COLUMNS[minimize]].to_numpy()
+        solution = np.full((len(variants), len(self.materials)), np.nan)
+        for start in range(0, len(variants), batch_size):
+            block = variants.iloc[start : start + batch_size]
+            rows = np.flatnonzero(~self._find_infeasible(block))
+            if len(rows):
+                solution[start + rows] = self._solve_recursive(
+                    block.iloc[rows], objective
+                )
+
+        result = pd.DataFrame(solution, columns=[f"{m}_kg" for m in self.materials])
+        result.insert(0, "variant_id", variants["variant_id"].to_numpy())
+        result.insert(
+            1,
+            "status",
+            np.where(np.isnan(solution).any(axis=1), "infeasible", "optimal"),
+        )
+        impacts = solution @ self.factors.to_numpy()
+        for k, impact_type in enumerate(FACTOR_COLUMNS):
+            result[impact_type] = impacts[:, k]
+        result["cost"] = solution @ self.costs
+        return result
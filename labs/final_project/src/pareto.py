@@ -0,0 +1,168 @@
+"""
+Multi-objective analysis module for LCA tool.
+Computes Pareto fronts, dominance ranks and crowding distances of product totals.
+"""
+
+import numpy as np
+import pandas as pd
+from bisect import bisect_right
+from typing import List, Optional
+
+PARETO_OBJECTIVES = ["carbon_impact", "energy_impact", "water_impact"]
+
+
+class _Staircase:
+    """
+    The non-dominated (f2, f3) pairs of one front, sorted by f2 ascending and f3
+    descending. Dominance queries and insertions use a binary search.
+    """
+
+    __slots__ = ("f2", "f3")
+
+    def __init__(self):
+        self.f2: List[float] = []
+        self.f3: List[float] = []
+
+    def dominates(self, f2: float, f3: float) -> bool:
+        """Returns True if a stored pair is <= (f2, f3) in both objectives."""
+        pos = bisect_right(self.f2, f2)
+        return pos > 0 and self.f3[pos - 1] <= f3
+
+    def insert(self, f2: float, f3: float) -> None:
+        """Inserts a non-dominated pair and drops the pairs it dominates."""
+        pos = bisect_right(self.f2, f2)
+        start = pos - 1 if pos > 0 and self.f2[pos - 1] == f2 else pos
+        end = pos
+        while end < len(self.f3) and self.f3[end] >= f3:
+            end += 1
+        self.f2[start:end] = [f2]
+        self.f3[start:end] = [f3]
+
+
+def dominance_ranks(points: np.ndarray) -> np.ndarray:
+    """
+    Assigns each point the index of its non-dominated front (0 = Pareto front).
+
+    The points are swept once in lexicographic order, so every potential dominator
+    of a point is ranked before it. Each front keeps a staircase of its (f2, f3)
+    pairs. Since a point dominated by front k is also dominated by every earlier
+    front, its rank is found with a binary search over the fronts, giving
+    O(n log n log F) for F fronts instead of O(n^2) pairwise comparisons.
+
+    Args:
+        points: (n, k) array of objectives to minimise, with k = 2 or 3
+
+    Returns:
+        Integer array of front indices
+
+    Raises:
+        ValueError: If the number of objectives is not supported
+    """
+    points = np.asarray(points, dtype=float)
+    if points.ndim != 2 or points.shape[1] not in (2, 3):
+        raise ValueError("Dominance ranks support two or three objectives")
+    if points.shape[1] == 2:
+        points = np.column_stack([points, np.zeros(len(points))])
+
+    # Identical points share a rank, so only the unique points are swept. Among
+    # unique points, a weakly better point always differs in one objective.
+    unique, inverse = np.unique(points, axis=0, return_inverse=True)
+    ranks = np.empty(len(unique), dtype=int)
+    fronts: List[_Staircase] = []
+    for i in np.lexsort(unique.T[::-1]):
+        _, f2, f3 = unique[i]
+        low, high = 0, len(fronts)
+        while low < high:
+            mid = (low + high) // 2
+            if fronts[mid].dominates(f2, f3):
+                low = mid + 1
+            else:
+                high = mid
+        if low == len(fronts):
+            fronts.append(_Staircase())
+        fronts[low].insert(f2, f3)
+        ranks[i] = low
+    return ranks[inverse.ravel()]
+
+
+def crowding_distances(points: np.ndarray, ranks: np.ndarray) -> np.ndarray:
+    """
+    Computes the NSGA-II crowding distance of each point within its front.
+
+    Boundary points of a front get an infinite distance. The computation is
+    vectorized per objective with a single sort by (rank, objective).
+
+    Args:
+        points: (n, k) array of objectives
+        ranks: Front index of each point, from dominance_ranks
+
+    Returns:
+        Array of crowding distances
+    """
+    points = np.asarray(points, dtype=float)
+    distances = np.zeros(len(points))
+    if len(points) == 0:
+        return distances
+    for k in range(points.shape[1]):
+        values = points[:, k]
+        order = np.lexsort((values, ranks))
+        sorted_values, sorted_ranks = values[order], ranks[order]
+
+        first = np.r_[True, sorted_ranks[1:] != sorted_ranks[:-1]]
+        last = np.r_[sorted_ranks[1:] != sorted_ranks[:-1], True]
+
+        # Objective range of each front, broadcast back to its members.
+        front_ids = np.cumsum(first) - 1
+        span = (sorted_values[last] - sorted_values[first])[front_ids]
+
+        gaps = np.zeros(len(points))
+        inner = ~(first | last)
+        neighbours = sorted_values[2:] - sorted_values[:-2]
+        with np.errstate(divide="ignore", invalid="ignore"):
+            gaps[1:-1][inner[1:-1]] = (neighbours / span[1:-1])[inner[1:-1]]
+        gaps[first | last] = np.inf
+        gaps[np.isnan(gaps)] = 0.0
+        distances[order] += gaps
+    return distances
+
+
+def pareto_analysis(
+    total_impacts: pd.DataFrame, objectives: Optional[List[str]] = None
+) -> pd.DataFrame:
+    """
+    Ranks products by Pareto dominance over their total impacts.
+
+    Args:
+        total_impacts: Output of LCACalculator.calculate_total_impacts
+        objectives: Impact columns to minimise (two or three).
+            Defaults to carbon, energy and water.
+
+    Returns:
+        Copy of total_impacts with 'pareto_rank' and 'crowding_distance' columns,
+        sorted by rank and by decreasing crowding distance
+    """
+    objectives = objectives or PARETO_OBJECTIVES
+    points = total_impacts[objectives].to_numpy(dtype=float)
+    ranks = dominance_ranks(points)
+    result = total_impacts.assign(
+        pareto_rank=ranks, crowding_distance=crowding_distances(points, ranks)
+    )
+    return result.sort_values(
+        ["pareto_rank", "crowding_distance"], ascending=[True, False], kind="stable"
+    )
+
+
+def pareto_front(
+    total_impacts: pd.DataFrame,
+    objectives: Optional[List[str]] = None,
+    max_products: Optional[int] = None,
+) -> List[str]:
+    """
+    Returns the IDs of the Pareto-optimal products, most spread-out first.
+
+    The result can be passed directly to LCAVisualizer.plot_product_comparison;
+    max_products keeps the radar chart readable.
+    """
+    ranked = pareto_analysis(total_impacts, objectives)
+    front = ranked.loc[ranked["pareto_rank"] == 0, "product_id"].tolist()
+    return front[:max_products] if max_products else front
@@ -0,0 +1,274 @@
+"""
+Pipeline module for LCA tool.
+Splits the end-to-end analysis into stages that can be re-run incrementally.
+"""
+
+import matplotlib.pyplot as plt
+import pandas as pd
+from pathlib import Path
+from typing import Callable, Dict, Iterable, List, Optional, Tuple
+
+from .calculations import LCACalculator
+from .data_input import DataInput
+from .utils import IMPACT_COLUMNS, hash_dataframe
+from .visualization import LCAVisualizer
+
+AGGREGATION_COLUMNS = ["product_id", "product_name"] + IMPACT_COLUMNS
+
+
+class FigureSpec:
+    """
+    Describes one output figure: the slice of the impacts it depends on and how to draw it.
+
+    The figure is only re-rendered when the content hash of its slice changes.
+    """
+
+    def __init__(
+        self,
+        filename: str,
+        select: Callable[[pd.DataFrame], pd.DataFrame],
+        render: Callable[[LCAVisualizer, pd.DataFrame], plt.Figure],
+    ):
+        self.filename = filename
+        self.select = select
+        self.render = render
+
+
+def default_figures(config: Dict) -> List[FigureSpec]:
+    """Returns the figures produced by run_analysis.py for the given configuration."""
+    products = config["analysis_products"]
+    lifecycle_id = products["lifecycle_id"]
+    comparison_ids = products["comparison_ids"]
+    eole_id = products["eole_id"]
+
+    def breakdown(visualizer, data):
+        fig = visualizer.plot_impact_breakdown(data, "carbon_impact", "material_type")
+        fig.suptitle("Carbon Impact Breakdown by Material Type", fontsize=16)
+        return fig
+
+    def lifecycle(visualizer, data):
+        fig = visualizer.plot_life_cycle_impacts(data, lifecycle_id)
+        fig.suptitle(
+            f"Lifecycle Impact Breakdown for Product {lifecycle_id}", fontsize=16
+        )
+        return fig
+
+    def comparison(visualizer, data):
+        fig = visualizer.plot_product_comparison(data, comparison_ids)
+        fig.suptitle(f"Product Comparison: {' vs '.join(comparison_ids)}", fontsize=16)
+        return fig
+
+    def end_of_life(visualizer, data):
+        fig = visualizer.plot_end_of_life_breakdown(data, eole_id)
+        fig.suptitle(f"End-of-Life Management for Product {eole_id}", fontsize=16)
+        return fig
+
+    def correlation(visualizer, data):
+        fig = visualizer.plot_impact_correlation(data)
+        fig.suptitle("Correlation Matrix of Environmental Impacts", fontsize=16)
+        return fig
+
+    rate_columns = ["recycling_rate", "landfill_rate", "incineration_rate"]
+    return [
+        FigureSpec(
+            "carbon_breakdown_by_material.png",
+            lambda df: df[["material_type", "carbon_impact"]],
+            breakdown,
+        ),
+        FigureSpec(
+            f"lifecycle_impacts_{lifecycle_id}.png",
+            lambda df: df.loc[
+                df["product_id"] == lifecycle_id,
+                ["product_id", "life_cycle_stage"] + IMPACT_COLUMNS,
+            ],
+            lifecycle,
+        ),
+        FigureSpec(
+            "product_comparison.png",
+            lambda df: df.loc[
+                df["product_id"].isin(comparison_ids), ["product_id"] + IMPACT_COLUMNS
+            ],
+            comparison,
+        ),
+        FigureSpec(
+            f"end_of_life_{eole_id}.png",
+            lambda df: df.loc[
+                df["product_id"] == eole_id, ["product_id"] + rate_columns
+            ],
+            end_of_life,
+        ),
+        FigureSpec(
+            "impact_correlation_matrix.png",
+            lambda df: df[IMPACT_COLUMNS],
+            correlation,
+        ),
+    ]
+
+
+class LCAPipeline:
+    """
+    Runs the LCA workflow as a sequence of cached stages.
+
+    Stages: 'factors' (read and compile impact factors), 'data' (read inventory),
+    'impacts' (calculate_impacts), 'aggregation' (calculate_total_impacts and CSV
+    export) and one 'figure:<filename>' stage per figure. A stage only runs when its
+    inputs changed since the previous run.
+    """
+
+    def __init__(self, config: Dict, figures: Optional[List[FigureSpec]] = None):
+        """
+        Args:
+            config: Configuration dictionary with 'paths' and 'analysis_products'
+                entries, as in run_analysis.py.
+            figures: Figures to produce. Defaults to default_figures(config).
+        """
+        self.config = config
+        self.figures = figures if figures is not None else default_figures(config)
+        self.data_input = DataInput()
+        self.visualizer: Optional[LCAVisualizer] = None
+        self.calculator: Optional[LCACalculator] = None
+        self.product_data: Optional[pd.DataFrame] = None
+        self.impacts_df: Optional[pd.DataFrame] = None
+        self.total_impacts_df: Optional[pd.DataFrame] = None
+        # Content hashes of the inputs each stage last ran on.
+        self._digests: Dict[str, str] = {}
+
+    @property
+    def input_paths(self) -> Dict[str, Path]:
+        """The input files the pipeline depends on, keyed by stage."""
+        paths = self.config["paths"]
+        return {
+            "factors": Path(paths["impact_factors"]).resolve(),
+            "data": Path(paths["input_data"]).resolve(),
+        }
+
+    def load_factors(self) -> None:
+        """Reads the impact factors and compiles a new calculator."""
+        impact_factors = self.data_input.read_impact_factors(
+            self.config["paths"]["impact_factors"]
+        )
+        self.calculator = LCACalculator(impact_factors=impact_factors)
+
+    def load_data(self) -> None:
+        """Reads the product inventory."""
+        self.product_data = self.data_input.read_data(
+            self.config["paths"]["input_data"]
+        )
+
+    def calculate(self) -> bool:
+        """
+        Calculates the detailed impacts and saves them if they changed.
+
+        Returns:
+            True if the impacts differ from the previous run
+        """
+        impacts_df = self.calculator.calculate_impacts(self.product_data.copy())
+        digest = hash_dataframe(impacts_df)
+        if digest == self._digests.get("impacts"):
+            return False
+
+        output_dir = Path(self.config["paths"]["output_data_dir"])
+        output_dir.mkdir(parents=True, exist_ok=True)
+        impacts_df.to_csv(output_dir / "detailed_impacts.csv", index=False)
+        self.impacts_df = impacts_df
+        self._digests["impacts"] = digest
+        return True
+
+    def aggregate(self) -> bool:
+        """
+        Aggregates the impacts per product and saves the summary if its input changed.
+
+        Returns:
+            True if the per-product totals were recalculated
+        """
+        digest = hash_dataframe(self.impacts_df[AGGREGATION_COLUMNS])
+        if digest == self._digests.get("aggregation"):
+            return False
+
+        output_dir = Path(self.config["paths"]["output_data_dir"])
+        output_dir.mkdir(parents=True, exist_ok=True)
+        self.total_impacts_df = self.calculator.calculate_total_impacts(self.impacts_df)
+        self.total_impacts_df.to_csv(
+            output_dir / "total_impacts_summary.csv", index=False
+        )
+        self._digests["aggregation"] = digest
+        return True
+
+    def render_figures(self, force: bool = False) -> List[str]:
+        """
+        Renders the figures whose input slice changed since they were last saved.
+
+        Args:
+            force: Re-render every figure regardless of its slice hash
+
+        Returns:
+            Filenames of the figures that were rendered
+        """
+        output_dir = Path(self.config["paths"]["output_figures_dir"])
+        output_dir.mkdir(parents=True, exist_ok=True)
+        if self.visualizer is None:
+            self.visualizer = LCAVisualizer()
+
+        rendered = []
+        for spec in self.figures:
+            data = spec.select(self.impacts_df)
+            digest = hash_dataframe(data)
+            if not force and self._digests.get(spec.filename) == digest:
+                continue
+            fig = spec.render(self.visualizer, data)
+            fig.savefig(output_dir / spec.filename)
+            plt.close(fig)
+            self._digests[spec.filename] = digest
+            rendered.append(spec.filename)
+        return rendered
+
+    def saved_figures(self) -> Dict[str, Tuple[str, Path]]:
+        """
+        Figures saved by render_figures.
+
+        Returns:
+            Dictionary mapping figure filenames to the content hash of the slice
+            they were rendered from and their path
+        """
+        output_dir = Path(self.config["paths"]["output_figures_dir"])
+        return {
+            spec.filename: (self._digests[spec.filename], output_dir / spec.filename)
+            for spec in self.figures
+            if spec.filename in self._digests
+        }
+
+    def run(self, changed_paths: Optional[Iterable[str]] = None) -> List[str]:
+        """
+        Runs the stages affected by the changed input files.
+
+        Args:
+            changed_paths: Input files that changed. None runs every stage.
+
+        Returns:
+            Names of the stages that were executed
+        """
+        if changed_paths is None or self.calculator is None:
+            stale = {"factors", "data"}
+        else:
+            changed = {Path(p).resolve() for p in changed_paths}
+            stale = {
+                stage for stage, path in self.input_paths.items() if path in changed
+            }
+        if not stale:
+            return []
+
+        executed = []
+        if "factors" in stale:
+            self.load_factors()
+            executed.append("factors")
+        if "data" in stale or self.product_data is None:
+            self.load_data()
+            executed.append("data")
+
+        executed.append("impacts")
+        if not self.calculate():
+            return executed
+        if self.aggregate():
+            executed.append("aggregation")
+        executed.extend(f"figure:{name}" for name in self.render_figures())
+        return executed
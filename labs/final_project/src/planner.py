@@ -0,0 +1,300 @@
+"""
+Execution planning module for LCA tool.
+Chooses in-memory, chunked or spill-to-disk execution to fit a memory budget.
+
+Run with `python -m src.planner data.csv --memory-budget 512 --output totals.csv`.
+"""
+
+import argparse
+import math
+import tempfile
+import pandas as pd
+from pathlib import Path
+from typing import Optional, Union
+
+from .calculations import LCACalculator
+from .data_input import NDJSON_FORMATS, DataInput
+from .pipeline import AGGREGATION_COLUMNS
+from .streaming import StreamingAggregator
+
+# Line-based formats that can be sampled and streamed.
+STREAMABLE_FORMATS = (".csv",) + NDJSON_FORMATS
+# calculate_impacts holds the input, the merged frame and the selected result at
+# the same time, each about as wide as the input.
+WORKING_SET_FACTOR = 4.0
+# Running statistics of one product in StreamingAggregator (arrays, dicts, strings).
+AGGREGATE_BYTES_PER_PRODUCT = 1500
+
+
+class ExecutionPlan:
+    """The execution mode picked for an input file, with the estimates behind it."""
+
+    def __init__(
+        self,
+        mode: str,
+        budget_bytes: int,
+        estimated_rows: int,
+        estimated_products: int,
+        bytes_per_row: float,
+        chunk_rows: Optional[int] = None,
+        partitions: int = 1,
+        reason: str = "",
+    ):
+        self.mode = mode
+        self.budget_bytes = budget_bytes
+        self.estimated_rows = estimated_rows
+        self.estimated_products = estimated_products
+        self.bytes_per_row = bytes_per_row
+        self.chunk_rows = chunk_rows
+        self.partitions = partitions
+        self.reason = reason
+
+    @property
+    def estimated_peak_bytes(self) -> int:
+        """Estimated peak memory of an in-memory run."""
+        return int(self.estimated_rows * self.bytes_per_row * WORKING_SET_FACTOR)
+
+    def describe(self) -> str:
+        """Returns a human-readable report of the plan."""
+        lines = [
+            f"Execution plan: {self.mode}",
+            f"  memory budget:          {self.budget_bytes / 2**20:,.1f} MB",
+            f"  estimated rows:         {self.estimated_rows:,}",
+            f"  estimated products:     {self.estimated_products:,}",
+            f"  in-memory peak:         {self.estimated_peak_bytes / 2**20:,.1f} MB",
+        ]
+        if self.chunk_rows is not None:
+            lines.append(f"  rows per chunk:         {self.chunk_rows:,}")
+        if self.mode == "spill":
+            lines.append(f"  spill partitions:       {self.partitions}")
+        lines.append(f"  reason: {self.reason}")
+        return "\n".join(lines)
+
+    def __repr__(self) -> str:
+        return (
+            f"ExecutionPlan(mode={self.mode!r}, chunk_rows={self.chunk_rows}, "
+            f"partitions={self.partitions})"
+        )
+
+
+class ExecutionPlanner:
+    """
+    Estimates the memory footprint of an inventory file and runs the impact
+    calculation and per-product aggregation within a memory budget.
+
+    Modes:
+        'in-memory': read the file at once and use the calculator directly
+        'chunked': stream the file and fold each chunk into a StreamingAggregator
+        'spill': stream the file, hash-partition the impacts by product to disk and
+            aggregate one partition at a time, chunk by chunk, for when even the
+            per-product state exceeds the budget
+    """
+
+    def __init__(
+        self,
+        memory_budget_mb: float,
+        sample_rows: int = 1000,
+        spill_dir: Optional[Union[str, Path]] = None,
+    ):
+        """
+        Args:
+            memory_budget_mb: Memory the calculation may use, in megabytes
+            sample_rows: Number of leading rows sampled to estimate the footprint
+            spill_dir: Directory for spill partitions. Defaults to the system temp.
+
+        Raises:
+            ValueError: If the budget is not positive
+        """
+        if memory_budget_mb <= 0:
+            raise ValueError("The memory budget must be positive")
+        self.budget_bytes = int(memory_budget_mb * 2**20)
+        self.sample_rows = sample_rows
+        self.spill_dir = spill_dir
+        self.data_input = DataInput()
+
+    def _estimate(self, file_path: Path):
+        """Returns (estimated rows, bytes per row in memory, rows per product)."""
+        file_size = file_path.stat().st_size
+        if file_path.suffix in STREAMABLE_FORMATS:
+            sample = next(
+                self.data_input.read_data_chunked(file_path, self.sample_rows),
+                pd.DataFrame(),
+            )
+            header = file_path.suffix == ".csv"
+            with open(file_path, "rb") as f:
+                header_bytes = len(f.readline()) if header else 0
+                sample_bytes = sum(len(f.readline()) for _ in range(len(sample)))
+            rows = round(
+                (file_size - header_bytes) / max(sample_bytes / max(len(sample), 1), 1)
+            )
+        else:
+            # Excel and JSON documents cannot be sampled; they are read whole anyway.
+            sample = self.data_input.read_data(file_path)
+            rows = len(sample)
+        if sample.empty:
+            return 0, 0.0, 1.0
+        bytes_per_row = sample.memory_usage(deep=True, index=False).sum() / len(sample)
+        rows_per_product = len(sample) / sample["product_id"].nunique()
+        return rows, bytes_per_row, rows_per_product
+
+    def plan(self, file_path: Union[str, Path]) -> ExecutionPlan:
+        """
+        Picks the cheapest mode whose estimated peak memory fits the budget.
+
+        Args:
+            file_path: Inventory file to process
+
+        Returns:
+            The chosen ExecutionPlan
+        """
+        file_path = Path(file_path)
+        rows, bytes_per_row, rows_per_product = self._estimate(file_path)
+        products = math.ceil(rows / rows_per_product)
+        plan = ExecutionPlan(
+            "in-memory", self.budget_bytes, rows, products, bytes_per_row
+        )
+
+        if plan.estimated_peak_bytes <= self.budget_bytes:
+            plan.reason = "the whole calculation fits in the budget"
+            return plan
+        if file_path.suffix not in STREAMABLE_FORMATS:
+            plan.reason = (
+                f"{file_path.suffix} files cannot be streamed; convert to CSV or "
+                "NDJSON to run within the budget"
+            )
+            return plan
+
+        # Half of the budget for the chunk being calculated, half for the aggregate.
+        half = self.budget_bytes / 2
+        plan.chunk_rows = max(1, int(half / (bytes_per_row * WORKING_SET_FACTOR)))
+        state_bytes = products * AGGREGATE_BYTES_PER_PRODUCT
+        if state_bytes <= half:
+            plan.mode = "chunked"
+            plan.reason = "the per-product totals fit in memory, the rows do not"
+            return plan
+
+        # Partitions are sized so that both the products and the rows of each one
+        # fit in half the budget.
+        plan.mode = "spill"
+        plan.partitions = max(
+            math.ceil(state_bytes / half),
+            math.ceil(rows * bytes_per_row * WORKING_SET_FACTOR / half),
+        )
+        plan.reason = "the per-product totals do not fit in memory"
+        return plan
+
+    def execute(
+        self,
+        file_path: Union[str, Path],
+        calculator: LCACalculator,
+        plan: Optional[ExecutionPlan] = None,
+        impacts_path: Optional[Union[str, Path]] = None,
+    ) -> pd.DataFrame:
+        """
+        Calculates the impacts and per-product totals of a file according to a plan.
+
+        Args:
+            file_path: Inventory file to process
+            calculator: Calculator to use
+            plan: Plan to follow. Defaults to self.plan(file_path).
+            impacts_path: Optional CSV file receiving the detailed impacts
+
+        Returns:
+            Per-product totals in the schema of calculate_total_impacts
+        """
+        plan = plan or self.plan(file_path)
+        if plan.mode == "in-memory":
+            impacts = calculator.calculate_impacts(self.data_input.read_data(file_path))
+            if impacts_path is not None:
+                impacts.to_csv(impacts_path, index=False)
+            return calculator.calculate_total_impacts(impacts)
+        if plan.mode == "chunked":
+            return self._execute_chunked(file_path, calculator, plan, impacts_path)
+        return self._execute_spill(file_path, calculator, plan, impacts_path)
+
+    def _iter_impacts(self, file_path, calculator, plan, impacts_path):
+        """Yields the impacts chunk by chunk, appending them to impacts_path."""
+        chunks = self.data_input.read_data_chunked(file_path, plan.chunk_rows)
+        for i, chunk in enumerate(chunks):
+            impacts = calculator.calculate_impacts(chunk)
+            if impacts_path is not None:
+                impacts.to_csv(
+                    impacts_path,
+                    mode="w" if i == 0 else "a",
+                    header=i == 0,
+                    index=False,
+                )
+            yield impacts
+
+    def _execute_chunked(self, file_path, calculator, plan, impacts_path):
+        aggregator = StreamingAggregator()
+        for impacts in self._iter_impacts(file_path, calculator, plan, impacts_path):
+            aggregator.update_frame(impacts)
+        return aggregator.snapshot()
+
+    def _execute_spill(self, file_path, calculator, plan, impacts_path):
+        with tempfile.TemporaryDirectory(dir=self.spill_dir) as spill_dir:
+            parts = [Path(spill_dir) / f"part_{i}.csv" for i in range(plan.partitions)]
+            for impacts in self._iter_impacts(
+                file_path, calculator, plan, impacts_path
+            ):
+                impacts = impacts[AGGREGATION_COLUMNS]
+                keys = pd.util.hash_array(impacts["product_id"].to_numpy(dtype=str))
+                for i, part in impacts.groupby(keys % plan.partitions, sort=False):
+                    path = parts[i]
+                    part.to_csv(path, mode="a", header=not path.exists(), index=False)
+
+            # Partitions are folded in chunks too: hashing cannot split the rows of
+            # one product, so a partition may still be larger than its share.
+            totals = []
+            for path in parts:
+                if path.exists():
+                    aggregator = StreamingAggregator()
+                    with pd.read_csv(
+                        path,
+                        dtype={"product_id": str, "product_name": str},
+                        chunksize=plan.chunk_rows,
+                    ) as reader:
+                        for chunk in reader:
+                            aggregator.update_frame(chunk)
+                    totals.append(aggregator.snapshot())
+        if not totals:
+            return pd.DataFrame(columns=AGGREGATION_COLUMNS)
+        return (
+            pd.concat(totals, ignore_index=True)
+            .sort_values(["product_id", "product_name"])
+            .reset_index(drop=True)
+        )
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Calculate per-product totals within a memory budget."
+    )
+    parser.add_argument(
+        "input", help="Inventory file (CSV and NDJSON files can be streamed)."
+    )
+    parser.add_argument("--factors", default="data/raw/impact_factors.json")
+    parser.add_argument("--memory-budget", type=float, required=True, metavar="MB")
+    parser.add_argument("--output", default="total_impacts_summary.csv")
+    parser.add_argument("--impacts-output", help="Also write the detailed impacts.")
+    parser.add_argument("--spill-dir", help="Directory for spill partitions.")
+    parser.add_argument("--dry-run", action="store_true", help="Only report the plan.")
+    args = parser.parse_args()
+
+    planner = ExecutionPlanner(args.memory_budget, spill_dir=args.spill_dir)
+    plan = planner.plan(args.input)
+    print(plan.describe())
+    if args.dry_run:
+        return
+
+    factors = DataInput().read_impact_factors(args.factors)
+    totals = planner.execute(
+        args.input, LCACalculator(factors), plan, impacts_path=args.impacts_output
+    )
+    totals.to_csv(args.output, index=False)
+    print(f"Totals of {len(totals):,} products written to {args.output}")
+
+
+if __name__ == "__main__":
+    main()
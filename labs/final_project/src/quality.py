@@ -0,0 +1,353 @@
+"""
+Data quality module for LCA tool.
+Detects duplicate rows and robust outliers in inventories and quarantines them.
+
+Run with `python -m src.quality inventory.csv --quarantine quarantine.csv`.
+"""
+
+import argparse
+import numpy as np
+import pandas as pd
+from typing import Dict, List, Optional, Tuple
+
+QUALITY_COLUMNS = [
+    "quantity_kg",
+    "energy_consumption_kwh",
+    "water_usage_liters",
+]
+
+# Issue flags of the quarantine index; a row can carry several.
+DUPLICATE = 1
+NEAR_DUPLICATE = 2
+OUTLIER_FLAGS = {column: 4 << i for i, column in enumerate(QUALITY_COLUMNS)}
+
+# Scales the MAD (or the mean absolute deviation when the MAD is zero) to the
+# standard deviation of a normal distribution (Iglewicz and Hoaglin).
+MAD_SCALE = 1.4826
+MEAN_AD_SCALE = 1.2533
+
+
+def _grouped(values: np.ndarray, codes: np.ndarray):
+    return pd.DataFrame(values).groupby(codes, sort=False)
+
+
+def _factorize(values: pd.Series, factorized: Dict[str, Tuple]) -> Tuple:
+    """Codes and uniques of a column, computed once per factorized dictionary."""
+    if values.name not in factorized:
+        factorized[values.name] = pd.factorize(values)
+    return factorized[values.name]
+
+
+class QualityReport:
+    """
+    Compact quarantine index of an inventory.
+
+    Holds one entry per flagged row: its position, a bit mask of its issues, the
+    position of the row it duplicates (-1 if none) and its largest robust
+    z-score.
+    """
+
+    def __init__(
+        self,
+        positions: np.ndarray,
+        issues: np.ndarray,
+        duplicate_of: np.ndarray,
+        robust_z: np.ndarray,
+        columns: List[str],
+        rows_checked: int,
+    ):
+        self.positions = positions
+        self.issues = issues
+        self.duplicate_of = duplicate_of
+        self.robust_z = robust_z
+        self.columns = columns
+        self.rows_checked = rows_checked
+
+    def __len__(self) -> int:
+        return len(self.positions)
+
+    def flags(self) -> dict:
+        """Issue names and their bits."""
+        flags = {"duplicate": DUPLICATE, "near_duplicate": NEAR_DUPLICATE}
+        for column in self.columns:
+            flags[f"outlier_{column}"] = OUTLIER_FLAGS[column]
+        return flags
+
+    def to_frame(self) -> pd.DataFrame:
+        """Returns the quarantine index with one boolean column per issue."""
+        frame = pd.DataFrame(
+            {
+                "row": self.positions,
+                "issues": self.issues,
+                "duplicate_of": self.duplicate_of,
+                "robust_z": self.robust_z,
+            }
+        )
+        for name, bit in self.flags().items():
+            frame[name] = (self.issues & bit) > 0
+        return frame
+
+    def summary(self) -> pd.Series:
+        """Number of rows per issue."""
+        return pd.Series(
+            {
+                name: int(np.count_nonzero(self.issues & bit))
+                for name, bit in self.flags().items()
+            },
+            name="rows",
+        )
+
+    def clean(self, data: pd.DataFrame) -> pd.DataFrame:
+        """Returns the rows of data that are not quarantined."""
+        keep = np.ones(len(data), dtype=bool)
+        keep[self.positions] = False
+        return data[keep]
+
+
+class DataQualityChecker:
+    """
+    Flags duplicate and implausible inventory rows before impacts are calculated.
+
+    Rows are reduced to 64-bit hashes: exact duplicates share the hash of their
+    raw values; near-duplicates share the hash of their normalized values (text
+    stripped and lower-cased, numbers rounded to a few significant digits), so
+    both are found with a hash table instead of pairwise comparisons. Outliers
+    use robust z-scores, 0.6745 * (x - median) / MAD, of log(x) within
+    (material, stage) groups; the medians and MADs of all columns come from one
+    grouped pass each, and groups below min_group_size are not assessed.
+    """
+
+    def __init__(
+        self,
+        columns: Optional[List[str]] = None,
+        group_by: Optional[List[str]] = None,
+        threshold: float = 3.5,
+        min_group_size: int = 5,
+        significant_digits: int = 3,
+        key_columns: Optional[List[str]] = None,
+        log_scale: bool = True,
+    ):
+        """
+        Args:
+            columns: Columns checked for outliers. Defaults to quantity, energy
+                and water.
+            group_by: Columns forming the outlier groups. Defaults to material
+                type and life cycle stage.
+            threshold: Absolute robust z-score above which a value is an outlier
+            min_group_size: Smallest group whose values are assessed
+            significant_digits: Precision of numbers when matching near-duplicates
+            key_columns: Columns compared for duplicates. Defaults to all columns.
+            log_scale: Score log(x) instead of x. Amounts are skewed and entry
+                errors (wrong units) are multiplicative, so this keeps large but
+                plausible values in. Zeros are not scored and negative amounts
+                are always outliers.
+
+        Raises:
+            ValueError: If a column has no outlier flag or a parameter is invalid
+        """
+        self.columns = list(columns or QUALITY_COLUMNS)
+        unknown = set(self.columns) - set(OUTLIER_FLAGS)
+        if unknown:
+            raise ValueError(f"No outlier flag for columns: {sorted(unknown)}")
+        if threshold <= 0 or min_group_size < 3 or significant_digits < 1:
+            raise ValueError(
+                "threshold must be positive, min_group_size at least 3 and "
+                "significant_digits at least 1"
+            )
+        self.group_by = list(group_by or ["material_type", "life_cycle_stage"])
+        self.threshold = threshold
+        self.min_group_size = min_group_size
+        self.significant_digits = significant_digits
+        self.key_columns = key_columns
+        self.log_scale = log_scale
+
+    def _hash_keys(
+        self, data: pd.DataFrame, near: bool, factorized: Dict[str, Tuple]
+    ) -> pd.DataFrame:
+        """
+        Integer codes of the text columns and the (rounded) numeric columns.
+
+        Text is factorized first, so normalization and hashing work on the
+        distinct values only.
+        """
+        keys = {}
+        for column in data.columns:
+            values = data[column]
+            if pd.api.types.is_numeric_dtype(values):
+                x = values.to_numpy(dtype=float)
+                if near:
+                    with np.errstate(divide="ignore", invalid="ignore"):
+                        exponent = np.floor(np.log10(np.abs(x)))
+                    exponent = np.where(np.isfinite(exponent), exponent, 0)
+                    scale = 10.0 ** (self.significant_digits - 1 - exponent)
+                    x = np.round(x * scale) / scale + 0.0
+                keys[column] = x
+            else:
+                codes, uniques = _factorize(values, factorized)
+                if near:
+                    normalized = (
+                        pd.Series(uniques, dtype="string")
+                        .str.strip()
+                        .str.lower()
+                        .str.replace(r"\s+", " ", regex=True)
+                    )
+                    merged, _ = pd.factorize(normalized)
+                    codes = np.append(merged, -1)[codes]
+                keys[column] = codes
+        return pd.DataFrame(keys)
+
+    def duplicate_hashes(
+        self,
+        data: pd.DataFrame,
+        near: bool = False,
+        factorized: Optional[Dict[str, Tuple]] = None,
+    ) -> np.ndarray:
+        """
+        Returns one 64-bit hash per row.
+
+        Text values enter the hash through their codes within data, so hashes
+        are only comparable between rows of the same table.
+
+        Args:
+            data: Inventory
+            near: Hash normalized values (text stripped and lower-cased, numbers
+                rounded to significant_digits), so near-duplicates collide
+            factorized: Optional dictionary of text column factorizations,
+                filled and reused across calls on the same data
+
+        Returns:
+            uint64 array
+        """
+        keys = data[self.key_columns] if self.key_columns else data
+        return pd.util.hash_pandas_object(
+            self._hash_keys(keys, near, {} if factorized is None else factorized),
+            index=False,
+        ).to_numpy()
+
+    def _first_occurrences(self, hashes: np.ndarray) -> np.ndarray:
+        """Position of the first row with the same hash, for every row."""
+        codes, _ = pd.factorize(hashes)
+        # Codes are numbered in order of appearance, so the k-th first
+        # occurrence belongs to code k.
+        first = np.flatnonzero(~pd.Series(codes).duplicated().to_numpy())
+        return first[codes]
+
+    def robust_z_scores(
+        self, data: pd.DataFrame, factorized: Optional[Dict[str, Tuple]] = None
+    ) -> np.ndarray:
+        """
+        Returns the robust z-score of every checked value within its group.
+
+        Values of groups smaller than min_group_size, of groups without spread
+        and missing values score 0. On the log scale, zeros score 0 and negative
+        values -inf.
+
+        Args:
+            data: Inventory
+            factorized: Optional dictionary of text column factorizations (see
+                duplicate_hashes)
+
+        Returns:
+            Array of shape (rows, columns)
+        """
+        factorized = {} if factorized is None else factorized
+        codes = np.zeros(len(data), dtype=np.int64)
+        for column in self.group_by:
+            column_codes, uniques = _factorize(data[column], factorized)
+            lowered, labels = pd.factorize(
+                pd.Series(uniques, dtype="string").str.lower()
+            )
+            # Missing keys form a group of their own
+            codes = (
+                codes * (len(labels) + 1)
+                + np.append(lowered, len(labels))[column_codes]
+            )
+        codes, _ = pd.factorize(codes)
+
+        values = data[self.columns].apply(pd.to_numeric, errors="coerce")
+        values = values.to_numpy(dtype=float)
+        negative = values < 0
+        if self.log_scale:
+            values = np.log(np.where(values > 0, values, np.nan))
+
+        grouped = _grouped(values, codes)
+        median = grouped.median().to_numpy()[codes]
+        count = grouped.count().to_numpy()[codes]
+        deviation = np.abs(values - median)
+        deviations = _grouped(deviation, codes)
+        mad = deviations.median().to_numpy()[codes] * MAD_SCALE
+        mean_ad = deviations.mean().to_numpy()[codes] * MEAN_AD_SCALE
+
+        scale = np.where(mad > 0, mad, mean_ad)
+        with np.errstate(divide="ignore", invalid="ignore"):
+            z = (values - median) / scale
+        z[~(scale > 0) | (count < self.min_group_size) | np.isnan(z)] = 0.0
+        if self.log_scale:
+            z[negative] = -np.inf
+        return z
+
+    def check(self, data: pd.DataFrame) -> QualityReport:
+        """
+        Runs all checks on an inventory.
+
+        A row is a duplicate if an earlier row has the same values, and a
+        near-duplicate if an earlier row matches it after normalization; the
+        first occurrence is never quarantined.
+
+        Args:
+            data: Inventory, e.g. the output of DataInput.read_data
+
+        Returns:
+            QualityReport of the flagged rows
+        """
+        issues = np.zeros(len(data), dtype=np.uint8)
+        factorized: Dict[str, Tuple] = {}
+        exact = self._first_occurrences(self.duplicate_hashes(data, False, factorized))
+        near = self._first_occurrences(self.duplicate_hashes(data, True, factorized))
+        rows = np.arange(len(data))
+        issues[exact != rows] |= DUPLICATE
+        issues[(near != rows) & (exact == rows)] |= NEAR_DUPLICATE
+        duplicate_of = np.where(exact != rows, exact, near)
+
+        z = self.robust_z_scores(data, factorized)
+        for k, column in enumerate(self.columns):
+            issues[np.abs(z[:, k]) > self.threshold] |= OUTLIER_FLAGS[column]
+
+        positions = np.flatnonzero(issues)
+        duplicate_of = duplicate_of[positions]
+        return QualityReport(
+            positions=positions,
+            issues=issues[positions],
+            duplicate_of=np.where(duplicate_of != positions, duplicate_of, -1),
+            robust_z=np.abs(z[positions]).max(axis=1, initial=0.0).astype(np.float32),
+            columns=self.columns,
+            rows_checked=len(data),
+        )
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Find duplicate and outlier rows of an inventory."
+    )
+    parser.add_argument("inventory", help="Inventory CSV.")
+    parser.add_argument(
+        "--quarantine", required=True, help="CSV to write the quarantine index to."
+    )
+    parser.add_argument("--clean", help="Also write the rows that passed to this CSV.")
+    parser.add_argument("--threshold", type=float, default=3.5)
+    parser.add_argument("--min-group-size", type=int, default=5)
+    args = parser.parse_args()
+
+    data = pd.read_csv(args.inventory, dtype={"product_id": str})
+    report = DataQualityChecker(
+        threshold=args.threshold, min_group_size=args.min_group_size
+    ).check(data)
+    report.to_frame().to_csv(args.quarantine, index=False)
+    print(f"{len(report)} of {report.rows_checked} rows quarantined")
+    print(report.summary().to_string())
+    if args.clean:
+        report.clean(data).to_csv(args.clean, index=False)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,273 @@
+"""
+Report module for LCA tool.
+Builds a self-contained HTML report with figures rendered in parallel and cached.
+"""
+
+import base64
+import glob
+import hashlib
+import html
+import io
+import multiprocessing
+import os
+import matplotlib
+import matplotlib.pyplot as plt
+import pandas as pd
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple, Union
+
+from .pipeline import FigureSpec
+from .utils import IMPACT_COLUMNS, hash_dataframe
+from .visualization import LCAVisualizer
+
+# Figures and input slices of the pool processes, inherited from the parent when
+# they are forked, so large slices are never pickled.
+_worker_figures: List[FigureSpec] = []
+_worker_slices: List[pd.DataFrame] = []
+_worker_visualizer: Optional[LCAVisualizer] = None
+
+IMPACT_LABELS = {
+    "carbon_impact": "Carbon Impact (kg CO2e)",
+    "energy_impact": "Energy Impact (kWh)",
+    "water_impact": "Water Impact (L)",
+    "waste_generated_kg": "Waste Generated (kg)",
+}
+
+PAGE_TEMPLATE = """<!DOCTYPE html>
+<html lang="en">
+<head>
+<meta charset="utf-8">
+<title>{title}</title>
+<style>
+body {{ font-family: sans-serif; margin: 2em auto; max-width: 1100px; color: #222; }}
+h1 {{ border-bottom: 2px solid #2a7; padding-bottom: .3em; }}
+table {{ border-collapse: collapse; margin: 1em 0; font-size: .9em; }}
+th, td {{ border: 1px solid #ccc; padding: .3em .6em; text-align: right; }}
+th {{ background: #eef7f2; }}
+.cards {{ display: flex; flex-wrap: wrap; gap: 1em; }}
+.card {{ border: 1px solid #ccc; border-radius: 6px; padding: .8em 1.2em; }}
+.card b {{ display: block; font-size: 1.4em; }}
+figure {{ margin: 1.5em 0; }}
+figure img {{ max-width: 100%; }}
+</style>
+</head>
+<body>
+<h1>{title}</h1>
+{body}
+</body>
+</html>
+"""
+
+
+def _init_worker(figures: List[FigureSpec], slices: List[pd.DataFrame]) -> None:
+    """Prepares a pool process with the figure specs, their slices and a visualizer."""
+    global _worker_figures, _worker_slices, _worker_visualizer
+    matplotlib.use("Agg")
+    _worker_figures = figures
+    _worker_slices = slices
+    _worker_visualizer = LCAVisualizer()
+
+
+def _can_fork() -> bool:
+    return "fork" in multiprocessing.get_all_start_methods()
+
+
+def _table(data: pd.DataFrame, index: bool = True) -> str:
+    return data.to_html(index=index, float_format=lambda value: f"{value:,.2f}")
+
+
+def _to_png(fig: plt.Figure) -> bytes:
+    """Saves a figure to PNG bytes and closes it."""
+    buffer = io.BytesIO()
+    fig.savefig(buffer, format="png")
+    plt.close(fig)
+    return buffer.getvalue()
+
+
+def _render_png(index: int) -> bytes:
+    """Renders figure number index of the worker's specs to PNG bytes."""
+    return _to_png(
+        _worker_figures[index].render(_worker_visualizer, _worker_slices[index])
+    )
+
+
+class ReportBuilder:
+    """
+    Writes the results of an analysis to a single HTML file.
+
+    The report holds summary statistics, tables per life cycle stage, material and
+    product, and every figure embedded as a PNG data URI, so it can be shared as
+    one file. Each figure is cached on disk under the content hash of its input
+    slice (see FigureSpec), and only its current entry is kept; a rebuild only
+    renders the figures whose slice changed, spread over a process pool. Figures
+    an LCAPipeline already saved for the same slice are reused instead.
+    """
+
+    def __init__(
+        self,
+        figures: List[FigureSpec],
+        cache_dir: Union[str, Path],
+        max_workers: Optional[int] = None,
+        top_products: int = 10,
+    ):
+        """
+        Args:
+            figures: Figures to include, e.g. default_figures(config)
+            cache_dir: Directory for the rendered figures
+            max_workers: Rendering processes. Defaults to the number of CPUs; 1
+                renders in this process.
+            top_products: Number of products listed in the top products table
+        """
+        self.figures = figures
+        self.cache_dir = Path(cache_dir)
+        self.max_workers = max_workers
+        self.top_products = top_products
+        self.rendered: List[str] = []
+
+    def _cache_path(self, spec: FigureSpec, digest: str) -> Path:
+        """Cache file of a figure for the content hash of its input slice."""
+        key = hashlib.sha1(f"{spec.filename}:{digest}".encode())
+        return self.cache_dir / f"{Path(spec.filename).stem}-{key.hexdigest()}.png"
+
+    def _prune_cache(self, paths: List[Path]) -> None:
+        """Deletes the cache entries of the figures other than the given ones."""
+        keep = set(paths)
+        for spec in self.figures:
+            stem = Path(spec.filename).stem
+            for path in self.cache_dir.glob(f"{glob.escape(stem)}-*.png"):
+                # Entries are '<stem>-<40 hex digits>.png'; longer names belong
+                # to other figures whose stem starts with this one
+                if len(path.name) == len(stem) + 45 and path not in keep:
+                    path.unlink()
+
+    def render_figures(
+        self,
+        impacts: pd.DataFrame,
+        saved: Optional[Dict[str, Tuple[str, Path]]] = None,
+    ) -> Dict[str, bytes]:
+        """
+        Returns the PNG of every figure, rendering only those not in the cache.
+
+        The names of the figures rendered by this call are kept in self.rendered.
+
+        Args:
+            impacts: Output of calculate_impacts
+            saved: Optional figures already saved elsewhere, mapping filenames to
+                the content hash of their slice and their path (see
+                LCAPipeline.saved_figures); used when the hash is current
+
+        Returns:
+            Dictionary mapping figure filenames to PNG bytes
+        """
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+        slices = [spec.select(impacts) for spec in self.figures]
+        digests = [hash_dataframe(data) for data in slices]
+        paths = [
+            self._cache_path(spec, digest)
+            for spec, digest in zip(self.figures, digests)
+        ]
+        self._prune_cache(paths)
+        missing = []
+        for i, spec in enumerate(self.figures):
+            digest, path = (saved or {}).get(spec.filename, (None, None))
+            if digest == digests[i] and path.exists():
+                paths[i] = path
+            elif not paths[i].exists():
+                missing.append(i)
+
+        # Figure specs are usually closures, which only reach forked processes.
+        # Elsewhere, or for a single figure, rendering stays in this process.
+        workers = min(self.max_workers or os.cpu_count() or 1, len(missing))
+        if workers > 1 and _can_fork():
+            with ProcessPoolExecutor(
+                workers,
+                mp_context=multiprocessing.get_context("fork"),
+                initializer=_init_worker,
+                initargs=(self.figures, slices),
+            ) as pool:
+                futures = {i: pool.submit(_render_png, i) for i in missing}
+                images = {i: future.result() for i, future in futures.items()}
+        else:
+            visualizer = LCAVisualizer()
+            images = {
+                i: _to_png(self.figures[i].render(visualizer, slices[i]))
+                for i in missing
+            }
+
+        for i, png in images.items():
+            paths[i].write_bytes(png)
+        self.rendered = [self.figures[i].filename for i in missing]
+        return {
+            spec.filename: path.read_bytes() for spec, path in zip(self.figures, paths)
+        }
+
+    def summary(self, impacts: pd.DataFrame, total_impacts: pd.DataFrame) -> Dict:
+        """Headline numbers of the report."""
+        summary = {
+            "Products": total_impacts["product_id"].nunique(),
+            "Inventory rows": len(impacts),
+        }
+        for column in IMPACT_COLUMNS:
+            label = IMPACT_LABELS.get(column, column)
+            summary[f"Total {label}"] = total_impacts[column].sum()
+        return summary
+
+    def build(
+        self,
+        impacts: pd.DataFrame,
+        total_impacts: pd.DataFrame,
+        output_path: Union[str, Path],
+        title: str = "Life Cycle Assessment Report",
+        saved: Optional[Dict[str, Tuple[str, Path]]] = None,
+    ) -> Path:
+        """
+        Writes the HTML report.
+
+        Args:
+            impacts: Output of calculate_impacts
+            total_impacts: Output of calculate_total_impacts
+            output_path: HTML file to write
+            title: Report title
+            saved: Figures already saved for these impacts (see render_figures)
+
+        Returns:
+            The path of the written report
+        """
+        images = self.render_figures(impacts, saved)
+
+        cards = "".join(
+            (
+                f'<div class="card">{html.escape(name)}<b>{value:,.2f}</b></div>'
+                if isinstance(value, float)
+                else f'<div class="card">{html.escape(name)}<b>{value:,}</b></div>'
+            )
+            for name, value in self.summary(impacts, total_impacts).items()
+        )
+        top = total_impacts.nlargest(self.top_products, "carbon_impact")
+        sections = [
+            f'<h2>Summary</h2><div class="cards">{cards}</div>',
+            "<h2>Impacts by Life Cycle Stage</h2>"
+            + _table(impacts.groupby("life_cycle_stage")[IMPACT_COLUMNS].sum()),
+            "<h2>Impacts by Material</h2>"
+            + _table(impacts.groupby("material_type")[IMPACT_COLUMNS].sum()),
+            f"<h2>Top {len(top)} Products by Carbon Impact</h2>"
+            + _table(top, index=False),
+            "<h2>Distribution of Product Totals</h2>"
+            + _table(total_impacts[IMPACT_COLUMNS].describe()),
+            "<h2>Figures</h2>"
+            + "".join(
+                f'<figure><img alt="{html.escape(name)}" '
+                f'src="data:image/png;base64,{base64.b64encode(png).decode()}">'
+                f"<figcaption>{html.escape(name)}</figcaption></figure>"
+                for name, png in images.items()
+            ),
+        ]
+
+        output_path = Path(output_path)
+        output_path.parent.mkdir(parents=True, exist_ok=True)
+        output_path.write_text(
+            PAGE_TEMPLATE.format(title=html.escape(title), body="\n".join(sections)),
+            encoding="utf-8",
+        )
+        return output_path
@@ -0,0 +1,205 @@
+"""
+Production-volume roll-up module for LCA tool.
+Scales per-unit product impacts by production volumes per period with sparse products.
+
+Run with `python -m src.rollup detailed_impacts.csv volumes.csv --by material_type`.
+"""
+
+import argparse
+import numpy as np
+import pandas as pd
+from pathlib import Path
+from scipy import sparse
+from typing import Dict, List, Optional, Tuple
+
+from .utils import IMPACT_COLUMNS
+
+
+class VolumeRollup:
+    """
+    Turns per-unit product impacts into footprints of a production plan.
+
+    With V the (period x product) volume matrix and I the (product x impact)
+    per-unit matrix, the period totals are the single product V @ I. Breakdowns
+    use a sparse (product x label*impact) matrix B of the per-unit impacts by
+    material or stage, so V @ B yields one row per period and label directly,
+    never one row per period and inventory line. Per-unit matrices are built once
+    and reused for every volumes table.
+    """
+
+    def __init__(self, impacts: pd.DataFrame, columns: Optional[List[str]] = None):
+        """
+        Args:
+            impacts: Per-unit impacts, either detailed (calculate_impacts, needed
+                for breakdowns) or per product (calculate_total_impacts)
+            columns: Impact columns to roll up. Defaults to carbon, energy, water
+                and waste.
+        """
+        self.columns = list(columns or IMPACT_COLUMNS)
+        self.impacts = impacts
+        self._product_codes, products = pd.factorize(impacts["product_id"])
+        self.products = pd.Index(products)
+        values = impacts[self.columns].fillna(0).to_numpy(dtype=float)
+        self._values = values[self._product_codes >= 0]
+        self._product_codes = self._product_codes[self._product_codes >= 0]
+        self.per_unit = np.column_stack(
+            [
+                np.bincount(
+                    self._product_codes, weights=column, minlength=len(self.products)
+                )
+                for column in self._values.T
+            ]
+        ).reshape(len(self.products), len(self.columns))
+        self._breakdowns: Dict[str, Tuple[pd.Index, sparse.csr_matrix]] = {}
+
+    def _breakdown_matrix(self, by: str) -> Tuple[pd.Index, sparse.csr_matrix]:
+        """Labels of a dimension and the sparse (product x label*impact) matrix."""
+        if by not in self._breakdowns:
+            if by not in self.impacts.columns:
+                raise ValueError(
+                    f"Breakdowns by '{by}' need detailed impacts with that column"
+                )
+            valid = self.impacts["product_id"].notna().to_numpy()
+            label_codes, labels = pd.factorize(
+                self.impacts[by].to_numpy()[valid], sort=True
+            )
+            keep = label_codes >= 0
+            size = len(self.columns)
+            rows = np.repeat(self._product_codes[keep], size)
+            cols = (label_codes[keep][:, None] * size + np.arange(size)).ravel()
+            matrix = sparse.csr_matrix(
+                (self._values[keep].ravel(), (rows, cols)),
+                shape=(len(self.products), len(labels) * size),
+            )
+            matrix.sum_duplicates()
+            self._breakdowns[by] = (pd.Index(labels), matrix)
+        return self._breakdowns[by]
+
+    def volume_matrix(
+        self,
+        volumes: pd.DataFrame,
+        period_column: str = "period",
+        volume_column: str = "volume",
+        ignore_unknown: bool = False,
+    ) -> Tuple[pd.Index, sparse.csr_matrix]:
+        """
+        Converts a volumes table into a sparse (period x product) matrix.
+
+        Args:
+            volumes: Either long, with 'product_id', period and volume columns, or
+                wide, with 'product_id' and one column per period
+            period_column: Period column of a long table
+            volume_column: Volume column of a long table
+            ignore_unknown: Drop volumes of products without impacts instead of
+                raising
+
+        Returns:
+            (sorted periods, matrix); repeated (product, period) volumes are summed
+
+        Raises:
+            ValueError: If volumes refer to products without impacts
+        """
+        if volume_column not in volumes.columns:
+            volumes = volumes.melt(
+                id_vars="product_id", var_name=period_column, value_name=volume_column
+            )
+        product_codes = self.products.get_indexer(volumes["product_id"])
+        unknown = product_codes < 0
+        if unknown.any() and not ignore_unknown:
+            missing = volumes.loc[unknown, "product_id"].unique()
+            raise ValueError(
+                f"{len(missing)} products have volumes but no impacts, "
+                f"e.g. {list(missing[:5])}"
+            )
+
+        amounts = volumes[volume_column].fillna(0).to_numpy(dtype=float)[~unknown]
+        period_codes, periods = pd.factorize(
+            volumes[period_column].to_numpy()[~unknown], sort=True
+        )
+        matrix = sparse.csr_matrix(
+            (amounts, (period_codes, product_codes[~unknown])),
+            shape=(len(periods), len(self.products)),
+        )
+        matrix.sum_duplicates()
+        return pd.Index(periods, name=period_column), matrix
+
+    def period_totals(self, volumes: pd.DataFrame, **kwargs) -> pd.DataFrame:
+        """
+        Returns the impacts of every period.
+
+        Args:
+            volumes: Volumes table (see volume_matrix)
+            **kwargs: Passed to volume_matrix
+
+        Returns:
+            DataFrame with the period, the total volume and one column per impact
+        """
+        periods, matrix = self.volume_matrix(volumes, **kwargs)
+        result = pd.DataFrame(matrix @ self.per_unit, columns=self.columns)
+        result.insert(0, periods.name, periods)
+        result.insert(1, "volume", np.asarray(matrix.sum(axis=1)).ravel())
+        return result
+
+    def breakdown(
+        self, volumes: pd.DataFrame, by: str = "material_type", **kwargs
+    ) -> pd.DataFrame:
+        """
+        Returns the impacts of every period split by a dimension.
+
+        Args:
+            volumes: Volumes table (see volume_matrix)
+            by: Column of the detailed impacts, e.g. 'material_type' or
+                'life_cycle_stage'
+            **kwargs: Passed to volume_matrix
+
+        Returns:
+            DataFrame with one row per period and label that has any impact
+
+        Raises:
+            ValueError: If the impacts do not contain the column
+        """
+        labels, per_unit = self._breakdown_matrix(by)
+        periods, matrix = self.volume_matrix(volumes, **kwargs)
+        size = len(self.columns)
+        totals = (matrix @ per_unit).toarray().reshape(-1, size)
+        result = pd.DataFrame(totals, columns=self.columns)
+        result.insert(0, periods.name, np.repeat(periods, len(labels)))
+        result.insert(1, by, np.tile(labels, len(periods)))
+        return result[(totals != 0).any(axis=1)].reset_index(drop=True)
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Roll per-unit impacts up over production volumes."
+    )
+    parser.add_argument("impacts", help="Detailed or per-product impacts CSV.")
+    parser.add_argument(
+        "volumes", help="Volumes CSV: product_id, period, volume (or wide)."
+    )
+    parser.add_argument(
+        "--by",
+        action="append",
+        default=[],
+        help="Also write a breakdown by this column (repeatable).",
+    )
+    parser.add_argument("--ignore-unknown", action="store_true")
+    parser.add_argument("--output-dir", default=".", help="Where to write the CSVs.")
+    args = parser.parse_args()
+
+    impacts = pd.read_csv(args.impacts, dtype={"product_id": str})
+    volumes = pd.read_csv(args.volumes, dtype={"product_id": str, "period": str})
+    rollup = VolumeRollup(impacts)
+    output_dir = Path(args.output_dir)
+    output_dir.mkdir(parents=True, exist_ok=True)
+
+    totals = rollup.period_totals(volumes, ignore_unknown=args.ignore_unknown)
+    totals.to_csv(output_dir / "period_totals.csv", index=False)
+    print(totals.to_string(index=False))
+    for by in args.by:
+        breakdown = rollup.breakdown(volumes, by, ignore_unknown=args.ignore_unknown)
+        breakdown.to_csv(output_dir / f"period_{by}.csv", index=False)
+    print(f"Roll-ups written to {output_dir}")
+
+
+if __name__ == "__main__":
+    main()
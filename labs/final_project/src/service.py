@@ -0,0 +1,331 @@
+"""
+Local HTTP service for LCA tool.
+Serves calculations from warm calculators and micro-batches small requests.
+
+Run with `python -m src.service --factors data/raw/impact_factors.json`.
+"""
+
+import argparse
+import asyncio
+import io
+import json
+import pandas as pd
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple, Union
+from urllib.parse import parse_qs, urlsplit
+
+from .calculations import LCACalculator
+from .data_input import DataInput
+from .http_io import (
+    HTTPError,
+    json_bytes,
+    read_request,
+    require_loopback,
+    write_response,
+)
+
+try:
+    import pyarrow as pa
+except ImportError:  # Arrow payloads are optional
+    pa = None
+
+NDJSON_TYPE = "application/x-ndjson"
+ARROW_TYPE = "application/vnd.apache.arrow.stream"
+
+
+class CalculatorPool:
+    """
+    Keeps one compiled LCACalculator per impact factor version.
+
+    Factors are registered as a file path or dictionary and compiled on first use,
+    after which the calculator stays warm for every later request.
+    """
+
+    def __init__(self):
+        self._sources: Dict[str, Union[str, Path, Dict]] = {}
+        self._calculators: Dict[str, LCACalculator] = {}
+
+    def register(self, version: str, factors: Union[str, Path, Dict]) -> None:
+        """Registers (or replaces) the factors of a version."""
+        self._sources[version] = factors
+        self._calculators.pop(version, None)
+
+    @property
+    def versions(self) -> List[str]:
+        return sorted(self._sources)
+
+    def get(self, version: str) -> LCACalculator:
+        """
+        Returns the warm calculator of a version, compiling it if needed.
+
+        Raises:
+            HTTPError: If the version is not registered
+        """
+        if version not in self._calculators:
+            if version not in self._sources:
+                raise HTTPError(404, f"Unknown factor version: {version}")
+            factors = self._sources[version]
+            if not isinstance(factors, dict):
+                factors = DataInput().read_impact_factors(factors)
+            self._calculators[version] = LCACalculator(impact_factors=factors)
+        return self._calculators[version]
+
+
+class MicroBatcher:
+    """
+    Coalesces concurrent small calculation requests into one vectorized call.
+
+    Requests are queued; a worker waits up to max_delay seconds (or until max_rows
+    rows are pending), concatenates the frames with the same columns, calculates
+    their impacts once and hands each caller back its own slice.
+    """
+
+    def __init__(
+        self,
+        calculator: LCACalculator,
+        max_delay: float = 0.005,
+        max_rows: int = 50_000,
+    ):
+        self.calculator = calculator
+        self.max_delay = max_delay
+        self.max_rows = max_rows
+        self.batches_processed = 0
+        self._queue: asyncio.Queue = asyncio.Queue()
+        self._worker: Optional[asyncio.Task] = None
+
+    async def calculate(self, data: pd.DataFrame) -> pd.DataFrame:
+        """Queues a frame and waits for its impacts."""
+        if self._worker is None:
+            self._worker = asyncio.get_running_loop().create_task(self._run())
+        future = asyncio.get_running_loop().create_future()
+        await self._queue.put((data, future))
+        return await future
+
+    async def _collect(self) -> List[Tuple[pd.DataFrame, asyncio.Future]]:
+        """Waits for the first request, then gathers more until the batch is full."""
+        batch = [await self._queue.get()]
+        rows = len(batch[0][0])
+        deadline = asyncio.get_running_loop().time() + self.max_delay
+        while rows < self.max_rows:
+            timeout = deadline - asyncio.get_running_loop().time()
+            if timeout <= 0:
+                break
+            try:
+                item = await asyncio.wait_for(self._queue.get(), timeout)
+            except asyncio.TimeoutError:
+                break
+            batch.append(item)
+            rows += len(item[0])
+        return batch
+
+    async def _run(self) -> None:
+        while True:
+            batch = await self._collect()
+            # Only frames with the same columns are concatenated, so no caller
+            # receives columns (or NaN padding) from another request.
+            groups: Dict[Tuple, List[Tuple[pd.DataFrame, asyncio.Future]]] = {}
+            for item in batch:
+                groups.setdefault(tuple(item[0].columns), []).append(item)
+            for items in groups.values():
+                await self._process(items)
+
+    async def _process(self, items: List[Tuple[pd.DataFrame, asyncio.Future]]) -> None:
+        """
+        Calculates a group of requests at once. If that fails, every request is
+        calculated on its own, so a malformed payload only fails its own caller.
+        """
+        loop = asyncio.get_running_loop()
+        try:
+            combined = pd.concat([data for data, _ in items], ignore_index=True)
+            # The calculation runs in a thread so the server keeps accepting.
+            impacts = await loop.run_in_executor(
+                None, self.calculator.calculate_impacts, combined
+            )
+        except Exception as error:
+            if len(items) > 1:
+                for item in items:
+                    await self._process([item])
+                return
+            if not items[0][1].done():
+                items[0][1].set_exception(error)
+            return
+        self.batches_processed += 1
+        start = 0
+        for data, future in items:
+            if not future.done():
+                future.set_result(impacts.iloc[start : start + len(data)])
+            start += len(data)
+
+    def close(self) -> None:
+        if self._worker is not None:
+            self._worker.cancel()
+
+
+class LCAService:
+    """
+    Local asyncio HTTP server for impact calculations.
+
+    Endpoints:
+        GET  /health                        status and registered factor versions
+        POST /impacts?version=<v>           JSON records in, detailed impacts out
+        POST /totals?version=<v>            JSON records in, per-product totals out
+        POST /batch?version=<v>&totals=1    NDJSON or Arrow stream in and out
+
+    Small /impacts and /totals requests are micro-batched; /batch payloads are
+    already large and are calculated directly.
+    """
+
+    def __init__(
+        self,
+        pool: CalculatorPool,
+        default_version: str = "default",
+        max_delay: float = 0.005,
+    ):
+        self.pool = pool
+        self.default_version = default_version
+        self.max_delay = max_delay
+        self._batchers: Dict[str, MicroBatcher] = {}
+        self._server: Optional[asyncio.AbstractServer] = None
+
+    def _batcher(self, version: str) -> MicroBatcher:
+        """Micro-batcher of a version, using its current calculator in the pool."""
+        calculator = self.pool.get(version)
+        if version not in self._batchers:
+            self._batchers[version] = MicroBatcher(calculator, max_delay=self.max_delay)
+        # Factors registered again replace the calculator of queued requests too
+        self._batchers[version].calculator = calculator
+        return self._batchers[version]
+
+    async def start(self, host: str = "127.0.0.1", port: int = 8765) -> int:
+        """
+        Starts listening and returns the bound port.
+
+        Raises:
+            ValueError: If host is not a loopback address
+        """
+        require_loopback(host)
+        self._server = await asyncio.start_server(self._handle, host, port)
+        return self._server.sockets[0].getsockname()[1]
+
+    async def serve_forever(self) -> None:
+        async with self._server:
+            await self._server.serve_forever()
+
+    async def close(self) -> None:
+        for batcher in self._batchers.values():
+            batcher.close()
+        if self._server is not None:
+            self._server.close()
+            await self._server.wait_closed()
+
+    async def _handle(
+        self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter
+    ) -> None:
+        content_type = "application/json"
+        try:
+            method, target, headers, body = await read_request(reader)
+            url = urlsplit(target)
+            params = {k: v[-1] for k, v in parse_qs(url.query).items()}
+            status, content_type, payload = await self._route(
+                method, url.path, params, headers, body
+            )
+        except HTTPError as error:
+            status, payload = error.status, json_bytes({"error": str(error)})
+        except (ValueError, KeyError) as error:
+            status, payload = 400, json_bytes({"error": str(error)})
+        except Exception as error:
+            status, payload = 500, json_bytes(
+                {"error": f"{type(error).__name__}: {error}"}
+            )
+        await write_response(writer, status, content_type, payload)
+
+    async def _route(
+        self, method: str, path: str, params: Dict, headers: Dict, body: bytes
+    ) -> Tuple[int, str, bytes]:
+        version = params.get("version", self.default_version)
+        if method == "GET" and path == "/health":
+            return (
+                200,
+                "application/json",
+                json_bytes({"status": "ok", "versions": self.pool.versions}),
+            )
+        if method == "POST" and path in ("/impacts", "/totals"):
+            records = json.loads(body or b"[]")
+            if isinstance(records, dict):
+                records = records.get("rows", [])
+            impacts = await self._batcher(version).calculate(pd.DataFrame(records))
+            if path == "/totals":
+                impacts = self.pool.get(version).calculate_total_impacts(impacts)
+            return (
+                200,
+                "application/json",
+                impacts.to_json(orient="records").encode(),
+            )
+        if method == "POST" and path == "/batch":
+            content_type = headers.get("content-type", NDJSON_TYPE).split(";")[0]
+            data = _decode_frame(body, content_type)
+            calculator = self.pool.get(version)
+            impacts = await asyncio.get_running_loop().run_in_executor(
+                None, calculator.calculate_impacts, data
+            )
+            if params.get("totals") in ("1", "true"):
+                impacts = calculator.calculate_total_impacts(impacts)
+            return 200, content_type, _encode_frame(impacts, content_type)
+        raise HTTPError(404, f"No route for {method} {path}")
+
+
+def _decode_frame(body: bytes, content_type: str) -> pd.DataFrame:
+    """Parses an NDJSON or Arrow IPC stream payload into a DataFrame."""
+    if content_type == NDJSON_TYPE:
+        return pd.read_json(io.BytesIO(body), lines=True)
+    if content_type == ARROW_TYPE:
+        if pa is None:
+            raise HTTPError(415, "Arrow payloads require pyarrow")
+        return pa.ipc.open_stream(body).read_all().to_pandas()
+    raise HTTPError(415, f"Unsupported content type: {content_type}")
+
+
+def _encode_frame(data: pd.DataFrame, content_type: str) -> bytes:
+    """Serializes a DataFrame in the format it was received in."""
+    if content_type == ARROW_TYPE:
+        table = pa.Table.from_pandas(data, preserve_index=False)
+        sink = pa.BufferOutputStream()
+        with pa.ipc.new_stream(sink, table.schema) as stream:
+            stream.write_table(table)
+        return sink.getvalue().to_pybytes()
+    return data.to_json(orient="records", lines=True).encode()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Serve LCA calculations locally.")
+    parser.add_argument(
+        "--factors",
+        action="append",
+        default=[],
+        metavar="[VERSION=]PATH",
+        help="Impact factors file, optionally tagged with a version (repeatable).",
+    )
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8765)
+    args = parser.parse_args()
+
+    pool = CalculatorPool()
+    for entry in args.factors or ["data/raw/impact_factors.json"]:
+        version, _, path = entry.rpartition("=")
+        pool.register(version or "default", path)
+
+    async def serve():
+        default = "default" if "default" in pool.versions else pool.versions[0]
+        service = LCAService(pool, default_version=default)
+        port = await service.start(args.host, args.port)
+        print(f"LCA service listening on http://{args.host}:{port}")
+        await service.serve_forever()
+
+    try:
+        asyncio.run(serve())
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()
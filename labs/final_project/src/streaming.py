@@ -0,0 +1,238 @@
+"""
+Streaming aggregation module for LCA tool.
+Maintains per-product running statistics for continuously ingested inventory events.
+"""
+
+import numpy as np
+import pandas as pd
+from typing import Dict, Iterable, List, Mapping, Optional
+
+from .calculations import LCACalculator, _normalize_stage
+from .utils import IMPACT_COLUMNS
+
+
+class _RunningStats:
+    """Count, sum, min/max and Welford mean/M2 of a fixed set of columns."""
+
+    __slots__ = ("count", "total", "mean", "m2", "minimum", "maximum")
+
+    def __init__(self, size: int):
+        self.count = 0
+        self.total = np.zeros(size)
+        self.mean = np.zeros(size)
+        self.m2 = np.zeros(size)
+        self.minimum = np.full(size, np.inf)
+        self.maximum = np.full(size, -np.inf)
+
+    def add(self, values: np.ndarray) -> None:
+        """Adds a single observation (Welford's update)."""
+        self.count += 1
+        delta = values - self.mean
+        self.mean += delta / self.count
+        self.m2 += delta * (values - self.mean)
+        self.total += values
+        np.minimum(self.minimum, values, out=self.minimum)
+        np.maximum(self.maximum, values, out=self.maximum)
+
+    def combine(
+        self,
+        count: int,
+        total: np.ndarray,
+        mean: np.ndarray,
+        m2: np.ndarray,
+        minimum: np.ndarray,
+        maximum: np.ndarray,
+    ) -> None:
+        """Merges a partial state into this one (Chan et al. parallel update)."""
+        if count == 0:
+            return
+        n = self.count + count
+        delta = mean - self.mean
+        self.m2 += m2 + delta**2 * self.count * count / n
+        self.mean += delta * count / n
+        self.count = n
+        self.total += total
+        np.minimum(self.minimum, minimum, out=self.minimum)
+        np.maximum(self.maximum, maximum, out=self.maximum)
+
+
+class StreamingAggregator:
+    """
+    Keeps per-product running totals and statistics of the impact columns.
+
+    Single events are added in O(1), batches are pre-aggregated with a groupby and
+    partial aggregators (e.g., from several workers) can be merged without re-reading
+    the history.
+    """
+
+    def __init__(
+        self,
+        calculator: Optional[LCACalculator] = None,
+        columns: Optional[List[str]] = None,
+    ):
+        """
+        Args:
+            calculator: Optional calculator used to derive impacts from raw inventory
+                events. Without it, events must already contain the impact columns.
+            columns: Columns to aggregate. Defaults to the calculate_total_impacts columns.
+        """
+        self.calculator = calculator
+        self.columns = list(columns or IMPACT_COLUMNS)
+        self._stats: Dict[str, _RunningStats] = {}
+        self._names: Dict[str, str] = {}
+        self._factors = {}
+        if calculator is not None:
+            factors_df = calculator._factors_df
+            self._factors = {
+                (m, s): (c, e, w)
+                for m, s, c, e, w in zip(
+                    factors_df.get("material_type", []),
+                    factors_df.get("life_cycle_stage", []),
+                    factors_df.get("carbon_factor", []),
+                    factors_df.get("energy_factor", []),
+                    factors_df.get("water_factor", []),
+                )
+            }
+
+    def __len__(self) -> int:
+        return len(self._stats)
+
+    def _event_impacts(self, event: Mapping) -> Dict:
+        """Computes the impact columns of a single raw inventory event."""
+        key = (
+            str(event["material_type"]).lower(),
+            _normalize_stage(str(event["life_cycle_stage"])),
+        )
+        carbon, energy, water = self._factors.get(key, (0, 0, 0))
+        quantity = event["quantity_kg"]
+        return {
+            **event,
+            "carbon_impact": quantity * carbon + event["carbon_footprint_kg_co2e"],
+            "energy_impact": quantity * energy + event["energy_consumption_kwh"],
+            "water_impact": quantity * water + event["water_usage_liters"],
+        }
+
+    def _get_stats(self, product_id: str, product_name: str) -> _RunningStats:
+        stats = self._stats.get(product_id)
+        if stats is None:
+            stats = self._stats[product_id] = _RunningStats(len(self.columns))
+            self._names[product_id] = product_name
+        return stats
+
+    def update(self, event: Mapping) -> None:
+        """
+        Adds a single inventory event.
+
+        Args:
+            event: Mapping with 'product_id', 'product_name' and either the impact
+                columns or the raw inventory fields (requires a calculator).
+        """
+        if self.calculator is not None and "carbon_impact" not in event:
+            event = self._event_impacts(event)
+        values = np.array([event[col] for col in self.columns], dtype=float)
+        self._get_stats(event["product_id"], event["product_name"]).add(values)
+
+    def update_many(self, events: Iterable[Mapping]) -> None:
+        """Adds several inventory events one at a time."""
+        for event in events:
+            self.update(event)
+
+    def update_frame(self, data: pd.DataFrame) -> None:
+        """
+        Adds a batch of inventory rows with one vectorized groupby.
+
+        Args:
+            data: Inventory rows, either raw (requires a calculator) or with impacts.
+        """
+        if data.empty:
+            return
+        if self.calculator is not None and "carbon_impact" not in data.columns:
+            data = data.copy()
+            # Same stage keys as single events (e.g. 'Disposal' -> 'end-of-life')
+            stages = data["life_cycle_stage"].astype(str)
+            data["life_cycle_stage"] = stages.map(
+                {stage: _normalize_stage(stage) for stage in stages.unique()}
+            )
+            data = self.calculator.calculate_impacts(data)
+
+        grouped = data.groupby("product_id", sort=False)
+        values = grouped[self.columns]
+        count = grouped.size()
+        total = values.sum()
+        mean = values.mean()
+        m2 = values.var(ddof=0).mul(count, axis=0)
+        minimum = values.min()
+        maximum = values.max()
+        names = grouped["product_name"].first()
+
+        for i, product_id in enumerate(count.index):
+            self._get_stats(product_id, names.iat[i]).combine(
+                int(count.iat[i]),
+                total.iloc[i].to_numpy(dtype=float),
+                mean.iloc[i].to_numpy(dtype=float),
+                m2.iloc[i].to_numpy(dtype=float),
+                minimum.iloc[i].to_numpy(dtype=float),
+                maximum.iloc[i].to_numpy(dtype=float),
+            )
+
+    def merge(self, other: "StreamingAggregator") -> "StreamingAggregator":
+        """
+        Merges the partial state of another aggregator into this one.
+
+        Raises:
+            ValueError: If the aggregators track different columns
+        """
+        if other.columns != self.columns:
+            raise ValueError("Cannot merge aggregators with different columns")
+        for product_id, stats in other._stats.items():
+            self._get_stats(product_id, other._names[product_id]).combine(
+                stats.count,
+                stats.total,
+                stats.mean,
+                stats.m2,
+                stats.minimum,
+                stats.maximum,
+            )
+        return self
+
+    def snapshot(self) -> pd.DataFrame:
+        """Returns the per-product totals in the schema of calculate_total_impacts."""
+        product_ids = sorted(self._stats)
+        totals = pd.DataFrame(
+            [self._stats[p].total for p in product_ids],
+            columns=self.columns,
+        )
+        totals.insert(0, "product_id", product_ids)
+        totals.insert(1, "product_name", [self._names[p] for p in product_ids])
+        return totals
+
+    def statistics(self) -> pd.DataFrame:
+        """
+        Returns the running statistics in long format.
+
+        Returns:
+            DataFrame with one row per product and impact column, holding the count,
+            sum, mean, sample variance, min and max
+        """
+        records = []
+        for product_id in sorted(self._stats):
+            stats = self._stats[product_id]
+            variance = (
+                stats.m2 / (stats.count - 1)
+                if stats.count > 1
+                else np.full(len(self.columns), np.nan)
+            )
+            for k, col in enumerate(self.columns):
+                records.append(
+                    {
+                        "product_id": product_id,
+                        "impact": col,
+                        "count": stats.count,
+                        "sum": stats.total[k],
+                        "mean": stats.mean[k],
+                        "variance": variance[k],
+                        "min": stats.minimum[k],
+                        "max": stats.maximum[k],
+                    }
+                )
+        return pd.DataFrame(records)
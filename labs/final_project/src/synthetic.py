@@ -0,0 +1,149 @@
+"""
+Synthetic data module for LCA tool.
+Generates inventories that match the DataInput schema at any scale, for benchmarks and tests.
+"""
+
+import numpy as np
+import pandas as pd
+from pathlib import Path
+from typing import Iterator, List, Optional, Union
+
+# The materials of the bundled data/raw/impact_factors.json
+MATERIALS = [
+    "Steel",
+    "Aluminum",
+    "Plastic",
+    "Paper",
+    "Concrete",
+    "Wood",
+    "Clay",
+    "Glass",
+    "Copper",
+    "Mineral_Wool",
+    "Cement",
+]
+STAGES = ["Manufacturing", "Transportation", "End-of-Life"]
+TRANSPORT_MODES = ["Truck", "Rail", "Ship"]
+# Products are drawn in blocks of this size, each from its own generator, so the
+# inventory does not depend on how it is split into chunks.
+BLOCK_PRODUCTS = 4096
+
+
+def _generate_products(
+    first_product: int, n_products: int, rng: np.random.Generator, materials: List[str]
+) -> pd.DataFrame:
+    """Generates all life cycle stages of a consecutive range of products."""
+    n_stages = len(STAGES)
+    n_rows = n_products * n_stages
+    product_numbers = np.repeat(
+        np.arange(first_product, first_product + n_products), n_stages
+    )
+    product_ids = pd.Series(product_numbers).map("P{:07d}".format)
+
+    # Each product is made of one material and has one quantity across its stages.
+    material_codes = np.repeat(rng.integers(0, len(materials), n_products), n_stages)
+    quantity = np.repeat(np.round(rng.lognormal(5.0, 1.2, n_products), 2), n_stages)
+    stage_codes = np.tile(np.arange(n_stages), n_products)
+
+    rates = rng.dirichlet([4.0, 3.0, 1.0], n_rows).round(3)
+    rates[:, 2] = np.round(1.0 - rates[:, 0] - rates[:, 1], 3)
+
+    return pd.DataFrame(
+        {
+            "product_id": product_ids,
+            "product_name": pd.Series(np.asarray(materials)[material_codes])
+            + " Product "
+            + pd.Series(product_numbers).astype(str),
+            "life_cycle_stage": np.asarray(STAGES)[stage_codes],
+            "material_type": np.asarray(materials)[material_codes],
+            "quantity_kg": quantity,
+            "energy_consumption_kwh": np.round(rng.gamma(2.0, 60.0, n_rows), 1),
+            "transport_distance_km": np.round(rng.gamma(2.0, 80.0, n_rows), 1),
+            "transport_mode": np.asarray(TRANSPORT_MODES)[
+                rng.choice(len(TRANSPORT_MODES), n_rows, p=[0.7, 0.2, 0.1])
+            ],
+            "waste_generated_kg": np.round(
+                quantity * rng.uniform(0.0, 0.2, n_rows) * (stage_codes != 1), 2
+            ),
+            "recycling_rate": rates[:, 0],
+            "landfill_rate": rates[:, 1],
+            "incineration_rate": rates[:, 2],
+            "carbon_footprint_kg_co2e": np.round(rng.gamma(2.0, 100.0, n_rows), 1),
+            "water_usage_liters": np.round(rng.gamma(1.5, 60.0, n_rows), 1),
+        }
+    )
+
+
+def iter_inventory_chunks(
+    n_rows: int,
+    chunk_rows: int = 1_000_000,
+    seed: int = 0,
+    materials: Optional[List[str]] = None,
+) -> Iterator[pd.DataFrame]:
+    """
+    Yields a synthetic inventory of n_rows rows in chunks of bounded size.
+
+    Every product has one row per life cycle stage, so n_rows is rounded up to a
+    multiple of the number of stages. Chunks never split a product.
+
+    Products are generated in blocks of BLOCK_PRODUCTS, block k with a generator
+    seeded by (seed, k), and chunks are cut from the blocks. The same seed and
+    n_rows therefore give the same inventory for any chunk_rows.
+
+    Args:
+        n_rows: Total number of rows
+        chunk_rows: Approximate number of rows per chunk
+        seed: Random seed
+        materials: Material names. Defaults to MATERIALS, the materials of the
+            bundled impact_factors.json.
+
+    Yields:
+        DataFrames with the DataInput.required_columns schema
+    """
+    materials = materials or MATERIALS
+    n_stages = len(STAGES)
+    n_products = -(-n_rows // n_stages)
+    products_per_chunk = max(1, chunk_rows // n_stages)
+    block_index, block = -1, None
+    for first in range(0, n_products, products_per_chunk):
+        last = min(first + products_per_chunk, n_products)
+        parts = []
+        for index in range(first // BLOCK_PRODUCTS, (last - 1) // BLOCK_PRODUCTS + 1):
+            start = index * BLOCK_PRODUCTS
+            if index != block_index:  # a block can span two chunks
+                block_index = index
+                block = _generate_products(
+                    start + 1,
+                    min(BLOCK_PRODUCTS, n_products - start),
+                    np.random.default_rng([seed, index]),
+                    materials,
+                )
+            lo = (max(first, start) - start) * n_stages
+            hi = (min(last, start + BLOCK_PRODUCTS) - start) * n_stages
+            parts.append(block.iloc[lo:hi])
+        yield pd.concat(parts, ignore_index=True)
+
+
+def generate_inventory(
+    n_rows: int, seed: int = 0, materials: Optional[List[str]] = None
+) -> pd.DataFrame:
+    """Generates a synthetic inventory of (about) n_rows rows in memory."""
+    return pd.concat(
+        iter_inventory_chunks(n_rows, seed=seed, materials=materials),
+        ignore_index=True,
+    )
+
+
+def write_inventory_csv(
+    file_path: Union[str, Path], n_rows: int, seed: int = 0, chunk_rows: int = 1_000_000
+) -> Path:
+    """
+    Writes a synthetic inventory to CSV chunk by chunk, so even 10M rows fit in memory.
+
+    Returns:
+        The path of the written file
+    """
+    file_path = Path(file_path)
+    for i, chunk in enumerate(iter_inventory_chunks(n_rows, chunk_rows, seed)):
+        chunk.to_csv(file_path, mode="w" if i == 0 else "a", header=i == 0, index=False)
+    return file_path
@@ -0,0 +1,361 @@
+"""
+Transport distance module for LCA tool.
+Derives transport distances from supplier and site coordinates.
+
+Run with `python -m src.transport inventory.csv sites.csv suppliers.csv -o out.csv`.
+"""
+
+import argparse
+import numpy as np
+import pandas as pd
+from sklearn.neighbors import BallTree
+from typing import Dict, Optional, Tuple
+
+EARTH_RADIUS_KM = 6371.0088
+
+
+def haversine_km(
+    lat1: np.ndarray, lon1: np.ndarray, lat2: np.ndarray, lon2: np.ndarray
+) -> np.ndarray:
+    """
+    Great-circle distances between coordinate arrays, in kilometres.
+
+    Args:
+        lat1, lon1: Origin latitudes and longitudes in degrees
+        lat2, lon2: Destination latitudes and longitudes in degrees
+
+    Returns:
+        Array of distances
+    """
+    lat1, lon1, lat2, lon2 = (
+        np.radians(np.asarray(a, dtype=float)) for a in (lat1, lon1, lat2, lon2)
+    )
+    a = (
+        np.sin((lat2 - lat1) / 2) ** 2
+        + np.cos(lat1) * np.cos(lat2) * np.sin((lon2 - lon1) / 2) ** 2
+    )
+    return 2 * EARTH_RADIUS_KM * np.arcsin(np.sqrt(np.clip(a, 0, 1)))
+
+
+def _coordinates(
+    locations: pd.DataFrame, id_column: str, name: str, key_column: Optional[str] = None
+) -> pd.DataFrame:
+    """
+    Validates a location table and indexes it by ID.
+
+    With a key column, an ID may repeat once per key value (e.g. a supplier
+    listed once per material); its rows must share their coordinates and are
+    reduced to the first one, without the key column.
+
+    Raises:
+        ValueError: If columns are missing, IDs (or ID and key pairs) repeat,
+            coordinates of an ID differ or coordinates are invalid
+    """
+    missing = {id_column, "latitude", "longitude"} - set(locations.columns)
+    if missing:
+        raise ValueError(f"{name} table is missing columns: {sorted(missing)}")
+    if key_column is None:
+        if locations[id_column].duplicated().any():
+            raise ValueError(f"{name} IDs must be unique")
+    elif locations.duplicated([id_column, key_column]).any():
+        raise ValueError(f"{name} IDs must be unique per {key_column}")
+    lat = locations["latitude"].to_numpy(dtype=float)
+    lon = locations["longitude"].to_numpy(dtype=float)
+    if not (np.all(np.abs(lat) <= 90) and np.all(np.abs(lon) <= 180)):
+        raise ValueError(f"{name} coordinates must be valid degrees")
+    points = locations[[id_column, "latitude", "longitude"]].drop_duplicates()
+    if points[id_column].duplicated().any():
+        raise ValueError(f"{name} rows of the same ID must share coordinates")
+    locations = locations.drop_duplicates(id_column)
+    if key_column is not None:
+        locations = locations.drop(columns=key_column)
+    return locations.set_index(id_column)
+
+
+class TransportDistances:
+    """
+    Fills transport distances of shipment rows from coordinates.
+
+    Distances are great circles, optionally scaled by a detour factor per
+    transport mode (roads and rail are longer than the great circle). Shipments
+    without a supplier are matched to the nearest supplier of their site (and
+    material, if the supplier table has a 'material_type' column) through a
+    BallTree with the haversine metric, built once per material. A supplier of
+    several materials is listed once per material, with the same coordinates.
+
+    Sites and suppliers are handled as integer positions, so a route is a single
+    int64 key. Each call reduces its rows to the distinct routes, computes only
+    the routes missing from the cache (kept as sorted key and distance arrays),
+    and broadcasts the distances back to the rows.
+    """
+
+    def __init__(
+        self,
+        sites: pd.DataFrame,
+        suppliers: pd.DataFrame,
+        id_column: str = "location_id",
+        detour_factors: Optional[Dict[str, float]] = None,
+    ):
+        """
+        Args:
+            sites: Destination sites with id_column, 'latitude' and 'longitude'
+            suppliers: Origins with the same columns and an optional
+                'material_type' column listing what each supplier delivers;
+                IDs then repeat once per material they deliver
+            id_column: Location ID column of both tables
+            detour_factors: Optional {transport mode: factor} applied to the
+                great-circle distance, e.g. {'truck': 1.2}
+
+        Raises:
+            ValueError: If a table is invalid
+        """
+        self.sites = _coordinates(sites, id_column, "Site")
+        materials = "material_type" if "material_type" in suppliers.columns else None
+        self.suppliers = _coordinates(suppliers, id_column, "Supplier", materials)
+        # Materials of the supplier rows and the positions of their suppliers
+        self._materials: Optional[Tuple[np.ndarray, np.ndarray]] = None
+        if materials is not None:
+            self._materials = (
+                suppliers[materials].str.lower().to_numpy(dtype=object),
+                self.suppliers.index.get_indexer(suppliers[id_column]),
+            )
+        self.detour_factors = {
+            mode.lower(): factor for mode, factor in (detour_factors or {}).items()
+        }
+        self._site_points = self.sites[["latitude", "longitude"]].to_numpy(float)
+        self._supplier_points = self.suppliers[["latitude", "longitude"]].to_numpy(
+            float
+        )
+        self._cache_keys = np.empty(0, dtype=np.int64)
+        self._cache_km = np.empty(0)
+        self.hits = 0
+        self.misses = 0
+        self._trees: Dict[Optional[str], Tuple[BallTree, np.ndarray]] = {}
+
+    def _tree(self, material: Optional[str]) -> Tuple[BallTree, np.ndarray]:
+        """BallTree over the suppliers of a material (all for None) and positions."""
+        if material not in self._trees:
+            positions = np.arange(len(self.suppliers))
+            if material is not None:
+                materials, suppliers = self._materials
+                positions = np.unique(suppliers[materials == material])
+            if not len(positions):
+                raise ValueError(f"No supplier delivers {material}")
+            tree = BallTree(
+                np.radians(self._supplier_points[positions]), metric="haversine"
+            )
+            self._trees[material] = (tree, positions)
+        return self._trees[material]
+
+    def _positions(self, index: pd.Index, ids, name: str) -> np.ndarray:
+        """Positions of IDs in a location table; missing IDs map to -1."""
+        codes, unique = pd.factorize(pd.Series(ids))
+        lookup = index.get_indexer(unique)
+        if (lookup < 0).any():
+            raise ValueError(f"Unknown {name}: {list(unique[lookup < 0][:5])}")
+        return np.append(lookup, -1)[codes]
+
+    def _nearest(self, site_positions: np.ndarray, materials=None) -> np.ndarray:
+        """Supplier positions nearest to the given site positions."""
+        if materials is None or self._materials is None:
+            material_codes = np.zeros(len(site_positions), dtype=np.int64)
+            labels = [None]
+        else:
+            material_codes, labels = pd.factorize(np.asarray(materials, dtype=object))
+            labels = [str(label).lower() for label in labels]
+            if (material_codes < 0).any():
+                labels.append(None)
+                material_codes[material_codes < 0] = len(labels) - 1
+
+        keys = material_codes.astype(np.int64) * len(self.sites) + site_positions
+        unique, inverse = np.unique(keys, return_inverse=True)
+        nearest = np.empty(len(unique), dtype=np.int64)
+        for code, label in enumerate(labels):
+            selected = np.flatnonzero(unique // len(self.sites) == code)
+            if len(selected):
+                tree, positions = self._tree(label)
+                points = self._site_points[unique[selected] % len(self.sites)]
+                _, index = tree.query(np.radians(points), k=1)
+                nearest[selected] = positions[index[:, 0]]
+        return nearest[inverse]
+
+    def _route_km(
+        self, supplier_positions: np.ndarray, site_positions: np.ndarray
+    ) -> np.ndarray:
+        """Great-circle distances of routes given as positions, through the cache."""
+        keys = supplier_positions.astype(np.int64) * len(self.sites) + site_positions
+        codes, unique = pd.factorize(keys)
+        slots = np.searchsorted(self._cache_keys, unique)
+        cached = slots < len(self._cache_keys)
+        cached[cached] = self._cache_keys[slots[cached]] == unique[cached]
+        km = np.empty(len(unique))
+        km[cached] = self._cache_km[slots[cached]]
+        self.hits += int(cached.sum())
+        self.misses += int((~cached).sum())
+
+        if not cached.all():
+            new = unique[~cached]
+            origin = self._supplier_points[new // len(self.sites)]
+            destination = self._site_points[new % len(self.sites)]
+            km[~cached] = haversine_km(
+                origin[:, 0], origin[:, 1], destination[:, 0], destination[:, 1]
+            )
+            keys = np.concatenate([self._cache_keys, new])
+            order = np.argsort(keys, kind="stable")
+            self._cache_keys = keys[order]
+            self._cache_km = np.concatenate([self._cache_km, km[~cached]])[order]
+        return km[codes]
+
+    def nearest_suppliers(
+        self, site_ids, materials=None
+    ) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Finds the nearest supplier of every site.
+
+        Args:
+            site_ids: Site IDs, one per row
+            materials: Optional materials, one per row; used when the supplier
+                table has a 'material_type' column
+
+        Returns:
+            (supplier IDs, great-circle distances in km)
+
+        Raises:
+            ValueError: If a site is unknown or no supplier delivers a material
+        """
+        sites = self._positions(self.sites.index, site_ids, "sites")
+        if (sites < 0).any():
+            raise ValueError("Site IDs must not be missing")
+        suppliers = self._nearest(sites, materials)
+        return (
+            self.suppliers.index.to_numpy()[suppliers],
+            self._route_km(suppliers, sites),
+        )
+
+    def distances(self, origin_ids, destination_ids) -> np.ndarray:
+        """
+        Great-circle distances of supplier-site routes.
+
+        Args:
+            origin_ids: Supplier IDs, one per row
+            destination_ids: Site IDs, one per row
+
+        Returns:
+            Distances in km
+
+        Raises:
+            ValueError: If an ID is unknown or missing
+        """
+        suppliers = self._positions(self.suppliers.index, origin_ids, "suppliers")
+        sites = self._positions(self.sites.index, destination_ids, "sites")
+        if (suppliers < 0).any() or (sites < 0).any():
+            raise ValueError("Supplier and site IDs must not be missing")
+        return self._route_km(suppliers, sites)
+
+    def assign(
+        self,
+        data: pd.DataFrame,
+        site_column: str = "site_id",
+        supplier_column: str = "supplier_id",
+        material_column: Optional[str] = "material_type",
+    ) -> pd.DataFrame:
+        """
+        Fills 'transport_distance_km' of an inventory from its sites and suppliers.
+
+        Rows without a supplier get the nearest one (per material when the
+        supplier table lists materials). Rows without a site keep their distance.
+
+        Args:
+            data: Inventory with a site column and an optional supplier column
+            site_column: Destination site IDs
+            supplier_column: Origin supplier IDs; added when missing
+            material_column: Material column used to pick suppliers, if any
+
+        Returns:
+            Copy of data with the supplier and distance columns filled
+
+        Raises:
+            ValueError: If a site or supplier ID is unknown
+        """
+        result = data.copy()
+        sites = self._positions(self.sites.index, result[site_column], "sites")
+        if supplier_column in result.columns:
+            suppliers = self._positions(
+                self.suppliers.index, result[supplier_column], "suppliers"
+            )
+        else:
+            suppliers = np.full(len(result), -1)
+        rows = np.flatnonzero(sites >= 0)
+
+        unmatched = rows[suppliers[rows] < 0]
+        if len(unmatched):
+            materials = None
+            if material_column is not None and material_column in result.columns:
+                materials = result[material_column].to_numpy()[unmatched]
+            suppliers[unmatched] = self._nearest(sites[unmatched], materials)
+            supplier_ids = self.suppliers.index.to_numpy()[np.maximum(suppliers, 0)]
+            result[supplier_column] = np.where(suppliers >= 0, supplier_ids, None)
+
+        distance = self._route_km(suppliers[rows], sites[rows])
+        if self.detour_factors and "transport_mode" in result.columns:
+            mode_codes, modes = pd.factorize(result["transport_mode"].to_numpy()[rows])
+            factors = np.array(
+                [self.detour_factors.get(str(mode).lower(), 1.0) for mode in modes]
+                + [1.0]
+            )
+            distance = distance * factors[mode_codes]
+
+        if "transport_distance_km" in result.columns:
+            column = result["transport_distance_km"].to_numpy(dtype=float, copy=True)
+        else:
+            column = np.full(len(result), np.nan)
+        column[rows] = distance
+        result["transport_distance_km"] = column
+        return result
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Fill transport distances of an inventory from coordinates."
+    )
+    parser.add_argument("inventory", help="Inventory CSV with a site_id column.")
+    parser.add_argument("sites", help="Sites CSV: location_id, latitude, longitude.")
+    parser.add_argument(
+        "suppliers",
+        help=(
+            "Suppliers CSV: location_id, latitude, longitude[, material_type], "
+            "one row per supplier and material."
+        ),
+    )
+    parser.add_argument("-o", "--output", required=True, help="Output CSV.")
+    parser.add_argument(
+        "--detour",
+        action="append",
+        default=[],
+        metavar="MODE=FACTOR",
+        help="Detour factor of a transport mode, e.g. truck=1.2 (repeatable).",
+    )
+    args = parser.parse_args()
+
+    detour_factors = {}
+    for item in args.detour:
+        mode, _, factor = item.partition("=")
+        detour_factors[mode] = float(factor)
+    ids = {"location_id": str}
+    distances = TransportDistances(
+        pd.read_csv(args.sites, dtype=ids),
+        pd.read_csv(args.suppliers, dtype=ids),
+        detour_factors=detour_factors,
+    )
+    inventory = pd.read_csv(
+        args.inventory, dtype={"product_id": str, "site_id": str, "supplier_id": str}
+    )
+    distances.assign(inventory).to_csv(args.output, index=False)
+    print(
+        f"Distances of {len(inventory)} rows written to {args.output} "
+        f"({distances.misses} distinct routes)"
+    )
+
+
+if __name__ == "__main__":
+    main()
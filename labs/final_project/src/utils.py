@@ -3,10 +3,21 @@ Utilities module for LCA tool.
 Contains helper functions and constants.
 """
 
+import hashlib
 import pandas as pd
 from typing import Dict, Union
 from pathlib import Path
 
+# Impact columns of calculate_impacts, in output order
+IMPACT_COLUMNS = [
+    "carbon_impact",
+    "energy_impact",
+    "water_impact",
+    "waste_generated_kg",
+]
+# The impact columns derived from impact factors (waste comes from the inventory)
+FACTOR_IMPACT_COLUMNS = ["carbon_impact", "energy_impact", "water_impact"]
+
 # Unit conversion factors
 UNIT_CONVERSIONS = {
     "kg": {"g": 1000, "ton": 0.001, "lb": 2.20462},
@@ -96,3 +107,22 @@ def load_impact_factors(file_path: Union[str, Path]) -> Dict:
 
     with open(file_path, "r") as f:
         return pd.read_json(f).to_dict()
+
+
+def hash_dataframe(data: pd.DataFrame) -> str:
+    """
+    Compute a content hash of a DataFrame.
+
+    The hash covers the column names and values (not the index), so it can be used
+    to detect whether the input of a derived result has changed.
+
+    Args:
+        data: DataFrame to hash
+
+    Returns:
+        Hexadecimal SHA-1 digest
+    """
+    digest = hashlib.sha1()
+    digest.update(",".join(map(str, data.columns)).encode())
+    digest.update(pd.util.hash_pandas_object(data, index=False).to_numpy().tobytes())
+    return digest.hexdigest()
@@ -9,6 +9,8 @@ import seaborn as sns
 from typing import List, Optional
 import numpy as np
 
+from .pareto import pareto_front
+
 
 class LCAVisualizer:
     def __init__(self):
@@ -153,6 +155,29 @@ class LCAVisualizer:
 
         return fig
 
+    def plot_pareto_comparison(
+        self, data: pd.DataFrame, max_products: int = 5
+    ) -> plt.Figure:
+        """
+        Create a radar chart of the Pareto-optimal products.
+
+        Args:
+            data: DataFrame with impact data
+            max_products: Maximum number of front products to show, picked by
+                decreasing crowding distance
+
+        Returns:
+            matplotlib Figure object
+        """
+        total_impacts = data.groupby("product_id", as_index=False)[
+            ["carbon_impact", "energy_impact", "water_impact"]
+        ].sum()
+        product_ids = pareto_front(total_impacts, max_products=max_products)
+
+        fig = self.plot_product_comparison(data, product_ids)
+        fig.axes[0].set_title("Pareto-Optimal Products Across Impact Categories")
+        return fig
+
     def plot_end_of_life_breakdown(
         self, data: pd.DataFrame, product_id: str
     ) -> plt.Figure:
@@ -183,23 +208,36 @@ class LCAVisualizer:
 
         return fig
 
-    def plot_impact_correlation(self, data: pd.DataFrame) -> plt.Figure:
+    def plot_impact_correlation(
+        self,
+        data: Optional[pd.DataFrame] = None,
+        correlation: Optional[pd.DataFrame] = None,
+    ) -> plt.Figure:
         """
         Create a correlation heatmap of different impact categories.
 
         Args:
             data: DataFrame with impact data
+            correlation: Precomputed correlation matrix, e.g. from a
+                CorrelationAccumulator fed with a file too large for memory.
+                Takes the place of data.
 
         Returns:
             matplotlib Figure object
+
+        Raises:
+            ValueError: If neither data nor correlation is given
         """
-        impact_columns = [
-            "carbon_impact",
-            "energy_impact",
-            "water_impact",
-            "waste_generated_kg",
-        ]
-        correlation = data[impact_columns].corr()
+        if correlation is None:
+            if data is None:
+                raise ValueError("Either data or a correlation matrix is required")
+            impact_columns = [
+                "carbon_impact",
+                "energy_impact",
+                "water_impact",
+                "waste_generated_kg",
+            ]
+            correlation = data[impact_columns].corr()
 
         fig, ax = plt.subplots(figsize=(10, 8))
         sns.heatmap(correlation, annot=True, cmap="coolwarm", center=0, ax=ax)
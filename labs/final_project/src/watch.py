@@ -0,0 +1,91 @@
+"""
+File watching module for LCA tool.
+Polls input files for modifications and reports debounced batches of changes.
+"""
+
+import os
+import time
+from pathlib import Path
+from typing import Callable, Dict, Iterable, Iterator, Optional, Set, Tuple, Union
+
+
+class FileWatcher:
+    """
+    Watches a fixed set of files by polling their modification time and size.
+
+    Bursts of changes (e.g., an editor writing a file in several steps) are merged
+    into one batch that is only reported once the files have been quiet for the
+    debounce interval.
+    """
+
+    def __init__(
+        self,
+        paths: Iterable[Union[str, Path]],
+        debounce: float = 1.0,
+        poll_interval: float = 0.25,
+    ):
+        """
+        Args:
+            paths: Files to watch
+            debounce: Seconds without further changes before a batch is reported
+            poll_interval: Seconds between two polls
+        """
+        self.paths = [Path(p).resolve() for p in paths]
+        self.debounce = debounce
+        self.poll_interval = poll_interval
+        self._signatures = self._snapshot()
+        self._running = False
+
+    def _snapshot(self) -> Dict[Path, Optional[Tuple[int, int]]]:
+        """Returns the (mtime_ns, size) of every watched file, None if missing."""
+        signatures = {}
+        for path in self.paths:
+            try:
+                stat = os.stat(path)
+                signatures[path] = (stat.st_mtime_ns, stat.st_size)
+            except FileNotFoundError:
+                signatures[path] = None
+        return signatures
+
+    def poll(self) -> Set[Path]:
+        """Returns the files that changed since the previous poll."""
+        signatures = self._snapshot()
+        changed = {p for p in self.paths if signatures[p] != self._signatures[p]}
+        self._signatures = signatures
+        return changed
+
+    def changes(self) -> Iterator[Set[Path]]:
+        """
+        Yields debounced batches of changed files until stop() is called.
+
+        Yields:
+            Set of paths that changed during the burst
+        """
+        self._running = True
+        pending: Set[Path] = set()
+        last_change = 0.0
+        while self._running:
+            changed = self.poll()
+            now = time.monotonic()
+            if changed:
+                pending |= changed
+                last_change = now
+            elif pending and now - last_change >= self.debounce:
+                batch, pending = pending, set()
+                yield batch
+                continue
+            time.sleep(self.poll_interval)
+
+    def watch(self, callback: Callable[[Set[Path]], None]) -> None:
+        """Calls callback with each debounced batch until interrupted or stopped."""
+        try:
+            for batch in self.changes():
+                callback(batch)
+        except KeyboardInterrupt:
+            pass
+        finally:
+            self._running = False
+
+    def stop(self) -> None:
+        """Stops the watch loop after the current poll."""
+        self._running = False
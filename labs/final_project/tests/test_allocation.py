@@ -0,0 +1,115 @@
+"""
+Tests for the co-product allocation.
+"""
+
+import pytest
+import numpy as np
+import pandas as pd
+from src.allocation import CoProductAllocator
+from src.calculations import IMPACT_COLUMNS, LCACalculator
+
+
+@pytest.fixture
+def impacts():
+    """Create impacts of a steel mill, a sawmill and a single-output process."""
+    return pd.DataFrame(
+        {
+            "product_id": ["MILL", "MILL", "SAW", "P1"],
+            "product_name": ["Steel mill", "Steel mill", "Sawmill", "Brick"],
+            "life_cycle_stage": ["manufacturing", "transportation"] * 2,
+            "carbon_impact": [90.0, 10.0, 40.0, 7.0],
+            "energy_impact": [50.0, 0.0, 20.0, 3.0],
+            "water_impact": [10.0, 0.0, 8.0, 1.0],
+            "waste_generated_kg": [4.0, 0.0, 2.0, 0.5],
+        }
+    )
+
+
+@pytest.fixture
+def coproducts():
+    """Create co-products of the mill and the sawmill."""
+    return pd.DataFrame(
+        {
+            "process_id": ["MILL", "MILL", "SAW", "SAW"],
+            "coproduct_id": ["STEEL", "SLAG", "LUMBER", "SAWDUST"],
+            "coproduct_name": ["Steel", "Slag", "Lumber", "Sawdust"],
+            "mass_kg": [800.0, 200.0, 600.0, 400.0],
+            "economic_value": [950.0, 50.0, 900.0, 100.0],
+            "energy_content_mj": [0.0, 0.0, 9000.0, 6000.0],
+        }
+    )
+
+
+@pytest.mark.parametrize(
+    "method, expected",
+    [("mass", [0.8, 0.2, 0.6, 0.4]), ("economic", [0.95, 0.05, 0.9, 0.1])],
+)
+def test_shares(coproducts, method, expected):
+    """Test the allocation shares of the mass and economic methods."""
+    shares = CoProductAllocator(coproducts, method).shares()
+    np.testing.assert_allclose(shares["share"], expected)
+    assert shares.groupby("process_id")["share"].sum().tolist() == [1.0, 1.0]
+
+
+def test_invalid_allocation(coproducts):
+    """Test that unknown methods and processes without a basis are rejected."""
+    with pytest.raises(ValueError, match="Unknown allocation method"):
+        CoProductAllocator(coproducts, "volume")
+    with pytest.raises(ValueError, match="without a positive"):
+        CoProductAllocator(coproducts, "energy")
+
+
+def test_allocated_totals(impacts, coproducts):
+    """Test allocated totals through calculate_total_impacts and mass balance."""
+    allocator = CoProductAllocator(coproducts, "mass")
+    totals = LCACalculator({}).calculate_total_impacts(impacts, allocation=allocator)
+
+    assert totals["product_id"].tolist() == [
+        "LUMBER",
+        "P1",
+        "SAWDUST",
+        "SLAG",
+        "STEEL",
+    ]
+    by_id = totals.set_index("product_id")
+    assert by_id.loc["STEEL", "carbon_impact"] == pytest.approx(80.0)
+    assert by_id.loc["SAWDUST", "energy_impact"] == pytest.approx(8.0)
+    assert by_id.loc["STEEL", "product_name"] == "Steel"
+    assert by_id.loc["P1", "product_name"] == "Brick"
+    np.testing.assert_allclose(
+        totals[IMPACT_COLUMNS].sum(), impacts[IMPACT_COLUMNS].sum()
+    )
+
+
+@pytest.mark.parametrize("method", ["mass", "economic"])
+def test_allocation_conserves_total_impacts(impacts, coproducts, method):
+    """Test that allocated totals keep the schema and sums of unallocated totals."""
+    calculator = LCACalculator({})
+    baseline = calculator.calculate_total_impacts(impacts)
+    allocated = calculator.calculate_total_impacts(
+        impacts, allocation=CoProductAllocator(coproducts, method)
+    )
+
+    assert list(allocated.columns) == list(baseline.columns)
+    assert allocated.index.equals(pd.RangeIndex(len(allocated)))
+    pd.testing.assert_series_equal(
+        allocated[IMPACT_COLUMNS].sum(), baseline[IMPACT_COLUMNS].sum()
+    )
+
+
+def test_allocated_rows_match_totals(impacts, coproducts):
+    """Test that row-level allocation keeps stages and adds up to the totals."""
+    allocator = CoProductAllocator(coproducts, "economic")
+    rows = allocator.allocate_rows(impacts)
+
+    assert len(rows) == 7
+    steel = rows[rows["product_id"] == "STEEL"]
+    assert steel["life_cycle_stage"].tolist() == ["manufacturing", "transportation"]
+    assert steel["process_id"].unique().tolist() == ["MILL"]
+    np.testing.assert_allclose(steel["carbon_impact"], [85.5, 9.5])
+
+    totals = allocator.allocate_totals(impacts).set_index("product_id")
+    summed = rows.groupby("product_id")[IMPACT_COLUMNS].sum()
+    pd.testing.assert_frame_equal(
+        summed, totals.loc[summed.index, IMPACT_COLUMNS], check_names=False
+    )
@@ -0,0 +1,90 @@
+"""
+Tests for the Arrow interchange module.
+"""
+
+import subprocess
+import sys
+import pytest
+import pandas as pd
+from pathlib import Path
+
+pa = pytest.importorskip("pyarrow")
+
+from src.arrow_io import SharedResults, read_ipc, read_metadata, to_arrow, write_ipc
+
+
+@pytest.fixture
+def total_impacts():
+    """Create per-product totals for testing."""
+    return pd.DataFrame(
+        {
+            "product_id": ["P001", "P002"],
+            "product_name": ["Product1", "Product2"],
+            "carbon_impact": [100.0, 200.0],
+            "energy_impact": [50.0, 60.0],
+            "water_impact": [10.0, 40.0],
+            "waste_generated_kg": [1.0, 2.0],
+        }
+    )
+
+
+def test_metadata_carries_units_and_version(total_impacts):
+    """Test field and schema metadata of converted results."""
+    table = to_arrow(total_impacts, factor_version="2024.1", units={"score": "pt"})
+
+    metadata = read_metadata(table)
+    assert metadata["factor_version"] == "2024.1"
+    assert metadata["units"]["carbon_impact"] == "kg CO2e"
+    assert "score" not in metadata["units"]
+    assert table.schema.field("water_impact").metadata == {b"unit": b"L"}
+    assert table.schema.field("product_id").metadata is None
+
+
+def test_ipc_file_round_trip(total_impacts, tmp_path):
+    """Test that a memory-mapped IPC file reads back the same results."""
+    path = write_ipc(total_impacts, tmp_path / "totals.arrow", factor_version="v1")
+
+    table = read_ipc(path)
+
+    assert read_metadata(table)["factor_version"] == "v1"
+    pd.testing.assert_frame_equal(table.to_pandas(), total_impacts, check_dtype=False)
+
+
+def test_shared_memory_round_trip(total_impacts):
+    """Test publishing to and attaching from a shared-memory block."""
+    with SharedResults.publish(total_impacts, factor_version="v2") as published:
+        consumer = SharedResults.attach(published.name)
+        table = consumer.table()
+
+        assert read_metadata(table)["factor_version"] == "v2"
+        assert table.column("carbon_impact").to_pylist() == [100.0, 200.0]
+        del table
+        consumer.close()
+
+
+def test_consumer_process_exit_keeps_block(total_impacts):
+    """Test that a consumer process exiting does not free the producer's block."""
+    consumer = (
+        "import sys\n"
+        "from src.arrow_io import SharedResults\n"
+        "with SharedResults.attach(sys.argv[1]) as shared:\n"
+        "    print(shared.table().num_rows)\n"
+    )
+    with SharedResults.publish(total_impacts) as published:
+        # A separate interpreter has its own resource tracker; capturing its
+        # output also waits for that tracker to exit.
+        child = subprocess.run(
+            [sys.executable, "-c", consumer, published.name],
+            cwd=Path(__file__).resolve().parents[1],
+            capture_output=True,
+            text=True,
+            check=True,
+        )
+        assert child.stdout.strip() == "2"
+        assert "leaked" not in child.stderr
+
+        again = SharedResults.attach(published.name)
+        table = again.table()
+        assert table.column("carbon_impact").to_pylist() == [100.0, 200.0]
+        del table
+        again.close()
@@ -0,0 +1,126 @@
+"""
+Tests for the batch runner and its persistent job queue.
+"""
+
+import json
+import os
+import pytest
+from pathlib import Path
+from src.batch import BatchRunner, JobQueue, load_manifest, run_batch, run_project
+from src.synthetic import write_inventory_csv
+
+FACTORS_PATH = str(Path("data/raw/impact_factors.json").resolve())
+
+
+def project(name, input_data):
+    """Create a manifest entry without figures."""
+    return {
+        "name": name,
+        "paths": {
+            "input_data": input_data,
+            "impact_factors": FACTORS_PATH,
+            "output_data_dir": f"out/{name}",
+            "output_figures_dir": f"out/{name}/figures",
+        },
+    }
+
+
+def crash_on_a(config):
+    """Run a project, killing the worker process for project 'a'."""
+    if config["name"] == "a":
+        os._exit(1)
+    return run_project(config)
+
+
+@pytest.fixture
+def manifest(tmp_path):
+    """Write a manifest with two valid projects and one with a missing input."""
+    write_inventory_csv(tmp_path / "a.csv", 300, seed=1)
+    write_inventory_csv(tmp_path / "b.csv", 600, seed=2)
+    projects = [project("a", "a.csv"), project("b", "b.csv"), project("c", "none.csv")]
+    path = tmp_path / "projects.json"
+    path.write_text(json.dumps(projects))
+    return path
+
+
+def test_load_manifest_resolves_paths(manifest, tmp_path):
+    """Test that relative paths are resolved against the manifest directory."""
+    projects = load_manifest(manifest)
+
+    assert [p["name"] for p in projects] == ["a", "b", "c"]
+    assert projects[0]["paths"]["input_data"] == str(tmp_path / "a.csv")
+
+    manifest.write_text(json.dumps([project("a", "a.csv")] * 2))
+    with pytest.raises(ValueError, match="unique name"):
+        load_manifest(manifest)
+
+
+def test_queue_resumes_interrupted_jobs(tmp_path):
+    """Test that re-enqueueing is idempotent and running jobs are reset."""
+    queue = JobQueue(tmp_path / "queue.sqlite")
+    assert queue.enqueue([project("a", "a.csv"), project("b", "b.csv")]) == 2
+    queue.mark_running("a")
+    queue.mark_running("b")
+    queue.mark_finished("b", {"total": 1.5})
+    queue.close()
+
+    queue = JobQueue(tmp_path / "queue.sqlite")  # as after a crash
+
+    assert queue.enqueue([project("a", "a.csv")]) == 0
+    assert [p["name"] for p in queue.pending()] == ["a"]
+    report = queue.report().set_index("name")
+    assert report.loc["a", "attempts"] == 1
+    assert report.loc["b", "duration"] == 1.5
+    queue.close()
+
+
+def test_run_batch_reports_timings_and_failures(manifest, tmp_path):
+    """Test a full run on the process pool and a resumed run."""
+    report = run_batch(manifest, max_workers=2).set_index("name")
+
+    assert list(report["status"]) == ["done", "done", "failed"]
+    assert "FileNotFoundError" in report.loc["c", "error"]
+    assert json.loads(report.loc["b", "timings"])["rows"] == 600
+    assert (tmp_path / "out" / "a" / "total_impacts_summary.csv").exists()
+    assert (tmp_path / "projects.queue.sqlite").exists()
+
+    resumed = run_batch(manifest, max_workers=2).set_index("name")
+
+    assert list(resumed["attempts"]) == [1, 1, 1]
+
+
+def test_jobs_run_when_a_worker_claims_them(manifest, tmp_path):
+    """Test that jobs waiting for a worker are neither running nor attempted."""
+    queue = JobQueue(tmp_path / "queue.sqlite")
+    queue.enqueue(load_manifest(manifest))
+    snapshots = []
+    mark_finished = queue.mark_finished
+
+    def record(name, timings=None, error=None):
+        snapshots.append(queue.report().set_index("name")[["status", "attempts"]])
+        mark_finished(name, timings, error)
+
+    queue.mark_finished = record
+    BatchRunner(queue, max_workers=1).run(verbose=False)
+    queue.close()
+
+    first = snapshots[0]
+    assert first.loc["a"].tolist() == ["running", 1]
+    assert first.loc[["b", "c"], "status"].tolist() == ["pending", "pending"]
+    assert first.loc[["b", "c"], "attempts"].tolist() == [0, 0]
+    assert len(snapshots) == 3
+
+
+def test_worker_crash_replaces_the_pool(manifest, tmp_path, monkeypatch):
+    """Test that a dying worker fails its job once retried and the rest still run."""
+    monkeypatch.setattr("src.batch.run_project", crash_on_a)
+    queue = JobQueue(tmp_path / "queue.sqlite")
+    queue.enqueue(load_manifest(manifest))
+
+    report = BatchRunner(queue, max_workers=1).run(verbose=False).set_index("name")
+    queue.close()
+
+    assert list(report["status"]) == ["failed", "done", "failed"]
+    assert "BrokenProcessPool" in report.loc["a", "error"]
+    assert report.loc["a", "attempts"] == 2
+    assert list(report["attempts"].iloc[1:]) == [1, 1]
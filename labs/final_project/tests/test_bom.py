@@ -0,0 +1,99 @@
+"""
+Tests for the bill-of-materials roll-up module.
+"""
+
+import pytest
+import numpy as np
+import pandas as pd
+from src.bom import BOMRollup
+
+
+@pytest.fixture
+def edges():
+    """Create an assembly graph where B is shared by A and C."""
+    return pd.DataFrame(
+        {
+            "parent_id": ["A", "A", "B", "C", "C", "C"],
+            "child_id": ["B", "C", "D", "D", "B", "B"],
+            "quantity": [2.0, 1.0, 3.0, 1.0, 0.5, 0.5],
+        }
+    )
+
+
+@pytest.fixture
+def total_impacts():
+    """Create own impacts per product, including a product outside the BOM."""
+    return pd.DataFrame(
+        {
+            "product_id": ["D", "B", "A", "X"],
+            "product_name": ["Bolt", "Bracket", "Frame", "Other"],
+            "carbon_impact": [1.0, 10.0, 100.0, 5.0],
+            "energy_impact": [2.0, 0.0, 0.0, 1.0],
+            "water_impact": [0.0, 0.0, 0.0, 0.0],
+            "waste_generated_kg": [0.0, 1.0, 0.0, 0.0],
+        }
+    )
+
+
+def test_topological_levels(edges):
+    """Test that components come on lower levels than their assemblies."""
+    bom = BOMRollup(edges)
+
+    levels = [sorted(bom.nodes[level]) for level in bom.levels]
+
+    assert levels == [["D"], ["B"], ["C"], ["A"]]
+    assert bom.usage[bom.nodes.get_loc("C"), bom.nodes.get_loc("B")] == 1.0
+
+
+def test_rollup(edges, total_impacts):
+    """Test cumulative impacts against a hand calculation."""
+    result = BOMRollup(edges).rollup(total_impacts).set_index("product_id")
+
+    # B = 10 + 3 D, C = D + B, A = 100 + 2 B + C
+    assert result.loc["B", "carbon_impact"] == pytest.approx(13.0)
+    assert result.loc["C", "carbon_impact"] == pytest.approx(14.0)
+    assert result.loc["A", "carbon_impact"] == pytest.approx(140.0)
+    assert result.loc["A", "energy_impact"] == pytest.approx(2 * 6 + 8)
+    assert result.loc["X", "carbon_impact"] == 5.0
+    assert result.loc["C", "product_name"] == "C"
+    assert list(result.index) == ["D", "B", "A", "X", "C"]
+    assert list(result["bom_level"]) == [0, 1, 3, 0, 2]
+
+
+def test_rollup_matches_linear_solve(total_impacts):
+    """Test the level-wise propagation against (I - A)^-1 own on a random DAG."""
+    rng = np.random.default_rng(0)
+    parents = rng.integers(1, 50, 200)
+    edges = pd.DataFrame(
+        {
+            "parent_id": parents,
+            "child_id": (parents * rng.random(200)).astype(int),
+            "quantity": rng.random(200),
+        }
+    )
+    own = pd.DataFrame({"product_id": np.arange(50), "product_name": "p"})
+    own["carbon_impact"] = rng.random(50)
+    bom = BOMRollup(edges)
+
+    result = bom.rollup(own, columns=["carbon_impact"]).set_index("product_id")
+
+    usage = bom.usage.toarray()
+    expected = np.linalg.solve(
+        np.eye(len(bom.nodes)) - usage,
+        own.set_index("product_id")["carbon_impact"].reindex(bom.nodes).fillna(0),
+    )
+    np.testing.assert_allclose(result["carbon_impact"].reindex(bom.nodes), expected)
+
+
+def test_cycle_is_reported():
+    """Test that cycles raise an error naming the nodes on the cycle."""
+    edges = pd.DataFrame(
+        {
+            "parent_id": ["A", "B", "C", "D"],
+            "child_id": ["B", "C", "A", "A"],
+            "quantity": 1.0,
+        }
+    )
+
+    with pytest.raises(ValueError, match="A -> B -> C -> A"):
+        BOMRollup(edges)
@@ -0,0 +1,89 @@
+"""
+Tests for the catalogue-scale product comparison module.
+"""
+
+import pytest
+import numpy as np
+import pandas as pd
+from src.comparison import ProductComparator
+
+
+@pytest.fixture
+def total_impacts():
+    """Create per-product totals for testing."""
+    return pd.DataFrame(
+        {
+            "product_id": ["P001", "P002", "P003", "P004"],
+            "product_name": ["Product1", "Product2", "Product3", "Product4"],
+            "carbon_impact": [100.0, 200.0, 110.0, 0.0],
+            "energy_impact": [50.0, 50.0, 55.0, 10.0],
+            "water_impact": [10.0, 40.0, 12.0, 1.0],
+            "waste_generated_kg": [1.0, 2.0, 3.0, 4.0],
+        }
+    )
+
+
+def test_relative_difference_matrix(total_impacts):
+    """Test the N x N matrix, including blocked computation."""
+    comparator = ProductComparator(total_impacts, max_block_elements=4)
+
+    matrix = comparator.relative_difference_matrix("carbon_impact")
+
+    assert matrix.shape == (4, 4)
+    assert matrix.loc["P002", "P001"] == pytest.approx(100.0)
+    assert matrix.loc["P001", "P002"] == pytest.approx(-50.0)
+    assert (matrix["P004"] == 0).all()  # zero reference, as in compare_alternatives
+    assert np.allclose(np.diag(matrix), 0)
+
+
+def test_matrix_agrees_with_compare_alternatives(total_impacts):
+    """Test that the row of the cheapest product matches compare_alternatives."""
+    comparator = ProductComparator(total_impacts)
+    subset = ["P001", "P002", "P003"]
+
+    matrices = comparator.relative_difference_matrices(subset)
+
+    assert set(matrices) == {"carbon_impact", "energy_impact", "water_impact"}
+    np.testing.assert_allclose(matrices["water_impact"]["P001"], [0.0, 300.0, 20.0])
+
+
+def test_write_matrix_to_disk(total_impacts, tmp_path):
+    """Test that the on-disk matrix equals the in-memory one."""
+    comparator = ProductComparator(total_impacts, max_block_elements=5)
+
+    written = comparator.write_relative_difference_matrix(
+        "energy_impact", tmp_path / "energy.npy"
+    )
+
+    expected = comparator.relative_difference_matrix("energy_impact").to_numpy()
+    np.testing.assert_allclose(np.load(tmp_path / "energy.npy"), expected)
+    np.testing.assert_allclose(written, expected)
+
+
+def test_nearest_alternatives(total_impacts):
+    """Test the KD-tree top-k search against brute force, with a duplicate product."""
+    duplicate = total_impacts.iloc[[0]].assign(product_id="P005")
+    totals = pd.concat([total_impacts, duplicate], ignore_index=True)
+
+    nearest = ProductComparator(totals).nearest_alternatives(k=2)
+
+    values = totals[["carbon_impact", "energy_impact", "water_impact"]]
+    scaled = (values / values.max()).to_numpy()
+    dist = np.linalg.norm(scaled[:, None] - scaled[None, :], axis=2)
+    np.fill_diagonal(dist, np.inf)
+    ids = pd.Index(totals["product_id"])
+    rows = ids.get_indexer(nearest["product_id"])
+    cols = ids.get_indexer(nearest["alternative_id"])
+
+    assert len(nearest) == 10
+    # A product is never its own alternative, even next to an identical one
+    assert (rows != cols).all()
+    np.testing.assert_allclose(nearest["distance"], dist[rows, cols])
+    np.testing.assert_allclose(
+        nearest["distance"].to_numpy().reshape(5, 2), np.sort(dist, axis=1)[:, :2]
+    )
+    best = nearest[nearest["rank"] == 1].set_index("product_id")["alternative_id"]
+    assert (best["P001"], best["P005"]) == ("P005", "P001")
+    second = nearest.iloc[1]
+    assert (second["product_id"], second["alternative_id"]) == ("P001", "P003")
+    assert second["carbon_impact_relative_diff_%"] == pytest.approx(10.0)
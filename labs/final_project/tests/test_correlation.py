@@ -0,0 +1,81 @@
+"""
+Tests for the streaming correlation accumulator.
+"""
+
+import numpy as np
+import pytest
+import matplotlib.pyplot as plt
+from src.calculations import LCACalculator
+from src.correlation import CorrelationAccumulator
+from src.data_input import DataInput
+from src.synthetic import generate_inventory
+from src.visualization import LCAVisualizer
+
+
+@pytest.fixture
+def calculator():
+    """Create a calculator with the bundled impact factors."""
+    factors = DataInput().read_impact_factors("data/raw/impact_factors.json")
+    return LCACalculator(impact_factors=factors)
+
+
+@pytest.fixture
+def impacts(calculator):
+    """Calculate the impacts of a synthetic inventory with large offsets."""
+    impacts = calculator.calculate_impacts(generate_inventory(5_000, seed=1))
+    impacts["carbon_impact"] += 1e9  # raw sums of squares would lose all precision
+    return impacts
+
+
+def test_chunked_matches_pandas(impacts):
+    """Test that chunked overall and grouped correlations match pandas."""
+    accumulator = CorrelationAccumulator(group_by="material_type")
+    for start in range(0, len(impacts), 700):
+        accumulator.update(impacts.iloc[start : start + 700])
+    columns = accumulator.columns
+
+    np.testing.assert_allclose(
+        accumulator.correlation(), impacts[columns].corr(), atol=1e-9
+    )
+    np.testing.assert_allclose(
+        accumulator.covariance(), impacts[columns].cov(), rtol=1e-9
+    )
+    np.testing.assert_allclose(
+        accumulator.grouped_correlation(),
+        impacts.groupby("material_type")[columns].corr(),
+        atol=1e-9,
+    )
+    assert accumulator.count.sum() == len(impacts)
+
+
+def test_merge_and_missing_values(impacts):
+    """Test merging partial accumulators and skipping incomplete rows."""
+    impacts.loc[impacts.index[:10], "water_impact"] = np.nan
+    first, second = CorrelationAccumulator(), CorrelationAccumulator()
+    first.update(impacts.iloc[:1000])
+    second.update(impacts.iloc[1000:])
+    first.merge(second)
+
+    expected = impacts.dropna(subset=first.columns)[first.columns].corr()
+    np.testing.assert_allclose(first.correlation(), expected, atol=1e-9)
+    with pytest.raises(ValueError, match="different layouts"):
+        first.merge(CorrelationAccumulator(group_by="life_cycle_stage"))
+
+
+def test_update_file_and_plot(calculator, tmp_path):
+    """Test a single pass over a raw inventory file feeding the heatmap."""
+    data = generate_inventory(3_000, seed=2)
+    path = tmp_path / "inventory.csv"
+    data.to_csv(path, index=False)
+
+    accumulator = CorrelationAccumulator().update_file(
+        path, chunksize=500, calculator=calculator
+    )
+    expected = calculator.calculate_impacts(data)[accumulator.columns].corr()
+    np.testing.assert_allclose(accumulator.correlation(), expected, atol=1e-9)
+
+    fig = LCAVisualizer().plot_impact_correlation(correlation=accumulator.correlation())
+    assert isinstance(fig, plt.Figure)
+    plt.close(fig)
+    with pytest.raises(ValueError):
+        LCAVisualizer().plot_impact_correlation()
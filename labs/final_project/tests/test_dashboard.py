@@ -0,0 +1,139 @@
+"""
+Tests for the dashboard cube and server.
+"""
+
+import asyncio
+import json
+import pytest
+from src.calculations import LCACalculator
+from src.dashboard import DashboardServer, ImpactCube
+from src.data_input import DataInput
+from src.synthetic import generate_inventory
+
+
+@pytest.fixture
+def impacts():
+    """Calculate the impacts of a synthetic inventory with repeated products."""
+    factors = DataInput().read_impact_factors("data/raw/impact_factors.json")
+    data = generate_inventory(3_000, seed=4)
+    data["product_id"] = data["product_id"].str[-2:]  # ~100 products, shared cells
+    return LCACalculator(impact_factors=factors).calculate_impacts(data)
+
+
+@pytest.mark.parametrize(
+    "group_by, filters",
+    [
+        ("material", {}),
+        ("stage", {"material": ["steel", "wood"]}),
+        ("product", {}),
+        ("product", {"stage": ["manufacturing"]}),
+        ("stage", {"product": ["01", "02", "unknown"]}),
+        ("material", {"product": ["03"], "stage": ["transportation"]}),
+    ],
+)
+def test_query_matches_pandas(impacts, group_by, filters):
+    """Test every query path against a pandas groupby."""
+    columns = {"product": "product_id", "stage": "life_cycle_stage"}
+    columns["material"] = "material_type"
+    expected = impacts
+    for dimension, values in filters.items():
+        expected = expected[expected[columns[dimension]].isin(values)]
+    expected = (
+        expected.groupby(columns[group_by])["carbon_impact"]
+        .sum()
+        .sort_values(ascending=False)
+        .head(10)
+    )
+
+    result = ImpactCube(impacts).query(group_by, filters, limit=10)
+
+    assert result["groups"] == list(expected.index)
+    assert result["values"]["carbon_impact"] == pytest.approx(list(expected))
+
+
+def test_query_cache(impacts):
+    """Test that repeated queries are served from the LRU cache."""
+    cube = ImpactCube(impacts, cache_size=2)
+    first = cube.query_json("stage", {"material": ["wood", "steel"]})
+    again = cube.query_json("stage", {"material": ["steel", "wood"]})
+    cube.query_json("material")
+    cube.query_json("product", limit=5)
+
+    assert first is again and (cube.hits, cube.misses) == (1, 3)
+    assert len(cube._cache) == 2
+    assert cube.query_json("material", limit=10**6) is cube.query_json(
+        "material", limit=len(cube.labels["material"])
+    )
+    with pytest.raises(ValueError, match="negative"):
+        cube.query("stage", limit=-1)
+    with pytest.raises(ValueError, match="Unknown dimension"):
+        cube.query("country")
+
+
+def test_server_endpoints(impacts):
+    """Test the page, JSON endpoints and errors over HTTP."""
+
+    async def get(port, path):
+        reader, writer = await asyncio.open_connection("127.0.0.1", port)
+        writer.write(f"GET {path} HTTP/1.1\r\nHost: localhost\r\n\r\n".encode())
+        await writer.drain()
+        response = await reader.read()
+        writer.close()
+        head, _, payload = response.partition(b"\r\n\r\n")
+        return int(head.split()[1]), payload
+
+    async def main():
+        server = DashboardServer(ImpactCube(impacts))
+        port = await server.start(port=0)
+        try:
+            return await asyncio.gather(
+                get(port, "/"),
+                get(port, "/api/dimensions"),
+                get(port, "/api/query?group_by=stage&material=steel,wood&limit=2"),
+                get(port, "/api/query?metric=unknown"),
+                get(port, "/api/query?limit=-1"),
+                get(port, "/api/query?limit=2.5"),
+                get(port, "/api/query?group_by=stage&limit=1000000"),
+            )
+        finally:
+            await server.close()
+
+    page, dimensions, query, bad, negative, fraction, large = asyncio.run(main())
+
+    assert page[0] == 200 and b"LCA Dashboard" in page[1]
+    assert "steel" in json.loads(dimensions[1])["material"]
+    assert len(json.loads(query[1])["groups"]) == 2
+    assert bad[0] == 400
+    assert negative[0] == fraction[0] == 400
+    assert b"non-negative integer" in negative[1]
+    assert large[0] == 200
+    assert len(json.loads(large[1])["groups"]) == len(
+        json.loads(dimensions[1])["stage"]
+    )
+
+
+def test_server_answers_500_on_unexpected_errors(impacts, monkeypatch):
+    """Test that an unexpected error of the cube still gets a response."""
+    cube = ImpactCube(impacts)
+
+    def broken(*args, **kwargs):
+        raise TypeError("cube is broken")
+
+    monkeypatch.setattr(cube, "query_json", broken)
+
+    async def main():
+        server = DashboardServer(cube)
+        port = await server.start(port=0)
+        try:
+            reader, writer = await asyncio.open_connection("127.0.0.1", port)
+            writer.write(b"GET /api/query HTTP/1.1\r\nHost: localhost\r\n\r\n")
+            await writer.drain()
+            response = await reader.read()
+            writer.close()
+            return response
+        finally:
+            await server.close()
+
+    head, _, payload = asyncio.run(main()).partition(b"\r\n\r\n")
+    assert int(head.split()[1]) == 500
+    assert json.loads(payload)["error"] == "TypeError: cube is broken"
@@ -130,3 +130,89 @@ def test_read_impact_factors(sample_impact_factors, tmp_path):
     assert "steel" in factors
     assert "manufacturing" in factors["steel"]
     assert "carbon_impact" in factors["steel"]["manufacturing"]
+
+
+@pytest.mark.parametrize("suffix", [".ndjson", ".jsonl"])
+def test_read_ndjson_chunked(sample_data, tmp_path, suffix):
+    """Test streaming newline-delimited JSON into typed chunks."""
+    data_input = DataInput()
+    ndjson_file = tmp_path / f"test_data{suffix}"
+    pd.concat([sample_data] * 3).to_json(ndjson_file, orient="records", lines=True)
+
+    chunks = list(data_input.read_data_chunked(ndjson_file, chunksize=4))
+
+    assert [len(chunk) for chunk in chunks] == [4, 4, 1]
+    assert chunks[0]["quantity_kg"].dtype == float
+    assert data_input.validate_data(data_input.read_data(ndjson_file))
+
+
+def test_read_ndjson_without_pyarrow(sample_data, tmp_path, monkeypatch):
+    """Test the pandas fallback when pyarrow is not installed."""
+    monkeypatch.setattr("src.data_input.pa_json", None)
+    ndjson_file = tmp_path / "test_data.ndjson"
+    sample_data.to_json(ndjson_file, orient="records", lines=True)
+
+    chunks = list(DataInput().read_data_chunked(ndjson_file, chunksize=2))
+
+    assert [len(chunk) for chunk in chunks] == [2, 1]
+    assert chunks[0]["quantity_kg"].dtype == float
+
+
+@pytest.mark.parametrize("with_pyarrow", [True, False])
+@pytest.mark.parametrize("content", ["", "\n\n"])
+def test_read_empty_ndjson(tmp_path, monkeypatch, with_pyarrow, content):
+    """Test that an NDJSON file without records reads as an empty inventory."""
+    if with_pyarrow:
+        pytest.importorskip("pyarrow")
+    else:
+        monkeypatch.setattr("src.data_input.pa_json", None)
+    ndjson_file = tmp_path / "empty.ndjson"
+    ndjson_file.write_text(content)
+
+    data_input = DataInput()
+    data = data_input.read_data(ndjson_file)
+
+    assert data.empty
+    assert list(data.columns) == data_input.required_columns
+    assert data["quantity_kg"].dtype == float
+    assert list(data_input.read_data_chunked(ndjson_file)) == []
+
+
+@pytest.mark.parametrize("with_pyarrow", [True, False])
+def test_read_ndjson_missing_required_field(
+    sample_data, tmp_path, monkeypatch, with_pyarrow
+):
+    """Test that a missing required field fails validation with and without pyarrow."""
+    if with_pyarrow:
+        pytest.importorskip("pyarrow")
+    else:
+        monkeypatch.setattr("src.data_input.pa_json", None)
+    ndjson_file = tmp_path / "test_data.ndjson"
+    sample_data.drop(columns="transport_mode").to_json(
+        ndjson_file, orient="records", lines=True
+    )
+
+    data_input = DataInput()
+    data = data_input.read_data(ndjson_file)
+
+    assert "transport_mode" not in data.columns
+    assert not data_input.validate_data(data)
+
+
+def test_read_json_array_chunked(sample_data, tmp_path, monkeypatch):
+    """Test decoding a JSON array record by record across read blocks."""
+    monkeypatch.setattr("src.data_input.JSON_BLOCK_SIZE", 64)
+    json_file = tmp_path / "test_data.json"
+    pd.concat([sample_data] * 3).to_json(json_file, orient="records", indent=2)
+
+    chunks = list(DataInput().read_data_chunked(json_file, chunksize=5))
+
+    assert [len(chunk) for chunk in chunks] == [5, 4]
+    data = pd.concat(chunks, ignore_index=True)
+    pd.testing.assert_frame_equal(
+        data, pd.concat([sample_data] * 3, ignore_index=True), check_dtype=False
+    )
+
+    json_file.write_text(json_file.read_text()[:-40])
+    with pytest.raises(ValueError, match="Truncated"):
+        list(DataInput().read_data_chunked(json_file))
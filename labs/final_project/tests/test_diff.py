@@ -0,0 +1,82 @@
+"""
+Tests for the result diff module.
+"""
+
+import pytest
+import numpy as np
+import pandas as pd
+from src.diff import ImpactDiff
+
+
+@pytest.fixture
+def old_results():
+    """Create previous detailed impacts, with a duplicated key for P002."""
+    return pd.DataFrame(
+        {
+            "product_id": ["P001", "P001", "P002", "P002", "P003"],
+            "life_cycle_stage": ["manufacturing", "transportation"]
+            + ["manufacturing"] * 3,
+            "material_type": ["steel", "steel", "wood", "wood", "glass"],
+            "carbon_impact": [100.0, 10.0, 20.0, 20.0, 5.0],
+            "energy_impact": [50.0, 5.0, 8.0, 8.0, 1.0],
+            "water_impact": [10.0, 1.0, 2.0, 2.0, 1.0],
+        }
+    )
+
+
+@pytest.fixture
+def new_results(old_results):
+    """Change P001 manufacturing slightly, drop P003 and add P004."""
+    new = old_results.iloc[:4].copy()
+    new.loc[0, "carbon_impact"] = 110.0
+    new.loc[2, "water_impact"] = 2.01
+    added = pd.DataFrame(
+        {
+            "product_id": ["P004"],
+            "life_cycle_stage": ["manufacturing"],
+            "material_type": ["clay"],
+            "carbon_impact": [7.0],
+            "energy_impact": [0.0],
+            "water_impact": [0.0],
+        }
+    )
+    return pd.concat([new, added], ignore_index=True)
+
+
+def test_row_and_product_deltas(old_results, new_results):
+    """Test statuses, deltas and the summing of duplicate keys."""
+    rows, products = ImpactDiff().compare(old_results, new_results)
+
+    assert list(rows["status"]) == ["changed", "changed", "removed", "added"]
+    first = rows.iloc[0]
+    assert first["carbon_impact_delta"] == pytest.approx(10.0)
+    assert first["carbon_impact_delta_%"] == pytest.approx(10.0)
+    assert rows.iloc[1]["water_impact_old"] == pytest.approx(4.0)
+    assert np.isinf(rows.iloc[3]["carbon_impact_delta_%"])
+    assert list(products["product_id"]) == ["P001", "P002", "P003", "P004"]
+    assert products.iloc[0]["carbon_impact_delta_%"] == pytest.approx(100 / 11)
+
+
+def test_thresholds_hide_small_changes(old_results, new_results):
+    """Test that changes below both thresholds are not reported."""
+    rows, products = ImpactDiff(abs_threshold=0.5, rel_threshold=1.0).compare(
+        old_results, new_results
+    )
+
+    assert list(rows["product_id"]) == ["P001", "P003", "P004"]
+    assert "P002" not in set(products["product_id"])
+
+
+def test_compare_csv_matches_in_memory(old_results, new_results, tmp_path):
+    """Test that the chunked, partitioned diff equals the in-memory diff."""
+    old_results.to_csv(tmp_path / "old.csv", index=False)
+    new_results.to_csv(tmp_path / "new.csv", index=False)
+    differ = ImpactDiff(rel_threshold=0.1)
+
+    rows, products = differ.compare_csv(
+        tmp_path / "old.csv", tmp_path / "new.csv", chunksize=2, partitions=3
+    )
+
+    expected_rows, expected_products = differ.compare(old_results, new_results)
+    pd.testing.assert_frame_equal(rows, expected_rows, check_dtype=False)
+    pd.testing.assert_frame_equal(products, expected_products, check_dtype=False)
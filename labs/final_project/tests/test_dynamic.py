@@ -0,0 +1,135 @@
+"""
+Tests for the dynamic (time-dependent) LCA module.
+"""
+
+import pytest
+import numpy as np
+import pandas as pd
+from src.dynamic import DynamicLCACalculator
+
+
+@pytest.fixture
+def sample_data():
+    """Create sample data with a manufacturing year for testing."""
+    return pd.DataFrame(
+        {
+            "product_id": ["P001", "P001", "P002", "P002"],
+            "product_name": ["Product1", "Product1", "Product2", "Product2"],
+            "life_cycle_stage": ["Manufacturing", "End-of-Life"] * 2,
+            "material_type": ["steel", "steel", "aluminum", "aluminum"],
+            "quantity_kg": [100, 100, 50, 50],
+            "energy_consumption_kwh": [0, 0, 0, 0],
+            "waste_generated_kg": [5, 100, 1, 20],
+            "carbon_footprint_kg_co2e": [0, 0, 0, 0],
+            "water_usage_liters": [0, 0, 0, 0],
+            "year": [2020, 2050, 2035, 2060],
+        }
+    )
+
+
+@pytest.fixture
+def impact_factors():
+    """Create sample static impact factors for testing."""
+    return {
+        "steel": {
+            "manufacturing": {
+                "carbon_impact": 1.8,
+                "energy_impact": 20,
+                "water_impact": 150,
+            },
+            "disposal": {"carbon_impact": 0.1, "energy_impact": 1, "water_impact": 10},
+        },
+        "aluminum": {
+            "manufacturing": {
+                "carbon_impact": 2.5,
+                "energy_impact": 25,
+                "water_impact": 200,
+            },
+            "disposal": {"carbon_impact": 0.1, "energy_impact": 1, "water_impact": 8},
+        },
+    }
+
+
+@pytest.fixture
+def factor_curves():
+    """Create decarbonising carbon factors for steel manufacturing."""
+    return {"steel": {"manufacturing": {"carbon_impact": {"2020": 2.0, "2050": 0.5}}}}
+
+
+def test_factors_are_interpolated_per_year(sample_data, impact_factors, factor_curves):
+    """Test that curve factors are interpolated and static factors are kept."""
+    calculator = DynamicLCACalculator(impact_factors, factor_curves)
+
+    factors = calculator.get_factors(sample_data)
+
+    assert factors[0, 0] == pytest.approx(2.0)  # steel manufacturing in 2020
+    assert factors[0, 1] == pytest.approx(20)  # energy has no curve -> static factor
+    assert factors[1, 0] == pytest.approx(0.1)  # steel end-of-life, static
+    assert factors[2, 0] == pytest.approx(2.5)  # aluminum has no curve
+    assert factors[3, 0] == pytest.approx(0.1)  # aluminum end-of-life in 2060
+    assert list(calculator.years[[0, -1]]) == [2020, 2060]  # horizon extended
+
+
+def test_calculate_impacts_requires_year(sample_data, impact_factors, factor_curves):
+    """Test that a missing year column is reported."""
+    calculator = DynamicLCACalculator(impact_factors, factor_curves)
+
+    with pytest.raises(ValueError):
+        calculator.calculate_impacts(sample_data.drop(columns="year"))
+
+
+def test_cumulative_and_discounted_impacts(sample_data, impact_factors, factor_curves):
+    """Test the per-product time-series outputs."""
+    calculator = DynamicLCACalculator(impact_factors, factor_curves)
+    impacts = calculator.calculate_impacts(sample_data)
+
+    cumulative = calculator.cumulative_impacts(impacts)
+    assert list(cumulative.columns) == list(range(2020, 2061))
+    assert cumulative.loc["P001", 2020] == pytest.approx(200)
+    assert cumulative.loc["P001", 2050] == pytest.approx(210)
+
+    discounted = calculator.discounted_impacts(impacts, discount_rate=0.05)
+    expected = impacts.loc[2, "carbon_impact"] * 1.05**-15
+    assert discounted.loc["P002", 2035] == pytest.approx(expected)
+    assert np.isclose(discounted.loc["P001", 2020], 200)
+
+
+def test_cumulative_impacts_cover_years_outside_the_curves(
+    sample_data, impact_factors, factor_curves
+):
+    """Test that the final cumulative value equals the per-product total."""
+    calculator = DynamicLCACalculator(impact_factors, factor_curves)
+    impacts = calculator.calculate_impacts(sample_data)
+
+    cumulative = calculator.cumulative_impacts(impacts)
+    totals = impacts.groupby("product_id")["carbon_impact"].sum()
+
+    pd.testing.assert_series_equal(
+        cumulative[2060], totals, check_names=False, check_index_type=False
+    )
+    assert cumulative.loc["P002", 2050] < cumulative.loc["P002", 2060]
+
+
+def test_years_outside_an_explicit_range_are_rejected(
+    sample_data, impact_factors, factor_curves
+):
+    """Test that years outside the given range are not counted in the edge years."""
+    calculator = DynamicLCACalculator(impact_factors, factor_curves, years=(2020, 2050))
+    with pytest.raises(ValueError, match="outside"):
+        calculator.calculate_impacts(sample_data)
+
+    impacts = DynamicLCACalculator(impact_factors, factor_curves).calculate_impacts(
+        sample_data
+    )
+    with pytest.raises(ValueError, match="outside"):
+        calculator.cumulative_impacts(impacts)
+
+
+def test_missing_years_are_rejected(sample_data, impact_factors, factor_curves):
+    """Test that a missing year is reported rather than failing the cast."""
+    calculator = DynamicLCACalculator(impact_factors, factor_curves)
+    sample_data["year"] = sample_data["year"].astype(float)
+    sample_data.loc[1, "year"] = np.nan
+
+    with pytest.raises(ValueError, match="year"):
+        calculator.calculate_impacts(sample_data)
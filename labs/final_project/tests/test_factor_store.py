@@ -0,0 +1,92 @@
+"""
+Tests for the SQLite impact factor store.
+"""
+
+import pytest
+import pandas as pd
+from src.calculations import LCACalculator
+from src.data_input import DataInput
+from src.factor_store import FactorStore, StoreBackedCalculator
+from src.synthetic import generate_inventory
+
+
+@pytest.fixture
+def impact_factors():
+    """Load the bundled impact factors."""
+    return DataInput().read_impact_factors("data/raw/impact_factors.json")
+
+
+@pytest.fixture
+def store(tmp_path, impact_factors):
+    """Create a store with two versions and a regional override."""
+    store = FactorStore(tmp_path / "factors.sqlite", cache_size=3)
+    store.add_version("v1", impact_factors, "bundled factors")
+    doubled = {
+        material: {
+            stage: {k: 2 * v for k, v in impacts.items()}
+            for stage, impacts in stages.items()
+        }
+        for material, stages in impact_factors.items()
+    }
+    store.add_version("v2", doubled)
+    store.add_version(
+        "v2", {"Steel": {"Manufacturing": {"carbon_impact": 9.0}}}, region="EU"
+    )
+    yield store
+    store.close()
+
+
+def test_versions(store, impact_factors):
+    """Test version bookkeeping and duplicate protection."""
+    versions = store.versions()
+
+    assert list(versions["version"]) == ["v1", "v2"]
+    assert versions["factors"].iloc[0] == sum(map(len, impact_factors.values()))
+    assert store.latest_version() == "v2"
+    with pytest.raises(ValueError, match="already exists"):
+        store.add_version("v1", impact_factors)
+
+
+def test_get_factors_with_region_and_cache(store, impact_factors):
+    """Test lookups of a few materials, regional overrides and the LRU cache."""
+    factors = store.get_factors(["Steel", "wood", "unobtainium"], version="v1")
+
+    assert set(factors) == {"steel", "wood"}
+    assert factors["steel"]["manufacturing"]["carbon_impact"] == pytest.approx(
+        impact_factors["steel"]["manufacturing"]["carbon_impact"]
+    )
+    regional = store.get_factors(["steel"], region="EU")["steel"]
+    assert regional["manufacturing"]["carbon_impact"] == 9.0
+    assert regional["transportation"]["carbon_impact"] == pytest.approx(
+        2 * impact_factors["steel"]["transportation"]["carbon_impact"]
+    )
+
+    # Impacts the regional row leaves out keep their global values
+    for impact in ["energy_impact", "water_impact"]:
+        assert regional["manufacturing"][impact] == pytest.approx(
+            2 * impact_factors["steel"]["manufacturing"][impact]
+        )
+
+    # The regional lookup evicted the least recently used entry (v1 steel).
+    misses = store.misses
+    store.get_factors(["wood", "steel"], version="v1")
+    assert store.hits == 1 and store.misses == misses + 1
+    assert len(store._cache) == 3
+
+
+def test_calculators_match_json_factors(store, impact_factors):
+    """Test that store-backed calculators reproduce the JSON-based results."""
+    data = generate_inventory(300)
+    expected = LCACalculator(impact_factors).calculate_impacts(data.copy())
+
+    eager = LCACalculator.from_factor_store(store, data["material_type"], version="v1")
+    lazy = StoreBackedCalculator(store, version="v1")
+    chunks = [
+        lazy.calculate_impacts(data.iloc[i : i + 90].copy()) for i in (0, 90, 180, 270)
+    ]
+
+    pd.testing.assert_frame_equal(eager.calculate_impacts(data.copy()), expected)
+    pd.testing.assert_frame_equal(
+        pd.concat(chunks, ignore_index=True), expected.reset_index(drop=True)
+    )
+    assert lazy.factor_version == "v1"
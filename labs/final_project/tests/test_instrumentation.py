@@ -0,0 +1,72 @@
+"""
+Tests for the tracing instrumentation.
+"""
+
+import io
+import json
+import pytest
+from src.calculations import LCACalculator
+from src.data_input import DataInput
+from src.instrumentation import Tracer, tracer_from_env
+from src.synthetic import generate_inventory
+
+
+@pytest.fixture
+def calculator():
+    """Create a calculator from the bundled impact factors."""
+    factors = DataInput().read_impact_factors("data/raw/impact_factors.json")
+    return LCACalculator(impact_factors=factors)
+
+
+def test_spans_record_rows_and_memory(calculator):
+    """Test that instrumented calls are timed with their row counts."""
+    data = generate_inventory(300)
+    stream = io.StringIO()
+
+    with Tracer(stream) as tracer:
+        impacts = calculator.calculate_impacts(data)
+        calculator.calculate_total_impacts(impacts)
+
+    names = [span["name"] for span in tracer.spans]
+    assert names == [
+        "LCACalculator.calculate_impacts",
+        "LCACalculator.calculate_total_impacts",
+    ]
+    first = tracer.spans[0]
+    assert (first["rows_in"], first["rows_out"]) == (300, 300)
+    assert tracer.spans[1]["rows_out"] == 100
+    assert first["duration_ms"] > 0 and first["peak_memory_mb"] >= 0
+    logged = [json.loads(line) for line in stream.getvalue().splitlines()]
+    assert logged == tracer.spans
+
+
+def test_uninstall_restores_methods():
+    """Test that methods are only wrapped while the tracer is installed."""
+    original = LCACalculator.calculate_impacts
+
+    tracer = Tracer(io.StringIO(), memory=False).install()
+    assert LCACalculator.calculate_impacts is not original
+    tracer.uninstall()
+
+    assert LCACalculator.calculate_impacts is original
+
+
+def test_chrome_trace_file(calculator, tmp_path):
+    """Test that .json outputs are written as Chrome trace events."""
+    path = tmp_path / "trace.json"
+
+    with Tracer(path, memory=False):
+        calculator.calculate_impacts(generate_inventory(30))
+
+    events = json.loads(path.read_text())["traceEvents"]
+    assert len(events) == 1
+    assert events[0]["ph"] == "X"
+    assert events[0]["args"] == {"rows_in": 30, "rows_out": 30}
+
+
+def test_tracer_from_env(tmp_path):
+    """Test that tracing is disabled unless LCA_TRACE is set."""
+    assert tracer_from_env({}) is None
+    assert tracer_from_env({"LCA_TRACE": "0"}) is None
+    assert tracer_from_env({"LCA_TRACE": "1"}).format == "jsonl"
+    assert tracer_from_env({"LCA_TRACE": str(tmp_path / "t.json")}).format == "chrome"
@@ -0,0 +1,58 @@
+"""
+Tests for the fused impact kernels.
+"""
+
+import pytest
+import pandas as pd
+from src.calculations import LCACalculator
+from src.data_input import DataInput
+from src.kernels import AVAILABLE_BACKENDS, FusedImpactKernel
+from src.synthetic import generate_inventory
+
+
+@pytest.fixture
+def calculator():
+    """Create a calculator with the bundled impact factors."""
+    factors = DataInput().read_impact_factors("data/raw/impact_factors.json")
+    return LCACalculator(impact_factors=factors)
+
+
+@pytest.fixture
+def inventory():
+    """Create a synthetic inventory with an unknown material and mixed case keys."""
+    data = generate_inventory(2_000, seed=3)
+    data.loc[0, "material_type"] = "Unobtainium"
+    data.loc[1, "life_cycle_stage"] = "MANUFACTURING"
+    return data
+
+
+@pytest.mark.parametrize("backend", AVAILABLE_BACKENDS)
+def test_kernel_matches_calculator(calculator, inventory, backend):
+    """Test that the fused kernel reproduces calculate_impacts and its totals."""
+    impacts, totals = FusedImpactKernel(calculator, backend).run(inventory)
+
+    expected = calculator.calculate_impacts(inventory.copy())
+    pd.testing.assert_frame_equal(impacts, expected)
+    pd.testing.assert_frame_equal(totals, calculator.calculate_total_impacts(expected))
+    assert (
+        impacts.loc[0, "carbon_impact"] == inventory.loc[0, "carbon_footprint_kg_co2e"]
+    )
+
+
+def test_kernel_with_categorical_keys(calculator, inventory):
+    """Test that pre-encoded key columns give the same totals."""
+    encoded = inventory.astype(
+        {col: "category" for col in ["product_id", "product_name", "material_type"]}
+    )
+    _, totals = FusedImpactKernel(calculator, "numpy").run(encoded)
+    _, expected = FusedImpactKernel(calculator, "numpy").run(inventory)
+
+    pd.testing.assert_frame_equal(
+        totals, expected, check_dtype=False, check_categorical=False
+    )
+
+
+def test_invalid_backend(calculator):
+    """Test that unknown backends are rejected."""
+    with pytest.raises(ValueError, match="Unknown backend"):
+        FusedImpactKernel(calculator, "cuda")
@@ -0,0 +1,101 @@
+"""
+Tests for the normalization module.
+"""
+
+import pytest
+import numpy as np
+import pandas as pd
+from src.calculations import LCACalculator
+from src.normalization import ImpactNormalizer
+
+
+@pytest.fixture
+def impacts():
+    """Create detailed impact data for testing."""
+    return pd.DataFrame(
+        {
+            "product_id": ["P001", "P001", "P002", "P002", "P003", "P003"],
+            "material_type": ["steel", "steel", "wood", "wood", "steel", "wood"],
+            "life_cycle_stage": ["manufacturing", "end-of-life"] * 3,
+            "carbon_impact": [100.0, 20.0, 40.0, 10.0, 50.0, 0.0],
+            "energy_impact": [10.0, 5.0, 8.0, 2.0, 20.0, 4.0],
+            "water_impact": [0.0, 0.0, 30.0, 10.0, 5.0, 0.0],
+        }
+    )
+
+
+def test_default_matches_previous_behaviour(impacts):
+    """Test that normalize_impacts still scales by the global maximum."""
+    normalized = LCACalculator({}).normalize_impacts(impacts)
+
+    np.testing.assert_allclose(
+        normalized["carbon_impact"], impacts["carbon_impact"] / 100
+    )
+    np.testing.assert_allclose(normalized["water_impact"], impacts["water_impact"] / 30)
+    assert impacts["carbon_impact"].max() == 100  # input is left untouched
+
+
+def test_grouped_schemes(impacts):
+    """Test group-wise max and sum normalization."""
+    by_material = ImpactNormalizer("max", group_by="material_type").transform(impacts)
+    np.testing.assert_allclose(
+        by_material["energy_impact"], [0.5, 0.25, 1.0, 0.25, 1.0, 0.5]
+    )
+
+    shares = ImpactNormalizer("sum", group_by=["product_id"]).transform(impacts)
+    totals = shares.groupby("product_id")["carbon_impact"].sum()
+    np.testing.assert_allclose(totals, 1.0)
+    # All-zero water of P001 has no positive reference and stays unchanged.
+    assert (shares.loc[shares["product_id"] == "P001", "water_impact"] == 0).all()
+
+
+def test_external_references(impacts):
+    """Test normalization against external reference values."""
+    references = pd.DataFrame(
+        {
+            "carbon_impact": [10.0, 20.0],
+            "energy_impact": [1.0, 2.0],
+            "water_impact": [1.0, 1.0],
+        },
+        index=pd.Index(["steel", "wood"], name="material_type"),
+    )
+    normalized = ImpactNormalizer(
+        "reference", group_by="material_type", references=references
+    ).transform(impacts)
+
+    assert normalized.loc[0, "carbon_impact"] == pytest.approx(10)
+    assert normalized.loc[2, "carbon_impact"] == pytest.approx(2)
+    with pytest.raises(ValueError):
+        ImpactNormalizer("reference")
+
+
+def test_single_reference_applies_to_every_group(impacts):
+    """Test that dictionary references with group_by scale every row."""
+    references = {"carbon_impact": 10.0, "energy_impact": 2.0, "water_impact": 5.0}
+    normalized = ImpactNormalizer(
+        "reference", group_by="material_type", references=references
+    ).transform(impacts)
+
+    np.testing.assert_allclose(
+        normalized["carbon_impact"], impacts["carbon_impact"] / 10
+    )
+    np.testing.assert_allclose(normalized["water_impact"], impacts["water_impact"] / 5)
+
+    unindexed = pd.DataFrame([references] * 2)
+    with pytest.raises(ValueError, match="indexed by"):
+        ImpactNormalizer(
+            "reference", group_by="material_type", references=unindexed
+        ).transform(impacts)
+
+
+def test_chunked_csv_matches_in_memory(impacts, tmp_path):
+    """Test that the two-pass chunked mode equals the in-memory result."""
+    input_path, output_path = tmp_path / "impacts.csv", tmp_path / "normalized.csv"
+    impacts.to_csv(input_path, index=False)
+    normalizer = ImpactNormalizer("sum", group_by=["material_type", "life_cycle_stage"])
+
+    normalizer.normalize_csv(input_path, output_path, chunksize=2)
+
+    pd.testing.assert_frame_equal(
+        pd.read_csv(output_path), normalizer.transform(impacts), check_dtype=False
+    )
@@ -0,0 +1,74 @@
+"""
+Tests for the material substitution optimization module.
+"""
+
+import pytest
+import numpy as np
+import pandas as pd
+from src.calculations import LCACalculator
+from src.optimization import MaterialSubstitutionOptimizer
+
+
+@pytest.fixture
+def calculator():
+    """Create a calculator with per-kg factors for three materials."""
+    return LCACalculator(
+        {
+            "steel": {
+                "manufacturing": {"carbon_impact": 1.8, "energy_impact": 20},
+                "disposal": {"carbon_impact": 0.2, "energy_impact": 1},
+            },
+            "wood": {"manufacturing": {"carbon_impact": 0.5, "energy_impact": 8}},
+            "concrete": {"manufacturing": {"carbon_impact": 0.15, "energy_impact": 2}},
+        }
+    )
+
+
+@pytest.fixture
+def optimizer(calculator):
+    """Create an optimizer where the low-carbon materials are the cheapest."""
+    return MaterialSubstitutionOptimizer(
+        calculator,
+        material_costs={"steel": 1.0, "wood": 2.0, "concrete": 0.1},
+        share_bounds={"concrete": (0.0, 0.5)},
+    )
+
+
+def test_unconstrained_variant_uses_lowest_carbon_materials(optimizer):
+    """Test that the optimum fills the cleanest material up to its share bound."""
+    variants = pd.DataFrame({"variant_id": ["V1"], "mass_kg": [100.0]})
+
+    result = optimizer.optimize(variants).iloc[0]
+
+    assert result["status"] == "optimal"
+    assert result["concrete_kg"] == pytest.approx(50)
+    assert result["wood_kg"] == pytest.approx(50)
+    assert result["carbon_impact"] == pytest.approx(50 * 0.15 + 50 * 0.5)
+
+
+def test_batch_with_cost_limits_and_infeasible_variant(optimizer):
+    """Test batched solving where one variant cannot satisfy its constraints."""
+    variants = pd.DataFrame(
+        {
+            "variant_id": ["V1", "V2", "V3"],
+            "mass_kg": [100.0, 100.0, 100.0],
+            "max_cost": [np.nan, 60.0, 10.0],
+            "max_energy": [np.nan, np.nan, np.nan],
+        }
+    )
+
+    result = optimizer.optimize(variants, batch_size=2).set_index("variant_id")
+
+    assert list(result["status"]) == ["optimal", "optimal", "infeasible"]
+    assert result.loc["V2", "cost"] <= 60 + 1e-6
+    # A cost limit forces cheaper, higher-carbon steel into the mix.
+    assert result.loc["V2", "carbon_impact"] > result.loc["V1", "carbon_impact"]
+    np.testing.assert_allclose(
+        result[["steel_kg", "wood_kg", "concrete_kg"]].iloc[:2].sum(axis=1), 100
+    )
+
+
+def test_unknown_material_is_rejected(calculator):
+    """Test that candidate materials must have impact factors."""
+    with pytest.raises(ValueError):
+        MaterialSubstitutionOptimizer(calculator, material_costs={"glass": 1.0})
@@ -0,0 +1,75 @@
+"""
+Tests for the Pareto (multi-objective) analysis module.
+"""
+
+import pytest
+import numpy as np
+import pandas as pd
+import matplotlib.pyplot as plt
+from src.pareto import crowding_distances, dominance_ranks, pareto_analysis
+from src.visualization import LCAVisualizer
+
+
+def brute_force_ranks(points):
+    """Reference O(n^2) non-dominated sorting."""
+    ranks = np.full(len(points), -1)
+    remaining = set(range(len(points)))
+    rank = 0
+    while remaining:
+        front = {
+            i
+            for i in remaining
+            if not any(
+                np.all(points[j] <= points[i]) and np.any(points[j] < points[i])
+                for j in remaining
+            )
+        }
+        for i in front:
+            ranks[i] = rank
+        remaining -= front
+        rank += 1
+    return ranks
+
+
+@pytest.mark.parametrize("n_objectives", [2, 3])
+def test_dominance_ranks_match_brute_force(n_objectives):
+    """Test the sweep against pairwise comparison, including ties and duplicates."""
+    rng = np.random.default_rng(0)
+    points = rng.integers(0, 8, size=(300, n_objectives)).astype(float)
+
+    np.testing.assert_array_equal(dominance_ranks(points), brute_force_ranks(points))
+
+
+def test_crowding_distances():
+    """Test that front boundaries are infinite and inner points use neighbour gaps."""
+    points = np.array([[0.0, 4.0], [1.0, 2.0], [2.0, 1.0], [4.0, 0.0], [5.0, 5.0]])
+    ranks = dominance_ranks(points)
+
+    distances = crowding_distances(points, ranks)
+
+    assert list(ranks) == [0, 0, 0, 0, 1]
+    assert np.isinf(distances[[0, 3, 4]]).all()
+    assert distances[1] == pytest.approx(2 / 4 + 3 / 4)
+    assert distances[2] == pytest.approx(3 / 4 + 2 / 4)
+
+
+def test_pareto_analysis_and_radar_plot():
+    """Test the per-product ranking and the Pareto radar chart."""
+    data = pd.DataFrame(
+        {
+            "product_id": ["P001", "P002", "P003", "P004"],
+            "carbon_impact": [10.0, 20.0, 30.0, 5.0],
+            "energy_impact": [10.0, 20.0, 5.0, 30.0],
+            "water_impact": [10.0, 20.0, 5.0, 5.0],
+            "waste_generated_kg": [1.0, 1.0, 1.0, 1.0],
+        }
+    )
+
+    ranked = pareto_analysis(data).set_index("product_id")
+    assert ranked.loc["P002", "pareto_rank"] == 1
+    assert (ranked.drop("P002")["pareto_rank"] == 0).all()
+
+    fig = LCAVisualizer().plot_pareto_comparison(data, max_products=2)
+    assert isinstance(fig, plt.Figure)
+    assert len(fig.axes[0].get_legend_handles_labels()[1]) == 2
+    plt.close(fig)
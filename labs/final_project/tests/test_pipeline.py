@@ -0,0 +1,115 @@
+"""
+Tests for the incremental pipeline and file watching modules.
+"""
+
+import json
+import threading
+import time
+import pytest
+import pandas as pd
+from src.pipeline import LCAPipeline
+from src.watch import FileWatcher
+
+
+@pytest.fixture
+def sample_data():
+    """Create sample data for testing."""
+    return pd.DataFrame(
+        {
+            "product_id": ["P001", "P001", "P002", "P002"],
+            "product_name": ["Product1", "Product1", "Product2", "Product2"],
+            "life_cycle_stage": ["Manufacturing", "End-of-Life"] * 2,
+            "material_type": ["steel", "steel", "aluminum", "aluminum"],
+            "quantity_kg": [100, 100, 50, 50],
+            "energy_consumption_kwh": [120, 50, 180, 20],
+            "transport_distance_km": [50, 30, 180, 35],
+            "transport_mode": ["Truck"] * 4,
+            "waste_generated_kg": [5, 100, 1, 20],
+            "recycling_rate": [0.9, 0.9, 0.85, 0.85],
+            "landfill_rate": [0.05, 0.05, 0.1, 0.1],
+            "incineration_rate": [0.05, 0.05, 0.05, 0.05],
+            "carbon_footprint_kg_co2e": [180, 10, 125, 5],
+            "water_usage_liters": [150, 10, 100, 6],
+        }
+    )
+
+
+@pytest.fixture
+def config(sample_data, tmp_path):
+    """Create a pipeline configuration pointing to temporary files."""
+    data_path = tmp_path / "data.csv"
+    factors_path = tmp_path / "factors.json"
+    sample_data.to_csv(data_path, index=False)
+    factors_path.write_text(
+        json.dumps({"steel": {"manufacturing": {"carbon_impact": 1.8}}})
+    )
+    return {
+        "paths": {
+            "input_data": str(data_path),
+            "impact_factors": str(factors_path),
+            "output_data_dir": str(tmp_path / "outputs" / "data"),
+            "output_figures_dir": str(tmp_path / "outputs" / "figures"),
+        },
+        "analysis_products": {
+            "comparison_ids": ["P001", "P002"],
+            "lifecycle_id": "P001",
+            "eole_id": "P001",
+        },
+    }
+
+
+def test_full_run_produces_outputs(config, tmp_path):
+    """Test that the first run executes every stage and writes all outputs."""
+    pipeline = LCAPipeline(config)
+    stages = pipeline.run()
+
+    assert stages[:4] == ["factors", "data", "impacts", "aggregation"]
+    assert len([s for s in stages if s.startswith("figure:")]) == 5
+    assert (tmp_path / "outputs" / "data" / "total_impacts_summary.csv").exists()
+    assert len(list((tmp_path / "outputs" / "figures").glob("*.png"))) == 5
+
+
+def test_incremental_rebuild(config, sample_data):
+    """Test that only the stages affected by a change are re-run."""
+    pipeline = LCAPipeline(config)
+    pipeline.run()
+    data_path = config["paths"]["input_data"]
+
+    # Unrelated paths trigger nothing.
+    assert pipeline.run(["unrelated.csv"]) == []
+
+    # A change that leaves the impacts untouched skips aggregation and figures.
+    sample_data.loc[0, "transport_mode"] = "Rail"
+    sample_data.to_csv(data_path, index=False)
+    assert pipeline.run([data_path]) == ["data", "impacts"]
+
+    # Changing P002 only re-renders the figures that depend on P002.
+    sample_data.loc[3, "water_usage_liters"] = 60
+    sample_data.to_csv(data_path, index=False)
+    stages = pipeline.run([data_path])
+    assert "aggregation" in stages
+    assert "figure:lifecycle_impacts_P001.png" not in stages
+    assert "figure:end_of_life_P001.png" not in stages
+    assert "figure:product_comparison.png" in stages
+
+
+def test_file_watcher_debounces_changes(tmp_path):
+    """Test that a burst of writes is reported as one batch."""
+    path = tmp_path / "watched.csv"
+    path.write_text("a")
+    watcher = FileWatcher([path], debounce=0.2, poll_interval=0.02)
+    batches = []
+
+    def writer():
+        for i in range(3):
+            path.write_text("b" * (i + 2))
+            time.sleep(0.05)
+
+    thread = threading.Thread(target=writer)
+    thread.start()
+    for batch in watcher.changes():
+        batches.append(batch)
+        watcher.stop()
+    thread.join()
+
+    assert batches == [{path.resolve()}]
@@ -0,0 +1,99 @@
+"""
+Tests for the memory-budgeted execution planner.
+"""
+
+import pytest
+import tracemalloc
+import pandas as pd
+from src.calculations import LCACalculator
+from src.data_input import DataInput
+from src.planner import ExecutionPlanner
+from src.synthetic import generate_inventory, write_inventory_csv
+
+
+@pytest.fixture
+def inventory_path(tmp_path):
+    """Write a synthetic inventory of 3000 rows (1000 products)."""
+    return write_inventory_csv(tmp_path / "inventory.csv", 3000)
+
+
+@pytest.fixture
+def repeated_path(tmp_path):
+    """Write 3000 rows that repeat the stages of only 100 products."""
+    data = pd.concat([generate_inventory(300)] * 10, ignore_index=True)
+    data.to_csv(tmp_path / "repeated.csv", index=False)
+    return tmp_path / "repeated.csv"
+
+
+@pytest.fixture
+def calculator():
+    """Create a calculator from the bundled impact factors."""
+    factors = DataInput().read_impact_factors("data/raw/impact_factors.json")
+    return LCACalculator(impact_factors=factors)
+
+
+def test_read_data_chunked(inventory_path):
+    """Test that chunked reading yields the whole file in bounded chunks."""
+    chunks = list(DataInput().read_data_chunked(inventory_path, chunksize=1000))
+
+    assert [len(chunk) for chunk in chunks] == [1000, 1000, 1000]
+    pd.testing.assert_frame_equal(
+        pd.concat(chunks, ignore_index=True), DataInput().read_data(inventory_path)
+    )
+
+
+def test_plan_estimates(inventory_path):
+    """Test the row and product estimates from the sampled rows."""
+    plan = ExecutionPlanner(memory_budget_mb=100, sample_rows=500).plan(inventory_path)
+
+    assert plan.mode == "in-memory" and plan.chunk_rows is None
+    assert abs(plan.estimated_rows - 3000) < 300
+    assert abs(plan.estimated_products - 1000) < 100
+    assert "Execution plan: in-memory" in plan.describe()
+
+
+def test_plan_modes_follow_budget(inventory_path, repeated_path):
+    """Test that small budgets chunk the rows and spill many products to disk."""
+    chunked = ExecutionPlanner(memory_budget_mb=1).plan(repeated_path)
+    spilled = ExecutionPlanner(memory_budget_mb=1).plan(inventory_path)
+
+    assert chunked.mode == "chunked" and chunked.chunk_rows < 3000
+    assert spilled.mode == "spill" and spilled.partitions > 1
+
+
+@pytest.mark.parametrize("budget_mb", [0.1, 1])
+def test_execution_modes_agree(repeated_path, calculator, budget_mb, tmp_path):
+    """Test that chunked and spill execution match the in-memory results."""
+    expected = ExecutionPlanner(memory_budget_mb=100).execute(repeated_path, calculator)
+    impacts_path = tmp_path / "impacts.csv"
+    planner = ExecutionPlanner(memory_budget_mb=budget_mb, spill_dir=tmp_path)
+
+    totals = planner.execute(repeated_path, calculator, impacts_path=impacts_path)
+
+    assert planner.plan(repeated_path).mode == ("spill" if budget_mb < 1 else "chunked")
+    pd.testing.assert_frame_equal(totals, expected, check_dtype=False)
+    assert len(pd.read_csv(impacts_path)) == 3000
+    assert sorted(p.name for p in tmp_path.iterdir()) == ["impacts.csv", "repeated.csv"]
+
+
+def test_spill_partitions_fit_budget(calculator, tmp_path, monkeypatch):
+    """Test that spilling few products with many rows stays within the budget."""
+    monkeypatch.setattr("src.planner.AGGREGATE_BYTES_PER_PRODUCT", 50_000)
+    data = pd.concat([generate_inventory(6)] * 4000, ignore_index=True)
+    data.to_csv(tmp_path / "few_products.csv", index=False)
+    planner = ExecutionPlanner(memory_budget_mb=2, spill_dir=tmp_path)
+    plan = planner.plan(tmp_path / "few_products.csv")
+
+    tracemalloc.start()
+    try:
+        totals = planner.execute(tmp_path / "few_products.csv", calculator, plan)
+        peak = tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+
+    assert plan.mode == "spill" and plan.estimated_products < 100
+    assert plan.estimated_peak_bytes / plan.partitions <= plan.budget_bytes / 2
+    assert peak < plan.budget_bytes
+    assert totals["carbon_impact"].sum() == pytest.approx(
+        calculator.calculate_impacts(data.copy())["carbon_impact"].sum()
+    )
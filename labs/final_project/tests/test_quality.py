@@ -0,0 +1,77 @@
+"""
+Tests for the data quality checks.
+"""
+
+import pytest
+import numpy as np
+import pandas as pd
+from src.quality import DUPLICATE, NEAR_DUPLICATE, OUTLIER_FLAGS, DataQualityChecker
+
+
+@pytest.fixture
+def inventory():
+    """Create ten steel manufacturing rows and two wood rows."""
+    steps = np.arange(12)
+    return pd.DataFrame(
+        {
+            "product_id": [f"P{i:03d}" for i in steps],
+            "life_cycle_stage": ["Manufacturing"] * 12,
+            "material_type": ["Steel"] * 10 + ["Wood"] * 2,
+            "quantity_kg": 100.0 + steps % 5,
+            "energy_consumption_kwh": 50.0 + steps % 3,
+            "water_usage_liters": 15.0 + steps % 4,
+        }
+    )
+
+
+def test_exact_and_near_duplicates(inventory):
+    """Test that repeated rows point to their first occurrence."""
+    near = inventory.iloc[[3]].copy()
+    near["material_type"] = "  STEEL "
+    near["quantity_kg"] = near["quantity_kg"] * 1.0001
+    data = pd.concat([inventory, inventory.iloc[[1]], near], ignore_index=True)
+
+    frame = DataQualityChecker().check(data).to_frame().set_index("row")
+
+    assert frame.loc[12, "issues"] == DUPLICATE
+    assert frame.loc[12, "duplicate_of"] == 1
+    assert frame.loc[13, "issues"] == NEAR_DUPLICATE
+    assert frame.loc[13, "duplicate_of"] == 3
+    assert 1 not in frame.index and 3 not in frame.index
+
+
+def test_robust_outliers_within_groups(inventory):
+    """Test that unit errors and negative amounts are flagged within large groups."""
+    inventory.loc[2, "quantity_kg"] *= 1000
+    inventory.loc[5, "water_usage_liters"] = -15.0
+    inventory.loc[11, "energy_consumption_kwh"] *= 1000  # wood group is too small
+
+    checker = DataQualityChecker()
+    report = checker.check(inventory)
+
+    assert report.positions.tolist() == [2, 5]
+    assert report.issues.tolist() == [
+        OUTLIER_FLAGS["quantity_kg"],
+        OUTLIER_FLAGS["water_usage_liters"],
+    ]
+    assert report.robust_z[0] > 3.5
+    assert np.isinf(report.robust_z[1])
+    assert checker.robust_z_scores(inventory)[11, 1] == 0
+
+
+def test_report_summary_and_clean(inventory):
+    """Test the summary counts and the cleaned inventory."""
+    inventory.loc[4, "quantity_kg"] = 0.1
+    data = pd.concat([inventory, inventory.iloc[[0]]], ignore_index=True)
+
+    report = DataQualityChecker().check(data)
+    summary = report.summary()
+    clean = report.clean(data)
+
+    assert summary["duplicate"] == 1
+    assert summary["outlier_quantity_kg"] == 1
+    assert summary.sum() == len(report) == 2
+    assert report.issues.dtype == np.uint8
+    assert len(clean) == len(data) - 2
+    assert not clean.duplicated().any()
+    assert 0.1 not in clean["quantity_kg"].tolist()
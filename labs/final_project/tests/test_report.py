@@ -0,0 +1,87 @@
+"""
+Tests for the HTML report builder.
+"""
+
+import pytest
+from run_analysis import CONFIG
+from src.pipeline import LCAPipeline
+from src.report import ReportBuilder
+
+
+@pytest.fixture
+def pipeline():
+    """Run the analysis of the bundled sample data without writing figures."""
+    pipeline = LCAPipeline(CONFIG)
+    pipeline.load_factors()
+    pipeline.load_data()
+    pipeline.impacts_df = pipeline.calculator.calculate_impacts(
+        pipeline.product_data.copy()
+    )
+    pipeline.total_impacts_df = pipeline.calculator.calculate_total_impacts(
+        pipeline.impacts_df
+    )
+    return pipeline
+
+
+def test_build_writes_self_contained_report(pipeline, tmp_path):
+    """Test that the report embeds every figure and the summary tables."""
+    builder = ReportBuilder(pipeline.figures, tmp_path / "cache", max_workers=1)
+    path = builder.build(
+        pipeline.impacts_df, pipeline.total_impacts_df, tmp_path / "report.html"
+    )
+
+    html = path.read_text(encoding="utf-8")
+    assert html.count("data:image/png;base64,") == len(pipeline.figures)
+    assert "Impacts by Life Cycle Stage" in html
+    assert "Top 10 Products by Carbon Impact" in html
+    assert sorted(builder.rendered) == sorted(s.filename for s in pipeline.figures)
+
+
+def test_rebuild_renders_only_changed_figures(pipeline, tmp_path):
+    """Test that figures are cached by the content hash of their slice."""
+    builder = ReportBuilder(pipeline.figures, tmp_path / "cache", max_workers=1)
+    builder.render_figures(pipeline.impacts_df)
+    assert builder.render_figures(pipeline.impacts_df) and builder.rendered == []
+
+    changed = pipeline.impacts_df.copy()
+    changed.loc[changed["product_id"] == "P003", "water_impact"] += 1.0
+    builder.render_figures(changed)
+
+    assert sorted(builder.rendered) == [
+        "impact_correlation_matrix.png",
+        "product_comparison.png",
+    ]
+    assert len(list((tmp_path / "cache").glob("*.png"))) == len(pipeline.figures)
+
+
+def test_reuses_figures_saved_by_the_pipeline(pipeline, tmp_path):
+    """Test that figures the pipeline saved for the same slices are not redrawn."""
+    paths = {**pipeline.config["paths"], "output_figures_dir": str(tmp_path / "out")}
+    pipeline.config = {**pipeline.config, "paths": paths}
+    pipeline.render_figures()
+    builder = ReportBuilder(pipeline.figures, tmp_path / "cache", max_workers=1)
+
+    images = builder.render_figures(pipeline.impacts_df, pipeline.saved_figures())
+
+    assert builder.rendered == []
+    for name, png in images.items():
+        assert png == (tmp_path / "out" / name).read_bytes()
+
+    changed = pipeline.impacts_df.copy()
+    changed.loc[changed["product_id"] == "P003", "water_impact"] += 1.0
+    builder.render_figures(changed, pipeline.saved_figures())
+
+    assert sorted(builder.rendered) == [
+        "impact_correlation_matrix.png",
+        "product_comparison.png",
+    ]
+
+
+def test_parallel_rendering(pipeline, tmp_path):
+    """Test that the process pool renders the same figures as a serial build."""
+    parallel = ReportBuilder(pipeline.figures, tmp_path / "pool", max_workers=2)
+    images = parallel.render_figures(pipeline.impacts_df)
+
+    assert list(images) == [spec.filename for spec in pipeline.figures]
+    assert all(png.startswith(b"\x89PNG") for png in images.values())
+    assert len(list((tmp_path / "pool").glob("*.png"))) == len(pipeline.figures)
@@ -0,0 +1,78 @@
+"""
+Tests for the production-volume roll-up.
+"""
+
+import pytest
+import pandas as pd
+from src.rollup import VolumeRollup
+
+
+@pytest.fixture
+def impacts():
+    """Create per-unit detailed impacts of two products."""
+    return pd.DataFrame(
+        {
+            "product_id": ["A", "A", "B"],
+            "life_cycle_stage": ["manufacturing", "transportation", "manufacturing"],
+            "material_type": ["steel", "steel", "wood"],
+            "carbon_impact": [10.0, 2.0, 1.0],
+            "energy_impact": [5.0, 1.0, 4.0],
+            "water_impact": [1.0, 0.0, 3.0],
+            "waste_generated_kg": [0.5, 0.0, 0.2],
+        }
+    )
+
+
+@pytest.fixture
+def volumes():
+    """Create monthly volumes in long format (B has no February volume)."""
+    return pd.DataFrame(
+        {
+            "product_id": ["A", "B", "A", "A"],
+            "period": ["2024-01", "2024-01", "2024-02", "2024-02"],
+            "volume": [100, 50, 10, 30],
+        }
+    )
+
+
+def test_period_totals(impacts, volumes):
+    """Test that period totals equal volume times per-unit totals."""
+    totals = VolumeRollup(impacts).period_totals(volumes)
+
+    assert list(totals["period"]) == ["2024-01", "2024-02"]
+    assert list(totals["volume"]) == [150, 40]
+    assert list(totals["carbon_impact"]) == [100 * 12 + 50 * 1, 40 * 12]
+    assert list(totals["water_impact"]) == [100 * 1 + 50 * 3, 40 * 1]
+
+
+def test_breakdowns_and_wide_volumes(impacts, volumes):
+    """Test breakdowns by material and stage from long and wide volume tables."""
+    rollup = VolumeRollup(impacts)
+    wide = volumes.pivot_table(
+        index="product_id", columns="period", values="volume", aggfunc="sum"
+    ).fillna(0)
+
+    by_material = rollup.breakdown(wide.reset_index(), "material_type")
+    by_stage = rollup.breakdown(volumes, "life_cycle_stage")
+
+    assert list(zip(by_material["period"], by_material["material_type"])) == [
+        ("2024-01", "steel"),
+        ("2024-01", "wood"),
+        ("2024-02", "steel"),
+    ]
+    assert list(by_material["carbon_impact"]) == [1200, 50, 480]
+    february = by_stage[by_stage["period"] == "2024-02"].set_index("life_cycle_stage")
+    assert february.loc["transportation", "carbon_impact"] == 80
+
+
+def test_unknown_products(impacts, volumes):
+    """Test that volumes of products without impacts are reported or dropped."""
+    volumes.loc[len(volumes)] = ["C", "2024-01", 5]
+    rollup = VolumeRollup(impacts)
+
+    with pytest.raises(ValueError, match="no impacts"):
+        rollup.period_totals(volumes)
+    totals = rollup.period_totals(volumes, ignore_unknown=True)
+    assert list(totals["volume"]) == [150, 40]
+    with pytest.raises(ValueError, match="detailed impacts"):
+        VolumeRollup(impacts.drop(columns="material_type")).breakdown(volumes)
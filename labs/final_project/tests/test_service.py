@@ -0,0 +1,188 @@
+"""
+Tests for the local LCA HTTP service.
+"""
+
+import asyncio
+import json
+import pytest
+import pandas as pd
+from src.service import CalculatorPool, LCAService
+
+
+@pytest.fixture
+def records():
+    """Create sample inventory records for testing."""
+    return [
+        {
+            "product_id": "P001",
+            "product_name": "Product1",
+            "life_cycle_stage": "Manufacturing",
+            "material_type": "steel",
+            "quantity_kg": 100,
+            "energy_consumption_kwh": 120,
+            "waste_generated_kg": 5,
+            "carbon_footprint_kg_co2e": 180,
+            "water_usage_liters": 150,
+        },
+        {
+            "product_id": "P002",
+            "product_name": "Product2",
+            "life_cycle_stage": "Manufacturing",
+            "material_type": "aluminum",
+            "quantity_kg": 50,
+            "energy_consumption_kwh": 180,
+            "waste_generated_kg": 1,
+            "carbon_footprint_kg_co2e": 125,
+            "water_usage_liters": 100,
+        },
+    ]
+
+
+@pytest.fixture
+def pool():
+    """Create a calculator pool with two factor versions."""
+    pool = CalculatorPool()
+    pool.register("v1", {"steel": {"manufacturing": {"carbon_impact": 1.0}}})
+    pool.register("v2", {"steel": {"manufacturing": {"carbon_impact": 2.0}}})
+    return pool
+
+
+async def request(port, method, path, body=b"", content_type="application/json"):
+    """Send one HTTP request and return (status, body)."""
+    reader, writer = await asyncio.open_connection("127.0.0.1", port)
+    writer.write(
+        (
+            f"{method} {path} HTTP/1.1\r\nHost: localhost\r\n"
+            f"Content-Type: {content_type}\r\nContent-Length: {len(body)}\r\n\r\n"
+        ).encode()
+        + body
+    )
+    await writer.drain()
+    response = await reader.read()
+    writer.close()
+    head, _, payload = response.partition(b"\r\n\r\n")
+    return int(head.split()[1]), payload
+
+
+def run_with_service(pool, scenario):
+    """Start the service on a free port, run the scenario and shut down."""
+
+    async def main():
+        service = LCAService(pool, default_version="v1", max_delay=0.05)
+        port = await service.start(port=0)
+        try:
+            return await scenario(service, port)
+        finally:
+            await service.close()
+
+    return asyncio.run(main())
+
+
+def test_concurrent_requests_are_micro_batched(pool, records):
+    """Test that concurrent small requests share one calculation."""
+
+    async def scenario(service, port):
+        bodies = [json.dumps([record]).encode() for record in records * 5]
+        responses = await asyncio.gather(
+            *(request(port, "POST", "/impacts", body) for body in bodies)
+        )
+        return responses, service._batchers["v1"].batches_processed
+
+    responses, batches = run_with_service(pool, scenario)
+
+    assert all(status == 200 for status, _ in responses)
+    first = json.loads(responses[0][1])
+    assert len(first) == 1
+    assert first[0]["carbon_impact"] == pytest.approx(100 * 1.0 + 180)
+    assert batches < len(responses)
+
+
+def test_bad_request_does_not_fail_its_batch(pool, records):
+    """Test that one malformed request only fails itself and columns stay apart."""
+    noted = dict(records[1], note="extra column")
+    broken = dict(records[0], quantity_kg="a lot")
+
+    async def scenario(service, port):
+        bodies = [json.dumps([record]).encode() for record in (records[0], noted)]
+        bodies.insert(1, json.dumps([broken]).encode())
+        return await asyncio.gather(
+            *(request(port, "POST", "/impacts", body) for body in bodies)
+        )
+
+    good, bad, other = run_with_service(pool, scenario)
+
+    assert (good[0], bad[0], other[0]) == (200, 500, 200)
+    assert "error" in json.loads(bad[1])
+    assert "note" not in json.loads(good[1])[0]
+    assert json.loads(other[1])[0]["note"] == "extra column"
+    assert json.loads(good[1])[0]["carbon_impact"] == pytest.approx(100 * 1.0 + 180)
+
+
+def test_registering_a_version_again_replaces_its_factors(pool, records):
+    """Test that micro-batched requests use the factors registered last."""
+    body = json.dumps(records[:1]).encode()
+
+    async def scenario(service, port):
+        before = await request(port, "POST", "/impacts", body)
+        pool.register("v1", {"steel": {"manufacturing": {"carbon_impact": 3.0}}})
+        after = await request(port, "POST", "/impacts", body)
+        return before, after
+
+    before, after = run_with_service(pool, scenario)
+
+    assert json.loads(before[1])[0]["carbon_impact"] == pytest.approx(100 * 1.0 + 180)
+    assert json.loads(after[1])[0]["carbon_impact"] == pytest.approx(100 * 3.0 + 180)
+
+
+def test_versions_and_batch_endpoint(pool, records):
+    """Test version selection, NDJSON batches, totals and errors."""
+    ndjson = pd.DataFrame(records).to_json(orient="records", lines=True).encode()
+
+    async def scenario(service, port):
+        health = await request(port, "GET", "/health")
+        batch = await request(
+            port, "POST", "/batch?version=v2&totals=1", ndjson, "application/x-ndjson"
+        )
+        unknown = await request(port, "POST", "/impacts?version=v9", b"[]")
+        bad = await request(port, "POST", "/impacts", b"not json")
+        return health, batch, unknown, bad
+
+    health, batch, unknown, bad = run_with_service(pool, scenario)
+
+    assert json.loads(health[1])["versions"] == ["v1", "v2"]
+    totals = pd.read_json(pd.io.common.StringIO(batch[1].decode()), lines=True)
+    assert batch[0] == 200
+    assert list(totals["product_id"]) == ["P001", "P002"]
+    assert totals.loc[0, "carbon_impact"] == pytest.approx(100 * 2.0 + 180)
+    assert unknown[0] == 404
+    assert bad[0] == 400
+
+
+def test_service_refuses_public_interfaces(pool):
+    """Test that the service only binds to loopback addresses."""
+    with pytest.raises(ValueError):
+        asyncio.run(LCAService(pool).start(host="0.0.0.0", port=0))
+
+
+def test_arrow_batch(pool, records):
+    """Test that Arrow stream payloads are answered in Arrow."""
+    pa = pytest.importorskip("pyarrow")
+    table = pa.Table.from_pandas(pd.DataFrame(records))
+    sink = pa.BufferOutputStream()
+    with pa.ipc.new_stream(sink, table.schema) as stream:
+        stream.write_table(table)
+
+    async def scenario(service, port):
+        return await request(
+            port,
+            "POST",
+            "/batch",
+            sink.getvalue().to_pybytes(),
+            "application/vnd.apache.arrow.stream",
+        )
+
+    status, body = run_with_service(pool, scenario)
+
+    impacts = pa.ipc.open_stream(body).read_all().to_pandas()
+    assert status == 200
+    assert impacts.loc[0, "carbon_impact"] == pytest.approx(100 * 1.0 + 180)
@@ -0,0 +1,100 @@
+"""
+Tests for the streaming aggregation module.
+"""
+
+import pytest
+import pandas as pd
+from src.calculations import LCACalculator
+from src.streaming import StreamingAggregator
+
+
+@pytest.fixture
+def sample_data():
+    """Create sample inventory data for testing."""
+    return pd.DataFrame(
+        {
+            "product_id": ["P001", "P001", "P001", "P002", "P002", "P002"],
+            "product_name": ["Product1"] * 3 + ["Product2"] * 3,
+            "life_cycle_stage": ["Manufacturing", "Transportation", "End-of-Life"] * 2,
+            "material_type": ["steel"] * 3 + ["aluminum"] * 3,
+            "quantity_kg": [100, 100, 100, 50, 50, 50],
+            "energy_consumption_kwh": [120, 20, 50, 180, 25, 20],
+            "waste_generated_kg": [5, 0, 100, 1, 0, 20],
+            "carbon_footprint_kg_co2e": [180, 50, 10, 125, 30, 5],
+            "water_usage_liters": [150, 30, 10, 100, 0, 6],
+        }
+    )
+
+
+@pytest.fixture
+def calculator():
+    """Create a calculator with sample impact factors."""
+    return LCACalculator(
+        {
+            "steel": {
+                "manufacturing": {"carbon_impact": 1.8, "energy_impact": 20},
+                "disposal": {"carbon_impact": 0.1, "water_impact": 10},
+            },
+            "aluminum": {"manufacturing": {"carbon_impact": 2.5}},
+        }
+    )
+
+
+def test_snapshot_matches_total_impacts(sample_data, calculator):
+    """Test that event-by-event updates reproduce calculate_total_impacts."""
+    aggregator = StreamingAggregator(calculator)
+    aggregator.update_many(sample_data.to_dict("records"))
+
+    expected = calculator.calculate_total_impacts(
+        calculator.calculate_impacts(sample_data.copy())
+    )
+    pd.testing.assert_frame_equal(aggregator.snapshot(), expected, check_dtype=False)
+
+
+def test_events_and_frames_share_stage_normalization(sample_data, calculator):
+    """Test that single events and frames give the same impacts for stage aliases."""
+    sample_data["life_cycle_stage"] = [
+        "Manufacturing",
+        "Transportation",
+        "Disposal",
+    ] * 2
+    by_event = StreamingAggregator(calculator)
+    by_event.update_many(sample_data.to_dict("records"))
+    by_frame = StreamingAggregator(calculator)
+    by_frame.update_frame(sample_data)
+
+    pd.testing.assert_frame_equal(by_event.snapshot(), by_frame.snapshot())
+    assert by_frame.snapshot().loc[0, "water_impact"] == pytest.approx(
+        150 + 30 + 10 + 100 * 10
+    )
+
+
+def test_merge_partial_states(sample_data, calculator):
+    """Test that merged worker states equal a single pass over all events."""
+    single = StreamingAggregator(calculator)
+    single.update_frame(sample_data)
+
+    worker_a = StreamingAggregator(calculator)
+    worker_a.update_many(sample_data.iloc[:4].to_dict("records"))
+    worker_b = StreamingAggregator(calculator)
+    worker_b.update_frame(sample_data.iloc[4:])
+    merged = worker_a.merge(worker_b)
+
+    pd.testing.assert_frame_equal(merged.snapshot(), single.snapshot())
+    pd.testing.assert_frame_equal(merged.statistics(), single.statistics())
+
+
+def test_statistics(sample_data, calculator):
+    """Test the running mean, variance, min and max."""
+    aggregator = StreamingAggregator(calculator)
+    aggregator.update_many(sample_data.to_dict("records"))
+    impacts = calculator.calculate_impacts(sample_data.copy())
+
+    stats = aggregator.statistics().set_index(["product_id", "impact"])
+    energy = impacts.loc[impacts["product_id"] == "P001", "energy_impact"]
+    row = stats.loc[("P001", "energy_impact")]
+    assert row["count"] == 3
+    assert row["mean"] == pytest.approx(energy.mean())
+    assert row["variance"] == pytest.approx(energy.var())
+    assert row["min"] == energy.min()
+    assert row["max"] == energy.max()
@@ -0,0 +1,56 @@
+"""
+Tests for the synthetic inventory generator.
+"""
+
+import pandas as pd
+from src.data_input import DataInput
+from src.synthetic import (
+    STAGES,
+    generate_inventory,
+    iter_inventory_chunks,
+    write_inventory_csv,
+)
+
+
+def test_generated_inventory_is_valid():
+    """Test that generated data matches the input schema and validation rules."""
+    data = generate_inventory(3000, seed=1)
+    data_input = DataInput()
+
+    assert len(data) == 3000
+    assert list(data.columns) == data_input.required_columns
+    assert data_input.validate_data(data)
+    assert set(data["life_cycle_stage"]) == set(STAGES)
+    assert (data.groupby("product_id")["material_type"].nunique() == 1).all()
+
+
+def test_chunks_do_not_split_products():
+    """Test that chunked generation yields whole, consecutive products."""
+    chunks = list(iter_inventory_chunks(100, chunk_rows=30, seed=2))
+    data = pd.concat(chunks, ignore_index=True)
+
+    assert [len(chunk) for chunk in chunks] == [30, 30, 30, 12]
+    assert data["product_id"].is_unique is False
+    assert data["product_id"].nunique() == 34
+    assert all(chunk.groupby("product_id").size().eq(3).all() for chunk in chunks)
+
+
+def test_write_inventory_csv_is_reproducible(tmp_path):
+    """Test that the CSV round-trips through read_data and the seed is honoured."""
+    path = write_inventory_csv(tmp_path / "inventory.csv", 90, seed=3, chunk_rows=30)
+
+    data = DataInput().read_data(path)
+
+    expected = pd.concat(iter_inventory_chunks(90, 30, seed=3), ignore_index=True)
+    pd.testing.assert_frame_equal(data, expected)
+
+
+def test_seed_gives_the_same_inventory_for_any_chunking(monkeypatch):
+    """Test that chunk sizes, also across generator blocks, do not change the rows."""
+    monkeypatch.setattr("src.synthetic.BLOCK_PRODUCTS", 7)
+    whole = pd.concat(iter_inventory_chunks(90, 1_000, seed=5), ignore_index=True)
+
+    for chunk_rows in [3, 12, 30, 63]:
+        chunks = iter_inventory_chunks(90, chunk_rows, seed=5)
+        pd.testing.assert_frame_equal(pd.concat(chunks, ignore_index=True), whole)
+    assert not whole.equals(generate_inventory(90, seed=6))
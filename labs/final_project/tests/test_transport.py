@@ -0,0 +1,109 @@
+"""
+Tests for the transport distance calculation.
+"""
+
+import pytest
+import numpy as np
+import pandas as pd
+from src.transport import TransportDistances, haversine_km
+
+
+@pytest.fixture
+def distances():
+    """Create two sites and three suppliers, one of them delivering wood."""
+    sites = pd.DataFrame(
+        {
+            "location_id": ["paris", "madrid"],
+            "latitude": [48.8566, 40.4168],
+            "longitude": [2.3522, -3.7038],
+        }
+    )
+    suppliers = pd.DataFrame(
+        {
+            "location_id": ["lyon", "sevilla", "oslo"],
+            "latitude": [45.7640, 37.3891, 59.9139],
+            "longitude": [4.8357, -5.9845, 10.7522],
+            "material_type": ["Steel", "Steel", "Wood"],
+        }
+    )
+    return TransportDistances(sites, suppliers, detour_factors={"Truck": 1.5})
+
+
+def test_haversine_known_distance():
+    """Test the great-circle distance of Paris to London and of a point to itself."""
+    km = haversine_km(
+        np.array([48.8566, 10.0]),
+        np.array([2.3522, 20.0]),
+        np.array([51.5074, 10.0]),
+        np.array([-0.1278, 20.0]),
+    )
+    assert km[0] == pytest.approx(343.5, abs=1.0)
+    assert km[1] == 0
+
+
+def test_assign_fills_nearest_suppliers_and_distances(distances):
+    """Test that missing suppliers are the nearest per material and distances fill."""
+    inventory = pd.DataFrame(
+        {
+            "site_id": ["paris", "madrid", "madrid", None],
+            "supplier_id": [None, None, "lyon", None],
+            "material_type": ["steel", "Steel", "Steel", "Wood"],
+            "transport_mode": ["Truck", "Rail", "Rail", "Truck"],
+            "transport_distance_km": [0.0, 0.0, 0.0, 42.0],
+        }
+    )
+    result = distances.assign(inventory)
+
+    assert list(result["supplier_id"].iloc[:3]) == ["lyon", "sevilla", "lyon"]
+    assert result["transport_distance_km"].iloc[3] == 42.0
+    sites = distances.sites.loc[["paris", "madrid", "madrid"]]
+    suppliers = distances.suppliers.loc[["lyon", "sevilla", "lyon"]]
+    expected = haversine_km(
+        suppliers["latitude"],
+        suppliers["longitude"],
+        sites["latitude"],
+        sites["longitude"],
+    ) * np.array([1.5, 1.0, 1.0])
+    np.testing.assert_allclose(result["transport_distance_km"].iloc[:3], expected)
+    assert inventory["transport_distance_km"].iloc[0] == 0.0
+
+    wood = distances.nearest_suppliers(["madrid"], ["Wood"])
+    assert wood[0][0] == "oslo"
+
+
+def test_route_cache_and_unknown_ids(distances):
+    """Test that repeated routes are computed once and unknown IDs are rejected."""
+    first = distances.distances(["lyon", "lyon", "oslo"], ["paris"] * 3)
+    assert (distances.hits, distances.misses) == (0, 2)
+    second = distances.distances(["oslo", "sevilla"], ["paris", "madrid"])
+    assert (distances.hits, distances.misses) == (1, 3)
+    assert first[2] == second[0]
+
+    with pytest.raises(ValueError, match="Unknown sites"):
+        distances.distances(["lyon"], ["berlin"])
+
+
+def test_supplier_of_several_materials():
+    """Test that a supplier listed per material serves each of them."""
+    sites = pd.DataFrame(
+        {"location_id": ["paris"], "latitude": [48.8566], "longitude": [2.3522]}
+    )
+    suppliers = pd.DataFrame(
+        {
+            "location_id": ["lyon", "lyon", "oslo", "oslo"],
+            "latitude": [45.7640, 45.7640, 59.9139, 59.9139],
+            "longitude": [4.8357, 4.8357, 10.7522, 10.7522],
+            "material_type": ["Steel", "Concrete", "Concrete", "Wood"],
+        }
+    )
+    distances = TransportDistances(sites, suppliers)
+
+    ids, _ = distances.nearest_suppliers(["paris"] * 3, ["steel", "Concrete", "Wood"])
+    assert list(ids) == ["lyon", "lyon", "oslo"]
+    assert list(distances.suppliers.index) == ["lyon", "oslo"]
+
+    with pytest.raises(ValueError, match="unique per material_type"):
+        TransportDistances(sites, pd.concat([suppliers, suppliers.iloc[[0]]]))
+    moved = suppliers.assign(latitude=[45.7640, 46.0, 59.9139, 59.9139])
+    with pytest.raises(ValueError, match="share coordinates"):
+        TransportDistances(sites, moved)